@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""Benchmark the FTP LIST parser over large synthetic listings.
+
+Usage::
+
+    python benchmarks/bench_ftp_parse.py [--lines 1000000] [--reference]
+
+With ``--reference``, the listings are also parsed with a copy of the
+previous, line-by-line ``strptime`` based implementation, to measure the
+speed-up.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import random
+import time
+import unicodedata
+
+from fs.enums import ResourceType
+from fs.permissions import Permissions
+
+from miarec_ftpfs import _ftp_parse as ftp_parse
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+PERMISSIONS = ("-rw-r--r--", "-rw-rw-r--", "drwxr-xr-x", "-rwxr-xr-x", "lrwxrwxrwx")
+
+
+def generate_unix_listing(lines, seed=0):
+    """Generate ``ls -l`` style lines of a directory of call recordings."""
+    rnd = random.Random(seed)
+    for index in range(lines):
+        month = MONTHS[rnd.randrange(12)]
+        day = rnd.randint(1, 28)
+        if rnd.random() < 0.5:
+            when = "{} {:2} {:02}:{:02}".format(month, day, rnd.randrange(24), rnd.randrange(60))
+        else:
+            when = "{} {:2}  {}".format(month, day, rnd.randint(2015, 2024))
+        yield "{} 1 ftp ftp {:>10} {} call-{:08}.wav".format(
+            rnd.choice(PERMISSIONS[:4]), rnd.randrange(10 ** 7), when, index
+        )
+
+
+def generate_windowsnt_listing(lines, seed=0):
+    """Generate Windows NT (IIS) style lines of a directory of call recordings."""
+    rnd = random.Random(seed)
+    for index in range(lines):
+        hour = rnd.randint(1, 12)
+        when = "{:02}-{:02}-{:02}  {:02}:{:02}{}".format(
+            rnd.randint(1, 28), rnd.randint(1, 12), rnd.randint(15, 24),
+            hour, rnd.randrange(60), rnd.choice(("AM", "PM")),
+        )
+        if rnd.random() < 0.05:
+            yield "{}       <DIR>          dir-{:08}".format(when, index)
+        else:
+            yield "{}     {:>12} call-{:08}.wav".format(when, rnd.randrange(10 ** 7), index)
+
+
+def reference_parse(lines):
+    """Parse lines like the original implementation did."""
+    decode = {
+        ftp_parse.RE_LINUX: _reference_decode_linux,
+        ftp_parse.RE_WINDOWSNT: _reference_decode_windowsnt,
+    }
+    info = []
+    for line in lines:
+        if not line.strip():
+            continue
+        for line_re, _ in ftp_parse.get_decoders():
+            match = line_re.match(line)
+            if match is not None:
+                info.append(decode[line_re](line, match))
+                break
+    return info
+
+
+def _reference_decode_linux(line, match):
+    ty, perms, links, uid, gid, size, mtime, name = match.groups()
+    is_link = ty == "l"
+    is_dir = ty == "d" or is_link
+    if is_link:
+        name, _, _link_name = name.partition("->")
+        name = name.strip()
+    permissions = Permissions.parse(perms)
+    mtime_epoch = ftp_parse._parse_time(mtime, formats=["%b %d %Y", "%b %d %H:%M"])
+    name = unicodedata.normalize("NFC", name)
+    raw_info = {
+        "basic": {"name": name, "is_dir": is_dir},
+        "details": {
+            "size": int(size),
+            "type": int(ResourceType.directory if is_dir else ResourceType.file),
+        },
+        "access": {"permissions": permissions.dump(), "user": uid, "group": gid},
+        "ftp": {"ls": line},
+    }
+    if mtime_epoch is not None:
+        raw_info["details"]["modified"] = mtime_epoch
+    return raw_info
+
+
+def _reference_decode_windowsnt(line, match):
+    is_dir = match.group("size") == "<DIR>"
+    raw_info = {
+        "basic": {"name": match.group("name"), "is_dir": is_dir},
+        "details": {
+            "type": int(ResourceType.directory if is_dir else ResourceType.file),
+        },
+        "ftp": {"ls": line},
+    }
+    if not is_dir:
+        raw_info["details"]["size"] = int(match.group("size"))
+    modified = ftp_parse._parse_time(
+        match.group("modified_date") + " " + match.group("modified_time"),
+        formats=["%d-%m-%y %I:%M%p", "%d-%m-%y %H:%M"],
+    )
+    if modified is not None:
+        raw_info["details"]["modified"] = modified
+    return raw_info
+
+
+def measure(parse, lines):
+    """Return the number of lines parsed per second."""
+    start = time.perf_counter()
+    for _ in parse(lines):
+        pass
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--reference", action="store_true")
+    args = parser.parse_args()
+
+    for name, generate in (
+        ("unix", generate_unix_listing),
+        ("windowsnt", generate_windowsnt_listing),
+    ):
+        lines = list(generate(args.lines))
+        rate = measure(ftp_parse.iter_parse, lines)
+        print("{:<10} {:>12,.0f} lines/s".format(name, rate))
+        if args.reference:
+            reference_rate = measure(reference_parse, lines)
+            print("{:<10} {:>12,.0f} lines/s (reference, x{:.1f} speed-up)".format(
+                name, reference_rate, rate / reference_rate
+            ))
+
+
+if __name__ == "__main__":
+    main()
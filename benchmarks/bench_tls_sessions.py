@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Benchmark TLS handshakes of new control connections, with and without
+resuming the session of a previous connection.
+
+Usage::
+
+    python benchmarks/bench_tls_sessions.py [--connections 200] [--implicit]
+
+A local FTPS server (the one of the test suite, which requires
+``pyftpdlib`` and ``pyopenssl``) is started, and connections are opened,
+logged in and closed in turn, as `FTPFS` does on reconnects. The number
+of connections per second is reported without a session cache, and with
+a `TLSSessionCache` like the one shared by the `FTPFS` instances.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pyftpdlib.authorizers import DummyAuthorizer
+
+from miarec_ftpfs.ftp_tls import ExplicitFTP_TLS, ImplicitFTP_TLS, TLSSessionCache
+
+# The test server lives with the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.helpers import TLS_ThreadedTestFTPd  # noqa: E402
+
+USER = "user"
+PASSWORD = "1234"
+
+
+def start_server(root, implicit_tls):
+    server = TLS_ThreadedTestFTPd(implicit_tls=implicit_tls)
+    server.handler.authorizer = DummyAuthorizer()
+    server.handler.authorizer.add_user(USER, PASSWORD, root, perm="elradfmwT")
+    server.shutdown_after = -1
+    server.start()
+    return server
+
+
+def connect(server, implicit_tls, session_cache):
+    """Open a logged-in connection, and tell if it resumed a session."""
+    ftp_class = ImplicitFTP_TLS if implicit_tls else ExplicitFTP_TLS
+    ftp = ftp_class(session_cache=session_cache)
+    ftp.connect(server.host, server.port)
+    ftp.login(USER, PASSWORD)
+    reused = ftp.sock.session_reused
+    ftp.quit()
+    return reused
+
+
+def bench(server, implicit_tls, connections, session_cache):
+    reused = 0
+    start = time.perf_counter()
+    for _ in range(connections):
+        reused += connect(server, implicit_tls, session_cache)
+    elapsed = time.perf_counter() - start
+    return connections / elapsed, reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--implicit", action="store_true", help="use implicit TLS")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    root = tempfile.mkdtemp("ftpfs-bench")
+    server = start_server(root, args.implicit)
+    try:
+        for label, session_cache in (
+            ("full handshakes", None),
+            ("session cache", TLSSessionCache()),
+        ):
+            # Warm up the server and the cache
+            connect(server, args.implicit, session_cache)
+            rate, reused = bench(server, args.implicit, args.connections, session_cache)
+            print(
+                "{:<16} {:8.1f} connections/s  ({} of {} sessions resumed)".format(
+                    label, rate, reused, args.connections
+                )
+            )
+    finally:
+        server.stop()
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
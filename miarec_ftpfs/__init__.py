@@ -1,9 +1,29 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-__all__ = ["FTPFS", "FTPFile", "convert_ftp_errors", "opener"]
+__all__ = [
+    "AsyncFTPFS",
+    "AsyncFTPFile",
+    "FTPFS",
+    "FTPFile",
+    "FTPObserver",
+    "MetricsAggregator",
+    "ParallelWalker",
+    "TransferStats",
+    "convert_ftp_errors",
+    "opener",
+]
 
-from .ftpfs import FTPFS, FTPFile, convert_ftp_errors
+from .ftpfs import (
+    FTPFS,
+    FTPFile,
+    FTPObserver,
+    MetricsAggregator,
+    ParallelWalker,
+    TransferStats,
+    convert_ftp_errors,
+)
+from .asyncftpfs import AsyncFTPFS, AsyncFTPFile
 
 __license__ = "MIT"
 __copyright__ = "Copyright (c) MiaRec"
@@ -0,0 +1,485 @@
+"""A minimal FTP client and connection pool for asyncio.
+
+`AsyncFTP` mirrors the subset of `ftplib.FTP` used by the filesystems,
+and raises the same exceptions (`ftplib.error_perm`, `ftplib.error_temp`,
+`ftplib.error_reply`, `ftplib.error_proto`, `EOFError` and `OSError`), so,
+errors are converted with `convert_ftp_errors` like those of `ftplib`.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import ftplib
+import socket
+import ssl
+import typing
+from collections import deque
+from ftplib import error_perm, error_proto, error_reply, error_temp
+
+try:
+    import contextvars
+except ImportError:  # pragma: no cover (Python < 3.7)
+    # asyncio only secures connections (start_tls) on Python 3.11+ anyway
+    contextvars = None  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Text, Tuple
+
+import logging
+log = logging.getLogger(__name__)
+
+
+__all__ = ["AsyncFTP", "AsyncConnectionPool", "ResumingSSLContext"]
+
+CRLF = "\r\n"
+
+# Python 3.11+
+_timeout = getattr(asyncio, "timeout", None)
+
+# The TLS session resumed by the connection being secured by the current task
+_resumed_session = (
+    contextvars.ContextVar("resumed_session", default=None)
+    if contextvars is not None
+    else None
+)  # type: Optional[contextvars.ContextVar[Optional[ssl.SSLSession]]]
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """An `ssl.SSLContext` able to resume TLS sessions over asyncio.
+
+    asyncio does not pass a session to the connections it secures, so,
+    `wrap_bio` resumes the session given to `AsyncFTP.transfercmd` in the
+    current task, like `ftplib.FTP_TLS` resumes the session of the control
+    connection on the data connections.
+    """
+
+    def wrap_bio(
+        self, incoming, outgoing, server_side=False, server_hostname=None, session=None
+    ):
+        if session is None:
+            session = _resumed_session.get()
+        return super(ResumingSSLContext, self).wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+
+class AsyncFTP(object):
+    """An FTP control connection over asyncio streams.
+
+    Arguments:
+        timeout (float, optional): Number of seconds to wait for the
+            server on each network operation, or `None` to wait forever.
+        context (ssl.SSLContext, optional): The context used to secure
+            the connections with `auth` (explicit TLS) or ``implicit_tls``.
+        reuse_ssl_session (bool): Resume the TLS session of the control
+            connection on the data connections (default `True`), which
+            servers such as vsftpd require by default. The ``context``
+            must be a `ResumingSSLContext`.
+
+    Raises:
+        ValueError: if ``reuse_ssl_session`` is `True` and ``context``
+            is not a `ResumingSSLContext`.
+
+    """
+
+    maxline = 8192
+
+    def __init__(self, timeout=None, context=None, reuse_ssl_session=True):
+        # type: (Optional[float], Optional[ssl.SSLContext], bool) -> None
+        if (
+            reuse_ssl_session
+            and context is not None
+            and not isinstance(context, ResumingSSLContext)
+        ):
+            raise ValueError(
+                "resuming TLS sessions requires a ResumingSSLContext context"
+            )
+        self.timeout = timeout
+        self.context = context
+        self.reuse_ssl_session = reuse_ssl_session
+        self.encoding = "latin-1"
+        self.host = ""
+        self.af = socket.AF_INET
+        self.welcome = None  # type: Optional[Text]
+        # Whether data connections are secured (PROT P)
+        self.prot_p = False
+        # Set when the connection is out of sync with the server replies
+        self.broken = False
+        self._reader = None  # type: Optional[asyncio.StreamReader]
+        self._writer = None  # type: Optional[asyncio.StreamWriter]
+
+    def __repr__(self):
+        # type: () -> str
+        return "<asyncftp {}>".format(self.host)
+
+    async def _wait(self, awaitable):
+        # type: (Awaitable[Any]) -> Any
+        """Wait for the server, raising `socket.timeout` like `ftplib`."""
+        if self.timeout is None:
+            return await awaitable
+        try:
+            if _timeout is None:
+                return await asyncio.wait_for(awaitable, self.timeout)
+            # Unlike wait_for, does not run the awaitable in a new task, and
+            # does not lose a cancellation when the awaitable completes
+            async with _timeout(self.timeout):
+                return await awaitable
+        except asyncio.TimeoutError:
+            raise socket.timeout("timed out")
+
+    async def connect(self, host, port=21, implicit_tls=False):
+        # type: (Text, int, bool) -> Text
+        """Connect to a server, and return its welcome message."""
+        self.host = host
+        self._reader, self._writer = await self._wait(
+            asyncio.open_connection(
+                host,
+                port,
+                ssl=self.context if implicit_tls else None,
+                limit=self.maxline + 2,
+            )
+        )
+        self.af = self._writer.get_extra_info("socket").family
+        self.welcome = await self.getresp()
+        return self.welcome
+
+    async def getline(self):
+        # type: () -> Text
+        try:
+            line = await self._wait(self._reader.readline())
+        except ValueError:
+            # The line is longer than the stream limit
+            raise error_proto("got more than %d bytes" % self.maxline)
+        if not line:
+            raise EOFError
+        text = line.decode(self.encoding)
+        if text[-2:] == CRLF:
+            text = text[:-2]
+        elif text[-1:] in CRLF:
+            text = text[:-1]
+        return text
+
+    async def getmultiline(self):
+        # type: () -> Text
+        line = await self.getline()
+        if line[3:4] == "-":
+            code = line[:3]
+            while True:
+                nextline = await self.getline()
+                line = line + ("\n" + nextline)
+                if nextline[:3] == code and nextline[3:4] != "-":
+                    break
+        return line
+
+    async def getresp(self):
+        # type: () -> Text
+        resp = await self.getmultiline()
+        c = resp[:1]
+        if c in {"1", "2", "3"}:
+            return resp
+        if c == "4":
+            raise error_temp(resp)
+        if c == "5":
+            raise error_perm(resp)
+        raise error_proto(resp)
+
+    async def voidresp(self):
+        # type: () -> Text
+        """Expect a response beginning with '2'."""
+        resp = await self.getresp()
+        if resp[:1] != "2":
+            raise error_reply(resp)
+        return resp
+
+    async def putcmd(self, line):
+        # type: (Text) -> None
+        if "\r" in line or "\n" in line:
+            raise ValueError("an illegal newline character should not be contained")
+        self._writer.write((line + CRLF).encode(self.encoding))
+        await self._wait(self._writer.drain())
+
+    async def sendcmd(self, cmd):
+        # type: (Text) -> Text
+        """Send a command and return the response."""
+        await self.putcmd(cmd)
+        return await self.getresp()
+
+    async def voidcmd(self, cmd):
+        # type: (Text) -> Text
+        """Send a command and expect a response beginning with '2'."""
+        await self.putcmd(cmd)
+        return await self.voidresp()
+
+    async def login(self, user="", passwd="", acct=""):
+        # type: (Text, Text, Text) -> Text
+        """Log in, like `ftplib.FTP.login`."""
+        if not user:
+            user = "anonymous"
+        if not passwd:
+            passwd = ""
+        if user == "anonymous" and passwd in {"", "-"}:
+            passwd = passwd + "anonymous@"
+        resp = await self.sendcmd("USER " + user)
+        if resp[0] == "3":
+            resp = await self.sendcmd("PASS " + passwd)
+        if resp[0] == "3":
+            resp = await self.sendcmd("ACCT " + acct)
+        if resp[0] != "2":
+            raise error_reply(resp)
+        return resp
+
+    async def auth(self):
+        # type: () -> Text
+        """Secure the control connection (explicit TLS)."""
+        resp = await self.voidcmd("AUTH TLS")
+        await self._wait(self._writer.start_tls(self.context, server_hostname=self.host))
+        return resp
+
+    async def prot(self):
+        # type: () -> Text
+        """Secure the data connections."""
+        await self.voidcmd("PBSZ 0")
+        resp = await self.voidcmd("PROT P")
+        self.prot_p = True
+        return resp
+
+    @property
+    def session(self):
+        # type: () -> Optional[ssl.SSLSession]
+        """ssl.SSLSession: The TLS session of the control connection, or `None`."""
+        ssl_object = self._writer.get_extra_info("ssl_object") if self._writer else None
+        return ssl_object.session if ssl_object is not None else None
+
+    async def makepasv(self):
+        # type: () -> Tuple[Text, int]
+        """Get the address of a passive data connection."""
+        peer_host = self._writer.get_extra_info("peername")[0]
+        if self.af == socket.AF_INET:
+            _, port = ftplib.parse227(await self.sendcmd("PASV"))
+            # The address in the reply is not trusted, like in ftplib
+            return peer_host, port
+        return ftplib.parse229(await self.sendcmd("EPSV"), (peer_host,))
+
+    async def transfercmd(self, cmd, rest=None):
+        # type: (Text, Optional[int]) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        """Start a transfer, and return the streams of the data connection."""
+        host, port = await self.makepasv()
+        reader, writer = await self._wait(asyncio.open_connection(host, port))
+        try:
+            if rest is not None:
+                await self.sendcmd("REST %s" % rest)
+            resp = await self.sendcmd(cmd)
+            # Some servers apparently send a 200 reply to a LIST or STOR
+            # command before the 150 reply, see ftplib
+            if resp[0] == "2":
+                resp = await self.getresp()
+            if resp[0] != "1":
+                raise error_reply(resp)
+            if self.prot_p:
+                # Like ftplib, the data connection is secured once the
+                # server accepted the command
+                session = self.session if self.reuse_ssl_session else None
+                token = _resumed_session.set(session)
+                try:
+                    await self._wait(
+                        writer.start_tls(self.context, server_hostname=self.host)
+                    )
+                finally:
+                    _resumed_session.reset(token)
+        except BaseException:
+            writer.transport.abort()
+            raise
+        return reader, writer
+
+    async def recv(self, reader, size):
+        # type: (asyncio.StreamReader, int) -> bytes
+        """Receive up to ``size`` bytes from a data connection, or ``b""``
+        at the end of the transfer.
+        """
+        return await self._wait(reader.read(size))
+
+    async def recvline(self, reader):
+        # type: (asyncio.StreamReader) -> Text
+        """Receive a line of a listing from a data connection, or ``""``
+        at the end of the transfer.
+        """
+        try:
+            line = await self._wait(reader.readline())
+        except ValueError:
+            # The line is longer than the stream limit
+            raise error_proto("got more than %d bytes" % self.maxline)
+        if len(line) > self.maxline:
+            raise error_proto("got more than %d bytes" % self.maxline)
+        return line.decode(self.encoding)
+
+    async def send(self, writer, data):
+        # type: (asyncio.StreamWriter, bytes) -> None
+        """Send data to a data connection."""
+        writer.write(data)
+        await self._wait(writer.drain())
+
+    async def close_data(self, writer):
+        # type: (asyncio.StreamWriter) -> None
+        """Close a data connection, once all the data is sent."""
+        writer.close()
+        await self._wait(writer.wait_closed())
+
+    async def quit(self):
+        # type: () -> None
+        """Send ``QUIT``, and close the connection once the server replied."""
+        await self.voidcmd("QUIT")
+        writer, self._writer = self._writer, None
+        writer.close()
+        await self._wait(writer.wait_closed())
+
+    def close(self):
+        # type: () -> None
+        """Close the connection at once, like closing a socket, without
+        waiting for the end of a TLS session.
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.transport.abort()
+
+
+async def _close_connection(ftp, polite):
+    # type: (AsyncFTP, bool) -> None
+    """Close a connection, sending ``QUIT`` first if ``polite``."""
+    try:
+        if polite:
+            await ftp.quit()
+        else:
+            ftp.close()
+    except (OSError, EOFError, ftplib.Error) as error:
+        log.info(f"[pool] Unexpected network error on close (ignoring): {error}")
+    finally:
+        # Does nothing once the connection is closed
+        ftp.close()
+
+
+class AsyncConnectionPool(object):
+    """A pool of `AsyncFTP` control connections, for a single event loop.
+
+    The asyncio counterpart of `FTPConnectionPool`: at most ``max_size``
+    connections are leased with ``overflow=False`` at any one time, and
+    further callers wait until a connection is returned. Leases taken with
+    ``overflow=True`` (used by open files and listings) are counted
+    separately, against ``max_overflow``, so, they do not wait for the
+    short operations, but thousands of tasks opening files do not open
+    thousands of connections either.
+
+    Arguments:
+        max_size (int): Maximum number of concurrent non-overflow leases,
+            and maximum number of idle connections kept open.
+        max_overflow (int, optional): Maximum number of concurrent
+            overflow leases (default 16), or `None` for no limit. A task
+            keeping more files or listings open at once would wait
+            forever.
+
+    """
+
+    def __init__(self, max_size=4, max_overflow=16):
+        # type: (int, Optional[int]) -> None
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_overflow is not None and max_overflow < 1:
+            raise ValueError("max_overflow must be at least 1")
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self._idle = deque()  # type: Deque[AsyncFTP]
+        self._leases = {}  # type: Dict[AsyncFTP, bool]
+        # Created on first use, within the event loop
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._overflow_semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._closed = False
+
+    def __repr__(self):
+        # type: () -> str
+        return "<asyncftppool size={} idle={} leased={}>".format(
+            self.max_size, len(self._idle), len(self._leases)
+        )
+
+    @property
+    def idle_count(self):
+        # type: () -> int
+        """int: Number of idle connections kept by the pool."""
+        return len(self._idle)
+
+    @property
+    def leased_count(self):
+        # type: () -> int
+        """int: Number of connections currently leased out."""
+        return len(self._leases)
+
+    async def acquire(self, factory, overflow=False):
+        # type: (Callable[[], Awaitable[AsyncFTP]], bool) -> AsyncFTP
+        """Lease a connection, opening a new one with ``factory`` if none
+        is idle.
+        """
+        semaphore = self._get_semaphore(overflow)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            # The most recently released connection is the least likely
+            # to have been dropped by the server
+            ftp = self._idle.pop() if self._idle else await factory()
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        self._leases[ftp] = not overflow
+        return ftp
+
+    def _get_semaphore(self, overflow):
+        # type: (bool) -> Optional[asyncio.Semaphore]
+        """Get the semaphore counting a kind of leases, if any."""
+        if not overflow:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_size)
+            return self._semaphore
+        if self.max_overflow is None:
+            return None
+        if self._overflow_semaphore is None:
+            self._overflow_semaphore = asyncio.Semaphore(self.max_overflow)
+        return self._overflow_semaphore
+
+    async def release(self, ftp, discard=False):
+        # type: (AsyncFTP, bool) -> None
+        """Return a leased connection to the pool, or close it if
+        ``discard`` is `True` or the connection is out of sync.
+        """
+        counted = self._leases.pop(ftp, None)
+        if counted is None:
+            return
+        semaphore = self._get_semaphore(not counted)
+        if semaphore is not None:
+            semaphore.release()
+        discard = discard or ftp.broken
+        if not (discard or self._closed) and len(self._idle) < self.max_size:
+            self._idle.append(ftp)
+            return
+        await _close_connection(ftp, polite=not discard)
+
+    def discard(self, ftp):
+        # type: (AsyncFTP) -> None
+        """End a lease at once, closing its connection without waiting,
+        e.g. for a file garbage collected without being closed.
+        """
+        counted = self._leases.pop(ftp, None)
+        if counted is None:
+            return
+        semaphore = self._get_semaphore(not counted)
+        if semaphore is not None:
+            semaphore.release()
+        ftp.close()
+
+    async def close(self):
+        # type: () -> None
+        """Close all idle connections and stop keeping released ones."""
+        self._closed = True
+        while self._idle:
+            await _close_connection(self._idle.pop(), polite=True)
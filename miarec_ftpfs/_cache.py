@@ -0,0 +1,116 @@
+"""A bounded cache of FTP directory listings.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+if typing.TYPE_CHECKING:
+    from typing import Dict, Optional, Text, Tuple
+
+    from fs.info import Info
+
+
+__all__ = ["DirectoryCache"]
+
+
+class DirectoryCache(object):
+    """A thread-safe LRU cache of directory listings with a time-to-live.
+
+    Listings are keyed by the absolute, normalized path of the directory.
+    Each listing is a mapping of resource names to `~fs.info.Info` objects.
+
+    Invalidation bumps a generation counter, so, a listing fetched while a
+    concurrent operation modified the server is not stored (see `token`).
+
+    Arguments:
+        max_size (int): Maximum number of directories kept in the cache.
+        ttl (float): Number of seconds a listing stays valid.
+
+    """
+
+    def __init__(self, max_size=1000, ttl=30.0):
+        # type: (int, float) -> None
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listings = OrderedDict()  # type: OrderedDict[Text, Tuple[float, Dict[Text, Info]]]
+        self._generation = 0
+
+    def __repr__(self):
+        # type: () -> str
+        return "<dircache size={} ttl={}>".format(self.max_size, self.ttl)
+
+    def __len__(self):
+        # type: () -> int
+        with self._lock:
+            return len(self._listings)
+
+    def token(self):
+        # type: () -> int
+        """Get a token to pass to `set` for a listing about to be fetched."""
+        with self._lock:
+            return self._generation
+
+    def get(self, path):
+        # type: (Text) -> Optional[Dict[Text, Info]]
+        """Get the listing of a directory, or `None` if not cached."""
+        with self._lock:
+            entry = self._listings.get(path)
+            if entry is None:
+                return None
+            expires, listing = entry
+            if expires <= time.monotonic():
+                del self._listings[path]
+                return None
+            self._listings.move_to_end(path)
+            return listing
+
+    def set(self, path, listing, token):
+        # type: (Text, Dict[Text, Info], int) -> None
+        """Store the listing of a directory.
+
+        The listing is ignored if the cache was invalidated after ``token``
+        was taken.
+        """
+        with self._lock:
+            if token != self._generation:
+                return
+            self._listings[path] = (time.monotonic() + self.ttl, listing)
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_size:
+                self._listings.popitem(last=False)
+
+    def invalidate(self, path, subtree=False):
+        # type: (Text, bool) -> None
+        """Forget the listing of the directory containing ``path``.
+
+        Arguments:
+            path (str): Absolute path of a modified resource.
+            subtree (bool): Also forget the listings of ``path`` itself and
+                of all its subdirectories, e.g. when a directory is removed
+                or renamed.
+
+        """
+        parent = path.rpartition("/")[0] or "/"
+        with self._lock:
+            self._generation += 1
+            self._listings.pop(parent, None)
+            if subtree:
+                prefix = path.rstrip("/") + "/"
+                for key in [
+                    key
+                    for key in self._listings
+                    if key == path or key.startswith(prefix)
+                ]:
+                    del self._listings[key]
+
+    def clear(self):
+        # type: () -> None
+        """Forget all listings."""
+        with self._lock:
+            self._generation += 1
+            self._listings.clear()
@@ -15,6 +15,24 @@ from fs.permissions import Permissions
 
 EPOCH_DT = datetime.fromtimestamp(0, timezone.utc)
 
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun",
+         "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+_DIRECTORY = int(ResourceType.directory)
+_FILE = int(ResourceType.file)
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # pragma: no cover (Python < 3.7)
+    def _isascii(text):
+        return all(ord(char) < 128 for char in text)
+
 
 RE_LINUX = re.compile(
     r"""
@@ -64,23 +82,117 @@ def get_decoders():
     return decoders
 
 
-def parse(lines):
-    info = []
+# The first characters of the lines matched by RE_LINUX, which the loose
+# RE_WINDOWSNT pattern matches too
+_LINUX_TYPES = frozenset("-dlpscbD")
+
+
+class ListingParser(object):
+    """Parse the lines of a single FTP LIST response.
+
+    The decoders are looked up once per listing rather than once per line,
+    and the decoder of the previous line is tried first, as the lines of a
+    listing usually share a format. Timestamps and permissions repeat a
+    lot within a listing, so, each distinct value is decoded only once.
+    Use a new parser for every listing.
+    """
+
+    def __init__(self):
+        self.decoders = get_decoders()
+        # The decoder of the previous line
+        self._last = None
+        # Used for timestamps without a year, e.g. "Nov 28 01:01"
+        self.year = time.localtime().tm_year
+        self._times = {}
+        self._permissions = {}
+
+    def parse_line(self, line):
+        last = self._last
+        # The decoders are otherwise tried in order: the Windows NT pattern
+        # is loose enough to also match ``ls -l`` lines
+        if last is not None and (
+            last[1] is not decode_windowsnt or line[:1] not in _LINUX_TYPES
+        ):
+            match = last[0].match(line)
+            if match is not None:
+                return last[1](line, match, self)
+        else:
+            last = None
+        for decoder in self.decoders:
+            if decoder is last:
+                continue  # Already tried
+            match = decoder[0].match(line)
+            if match is not None:
+                self._last = decoder
+                return decoder[1](line, match, self)
+        return None
+
+    def decode_linux_time(self, mtime):
+        try:
+            return self._times[mtime]
+        except KeyError:
+            epoch_time = self._times[mtime] = _linux_time_to_epoch(mtime, self.year)
+            return epoch_time
+
+    def decode_windowsnt_time(self, mtime):
+        try:
+            return self._times[mtime]
+        except KeyError:
+            epoch_time = self._times[mtime] = _windowsnt_time_to_epoch(mtime)
+            return epoch_time
+
+    def decode_permissions(self, perms):
+        try:
+            permissions = self._permissions[perms]
+        except KeyError:
+            permissions = self._permissions[perms] = Permissions.parse(perms).dump()
+        return list(permissions)
+
+
+def iter_parse(lines):
+    """Parse FTP LIST lines lazily, yielding a raw info dict per entry."""
+    parser = ListingParser()
     for line in lines:
         if not line.strip():
             continue
-        raw_info = parse_line(line)
+        raw_info = parser.parse_line(line)
         if raw_info is not None:
-            info.append(raw_info)
-    return info
+            yield raw_info
+
+
+def iter_parse_recursive(lines):
+    """Parse the lines of a recursive FTP LIST (``ls -lR``) response lazily.
+
+    The listing is made of sections separated by blank lines, each one
+    starting with the path of a directory followed by a colon (except,
+    on most servers, the first one). A ``(header, None)`` tuple is yielded
+    at the start of each section, with the header as sent by the server,
+    then a ``(header, raw_info)`` tuple per entry. The header of the
+    entries listed before the first header is `None`.
+    """
+    parser = ListingParser()
+    header = None
+    new_section = True
+    for line in lines:
+        if not line.strip():
+            new_section = True
+            continue
+        if new_section and line.endswith(":"):
+            header = line[:-1]
+            yield header, None
+        else:
+            raw_info = parser.parse_line(line)
+            if raw_info is not None:
+                yield header, raw_info
+        new_section = False
+
+
+def parse(lines):
+    return list(iter_parse(lines))
 
 
 def parse_line(line):
-    for line_re, decode_callable in get_decoders():
-        match = line_re.match(line)
-        if match is not None:
-            return decode_callable(line, match)
-    return None
+    return ListingParser().parse_line(line)
 
 
 def _parse_time(t, formats):
@@ -104,11 +216,68 @@ def _parse_time(t, formats):
     return epoch_time
 
 
-def _decode_linux_time(mtime):
-    return _parse_time(mtime, formats=["%b %d %Y", "%b %d %H:%M"])
+def _to_epoch(year, month, day, hour, minutes):
+    dt = datetime(year, month, day, hour, minutes, tzinfo=timezone.utc)
+    return (dt - EPOCH_DT).total_seconds()
 
 
-def decode_linux(line, match):
+def _linux_time_to_epoch(mtime, year):
+    """Convert a ``ls -l`` timestamp, like ``Nov 28  2017`` or ``Nov 28 01:01``.
+
+    Equivalent to `_parse_time` with the ``%b %d %Y`` and ``%b %d %H:%M``
+    formats, without the overhead of `time.strptime`.
+    """
+    try:
+        month_name, day, year_or_time = mtime.split()
+        month = _MONTHS[month_name.lower()]
+        hour, colon, minutes = year_or_time.partition(":")
+        if colon:
+            if not (hour.isdigit() and minutes.isdigit()) or len(hour) > 2 or len(minutes) > 2:
+                return None
+            hour, minutes = int(hour), int(minutes)
+        else:
+            if not (year_or_time.isdigit() and len(year_or_time) == 4):
+                return None
+            year, hour, minutes = int(year_or_time), 0, 0
+        if not day.isdigit() or len(day) > 2:
+            return None
+        return _to_epoch(year, month, int(day), hour, minutes)
+    except (KeyError, ValueError):
+        return None
+
+
+def _windowsnt_time_to_epoch(mtime):
+    """Convert a Windows NT timestamp, like ``11-02-18 02:12PM`` or ``11-02-18 14:12``.
+
+    Equivalent to `_parse_time` with the ``%d-%m-%y %I:%M%p`` and
+    ``%d-%m-%y %H:%M`` formats, without the overhead of `time.strptime`.
+    """
+    try:
+        date, clock = mtime.split()
+        day, month, year = date.split("-")
+        suffix = clock[-2:].upper()
+        if suffix in ("AM", "PM"):
+            clock = clock[:-2]
+        hour, minutes = clock.split(":")
+        if not all(
+            part.isdigit() and 0 < len(part) <= 2 for part in (day, month, hour, minutes)
+        ) or not (year.isdigit() and len(year) == 2):
+            return None
+        hour = int(hour)
+        if suffix in ("AM", "PM"):
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if suffix == "PM" else 0)
+        year = int(year)
+        year += 2000 if year < 69 else 1900
+        return _to_epoch(year, int(month), int(day), hour, int(minutes))
+    except ValueError:
+        return None
+
+
+def decode_linux(line, match, parser=None):
+    if parser is None:
+        parser = ListingParser()
     ty, perms, links, uid, gid, size, mtime, name = match.groups()
     is_link = ty == "l"
     is_dir = ty == "d" or is_link
@@ -116,19 +285,19 @@ def decode_linux(line, match):
         name, _, _link_name = name.partition("->")
         name = name.strip()
         _link_name = _link_name.strip()
-    permissions = Permissions.parse(perms)
 
-    mtime_epoch = _decode_linux_time(mtime)
+    mtime_epoch = parser.decode_linux_time(mtime)
 
-    name = unicodedata.normalize("NFC", name)
+    if not _isascii(name):
+        name = unicodedata.normalize("NFC", name)
 
     raw_info = {
         "basic": {"name": name, "is_dir": is_dir},
         "details": {
             "size": int(size),
-            "type": int(ResourceType.directory if is_dir else ResourceType.file),
+            "type": _DIRECTORY if is_dir else _FILE,
         },
-        "access": {"permissions": permissions.dump()},
+        "access": {"permissions": parser.decode_permissions(perms)},
         "ftp": {"ls": line},
     }
     access = raw_info["access"]
@@ -142,11 +311,7 @@ def decode_linux(line, match):
     return raw_info
 
 
-def _decode_windowsnt_time(mtime):
-    return _parse_time(mtime, formats=["%d-%m-%y %I:%M%p", "%d-%m-%y %H:%M"])
-
-
-def decode_windowsnt(line, match):
+def decode_windowsnt(line, match, parser=None):
     """Decode a Windows NT FTP LIST line.
 
     Examples:
@@ -176,6 +341,8 @@ def decode_windowsnt(line, match):
             1518363180.0
 
     """
+    if parser is None:
+        parser = ListingParser()
     is_dir = match.group("size") == "<DIR>"
 
     raw_info = {
@@ -184,7 +351,7 @@ def decode_windowsnt(line, match):
             "is_dir": is_dir,
         },
         "details": {
-            "type": int(ResourceType.directory if is_dir else ResourceType.file),
+            "type": _DIRECTORY if is_dir else _FILE,
         },
         "ftp": {"ls": line},
     }
@@ -192,7 +359,7 @@ def decode_windowsnt(line, match):
     if not is_dir:
         raw_info["details"]["size"] = int(match.group("size"))
 
-    modified = _decode_windowsnt_time(
+    modified = parser.decode_windowsnt_time(
         match.group("modified_date") + " " + match.group("modified_time")
     )
     if modified is not None:
@@ -0,0 +1,177 @@
+"""Checksums of remote files, computed by the server or locally.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import re
+import typing
+import zlib
+
+from fs import errors
+from fs.path import basename
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Text
+
+
+__all__ = [
+    "HashWriter",
+    "default_hash_algorithm",
+    "hash_commands",
+    "new_hash",
+    "parse_hash_reply",
+]
+
+
+#: Algorithms the server may compute: hashlib name -> (name in the
+#: ``HASH`` feature, legacy ``X*`` command, number of hex digits).
+_ALGORITHMS = {
+    "md5": ("MD5", "XMD5", 32),
+    "sha1": ("SHA-1", "XSHA1", 40),
+    "sha256": ("SHA-256", "XSHA256", 64),
+    "sha512": ("SHA-512", "XSHA512", 128),
+    "crc32": ("CRC32", "XCRC", 8),
+}
+
+_RE_HEX = re.compile(r"^[0-9a-fA-F]+$")
+
+
+class _CRC32(object):
+    """A `hashlib`-like object for CRC32 checksums (as computed by ``XCRC``)."""
+
+    name = "crc32"
+
+    def __init__(self):
+        # type: () -> None
+        self._value = 0
+
+    def update(self, data):
+        # type: (Any) -> None
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self):
+        # type: () -> Text
+        return "{:08x}".format(self._value & 0xFFFFFFFF)
+
+
+def new_hash(name):
+    # type: (Text) -> Any
+    """Create a hash object, like `hashlib.new`, with ``crc32`` support.
+
+    Raises:
+        fs.errors.UnsupportedHash: if the algorithm is not supported.
+
+    """
+    if name.lower() == "crc32":
+        return _CRC32()
+    try:
+        return hashlib.new(name)
+    except ValueError:
+        raise errors.UnsupportedHash("hash '{}' is not supported".format(name))
+
+
+def hash_commands(name, features):
+    # type: (Text, Dict[Text, Text]) -> Optional[Text]
+    """Get the way a server computes a hash, according to its features.
+
+    Returns:
+        str: the algorithm name to use with the ``HASH`` command (as
+        ``"HASH <algorithm>"``), the name of an ``X*`` command (e.g.
+        ``"XMD5"``), or `None` if the server does not support the
+        algorithm.
+
+    """
+    algorithm = _ALGORITHMS.get(name.lower())
+    if algorithm is None:
+        return None
+    hash_name, command, _ = algorithm
+    # e.g. "HASH SHA-1;SHA-256*;MD5;CRC32", the star marks the current one
+    supported = features.get("HASH", "").upper().replace("*", "").split(";")
+    if hash_name in supported:
+        return "HASH " + hash_name
+    if command in features:
+        return command
+    return None
+
+
+def default_hash_algorithm(features):
+    # type: (Dict[Text, Text]) -> Optional[Text]
+    """Get the algorithm selected by default for the ``HASH`` command."""
+    for hash_name in features.get("HASH", "").upper().split(";"):
+        if hash_name.endswith("*"):
+            return hash_name[:-1]
+    return None
+
+
+def parse_hash_reply(name, reply, command, path=None):
+    # type: (Text, Text, Text, Optional[Text]) -> Optional[Text]
+    """Extract a lowercase hex digest from a ``HASH`` or ``X*`` reply.
+
+    ``HASH`` replies are defined as ``213 <algorithm> <range> <digest>
+    <path>``, and parsed as such. The format of ``X*`` replies varies
+    between servers (the digest may be preceded or followed by the path),
+    so, the digest is the first word, other than the path, made of the
+    expected number of hex digits. A shorter CRC32 value, which some
+    servers do not pad with zeros, is only accepted if it is the only
+    hex word of the reply.
+
+    Arguments:
+        name (str): The hash algorithm, e.g. ``"md5"``.
+        reply (str): The reply of the server.
+        command (str): The command sent, as returned by `hash_commands`.
+        path (str, optional): The path of the file.
+
+    Returns:
+        str: the digest, or `None` if none was found in the reply.
+
+    """
+    hash_name, _, digits = _ALGORITHMS[name.lower()]
+    if command.startswith("HASH "):
+        fields = reply[4:].split(None, 3)
+        if len(fields) < 3 or fields[0].upper() != hash_name:
+            return None
+        return _check_digest(fields[2], digits)
+
+    text = reply[4:]
+    if path:
+        # The path may contain spaces
+        text = text.replace(path, " ")
+    excluded = {basename(path)} if path else set()
+    words = [
+        word
+        for word in (word.strip("\"'") for word in text.split())
+        if _RE_HEX.match(word) and word not in excluded
+    ]
+    for word in words:
+        if len(word) == digits:
+            return word.lower()
+    if len(words) == 1:
+        return _check_digest(words[0], digits)
+    return None
+
+
+def _check_digest(word, digits):
+    # type: (Text, int) -> Optional[Text]
+    """Get a lowercase digest of ``digits`` hex digits, or `None`."""
+    if not _RE_HEX.match(word):
+        return None
+    if len(word) == digits:
+        return word.lower()
+    if digits == 8 and len(word) < digits:
+        # Some servers do not pad CRC32 values with zeros
+        return word.lower().zfill(digits)
+    return None
+
+
+class HashWriter(object):
+    """A write-only file-like object which feeds a hash object."""
+
+    def __init__(self, hash_object):
+        # type: (Any) -> None
+        self.hash_object = hash_object
+
+    def write(self, data):
+        # type: (Any) -> int
+        self.hash_object.update(data)
+        return len(data)
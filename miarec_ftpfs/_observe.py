@@ -0,0 +1,340 @@
+"""Report the FTP commands, data transfers and connections of a filesystem
+to observers, e.g. to collect metrics.
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import ftplib
+import math
+import threading
+import time
+import typing
+from collections import Counter, deque, namedtuple
+
+if typing.TYPE_CHECKING:
+    from typing import Deque, Dict, Iterable, List, Optional, Text, Tuple
+
+
+import logging
+log = logging.getLogger(__name__)
+
+
+__all__ = [
+    "CommandEvent",
+    "ConnectionEvent",
+    "FTPObserver",
+    "MetricsAggregator",
+    "TransferEvent",
+    "WaitEvent",
+]
+
+
+class CommandEvent(namedtuple("CommandEvent", ["verb", "latency", "code"])):
+    """A control command, and its reply.
+
+    Attributes:
+        verb (str): The command, without its arguments, e.g. ``"RETR"``.
+        latency (float): Number of seconds until the reply was received.
+        code (str): The reply code, e.g. ``"550"``, or `None` if no
+            reply was received.
+
+    """
+
+    __slots__ = ()
+
+
+class TransferEvent(
+    namedtuple("TransferEvent", ["direction", "bytes_transferred", "duration"])
+):
+    """A completed (or interrupted) data transfer.
+
+    Attributes:
+        direction (str): ``"download"``, ``"upload"`` or ``"list"``.
+        bytes_transferred (int): Number of bytes transferred.
+        duration (float): Duration of the transfer, in seconds.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        # type: () -> float
+        """float: Average number of bytes transferred per second."""
+        return self.bytes_transferred / self.duration if self.duration > 0 else 0.0
+
+
+class ConnectionEvent(namedtuple("ConnectionEvent", ["action", "duration"])):
+    """A control connection was opened or closed.
+
+    Attributes:
+        action (str): ``"open"`` once a connection is logged in,
+            ``"close"`` once it is closed, or ``"discard"`` once a broken
+            connection is closed (the next operation opens a new one).
+        duration (float): Number of seconds it took.
+
+    """
+
+    __slots__ = ()
+
+
+class WaitEvent(namedtuple("WaitEvent", ["resource", "duration"])):
+    """A thread waited for a shared resource.
+
+    Attributes:
+        resource (str): ``"pool"`` for a connection of the pool, or
+            ``"overflow"`` for an overflow lease, e.g. of an open file.
+        duration (float): Number of seconds waited.
+
+    """
+
+    __slots__ = ()
+
+
+class FTPObserver(object):
+    """Receive the events of a filesystem, see `FTPFS.add_observer`.
+
+    The methods do nothing, subclasses override those they need. They are
+    called from the threads running the operations, so, they should be
+    thread-safe and fast. Exceptions they raise are logged and ignored.
+    """
+
+    def on_command(self, event):
+        # type: (CommandEvent) -> None
+        """Called once the reply to a control command is received."""
+
+    def on_transfer(self, event):
+        # type: (TransferEvent) -> None
+        """Called at the end of a data transfer."""
+
+    def on_connection(self, event):
+        # type: (ConnectionEvent) -> None
+        """Called when a control connection is opened or closed."""
+
+    def on_wait(self, event):
+        # type: (WaitEvent) -> None
+        """Called once a thread got a shared resource."""
+
+
+class Observers(object):
+    """The observers of a filesystem, shared with its connections.
+
+    Events are only built if `active` is true, so, a filesystem without
+    observers pays for a single attribute lookup.
+    """
+
+    def __init__(self, observers=()):
+        # type: (Iterable[FTPObserver]) -> None
+        # Replaced rather than modified, so, it is iterated without a lock
+        self.active = tuple(observers)
+        self._lock = threading.Lock()
+
+    def add(self, observer):
+        # type: (FTPObserver) -> None
+        with self._lock:
+            self.active = self.active + (observer,)
+
+    def remove(self, observer):
+        # type: (FTPObserver) -> None
+        with self._lock:
+            observers = list(self.active)
+            observers.remove(observer)
+            self.active = tuple(observers)
+
+    def emit(self, method, event):
+        # type: (Text, object) -> None
+        for observer in self.active:
+            try:
+                getattr(observer, method)(event)
+            except Exception as error:
+                log.warning(f"[observer] {observer!r}.{method} failed: {error}")
+
+    def transfer(self, direction, bytes_transferred, duration):
+        # type: (Text, int, float) -> None
+        if self.active:
+            self.emit("on_transfer", TransferEvent(direction, bytes_transferred, duration))
+
+    def connection(self, action, duration):
+        # type: (Text, float) -> None
+        if self.active:
+            self.emit("on_connection", ConnectionEvent(action, duration))
+
+    def wait(self, resource, duration):
+        # type: (Text, float) -> None
+        if self.active:
+            self.emit("on_wait", WaitEvent(resource, duration))
+
+
+class ObservedCommands(object):
+    """Mixin of `ftplib.FTP` classes, reporting each command to ``observers``."""
+
+    observers = None  # type: Optional[Observers]
+    # The command waiting for its reply, and the time it was sent
+    _command = None  # type: Optional[Tuple[Text, float]]
+
+    def putcmd(self, line):
+        # type: (Text) -> None
+        observers = self.observers
+        if observers is not None and observers.active:
+            self._command = (line.split(" ", 1)[0].upper(), time.perf_counter())
+        super(ObservedCommands, self).putcmd(line)  # type: ignore
+
+    def getresp(self):
+        # type: () -> Text
+        command = self._command
+        if command is None:
+            # e.g. the welcome message, or the final reply of a transfer
+            return super(ObservedCommands, self).getresp()  # type: ignore
+        self._command = None
+        code = None
+        try:
+            resp = super(ObservedCommands, self).getresp()  # type: ignore
+            code = resp[:3]
+            return resp
+        except ftplib.Error as error:
+            code = str(error)[:3]
+            raise
+        finally:
+            latency = time.perf_counter() - command[1]
+            self.observers.emit("on_command", CommandEvent(command[0], latency, code))  # type: ignore
+
+
+class ObservedFTP(ObservedCommands, ftplib.FTP):
+    """An `ftplib.FTP` reporting each command to ``observers``."""
+
+
+class MetricsAggregator(FTPObserver):
+    """An observer keeping statistics in memory.
+
+    Durations are grouped by metric name: ``"command.<VERB>"`` (the
+    latency of a command), ``"transfer.<direction>"``,
+    ``"connection.<action>"`` and ``"wait.<resource>"``. Percentiles are
+    computed on the most recent ``max_samples`` durations of each metric.
+
+    Example:
+        >>> metrics = MetricsAggregator()
+        >>> ftp_fs.add_observer(metrics)
+        >>> ftp_fs.listdir("/")
+        >>> metrics.percentiles("command.PASV")
+        {50: 0.0012, 90: 0.0015, 99: 0.0021}
+
+    """
+
+    def __init__(self, max_samples=10000):
+        # type: (int) -> None
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}  # type: Dict[Text, Deque[float]]
+        self._counts = Counter()  # type: Counter[Text]
+        self._bytes = Counter()  # type: Counter[Text]
+        self._codes = Counter()  # type: Counter[Tuple[Text, Optional[Text]]]
+
+    def _add(self, name, duration):
+        # type: (Text, float) -> None
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.max_samples)
+        samples.append(duration)
+        self._counts[name] += 1
+
+    def on_command(self, event):
+        # type: (CommandEvent) -> None
+        with self._lock:
+            self._add("command." + event.verb, event.latency)
+            self._codes[event.verb, event.code] += 1
+
+    def on_transfer(self, event):
+        # type: (TransferEvent) -> None
+        with self._lock:
+            self._add("transfer." + event.direction, event.duration)
+            self._bytes[event.direction] += event.bytes_transferred
+
+    def on_connection(self, event):
+        # type: (ConnectionEvent) -> None
+        with self._lock:
+            self._add("connection." + event.action, event.duration)
+
+    def on_wait(self, event):
+        # type: (WaitEvent) -> None
+        with self._lock:
+            self._add("wait." + event.resource, event.duration)
+
+    @property
+    def names(self):
+        # type: () -> List[Text]
+        """list: The names of the metrics recorded so far."""
+        with self._lock:
+            return sorted(self._samples)
+
+    def count(self, name):
+        # type: (Text) -> int
+        """Get the number of events of a metric, since the last `reset`."""
+        with self._lock:
+            return self._counts[name]
+
+    def bytes_transferred(self, direction):
+        # type: (Text) -> int
+        """Get the number of bytes transferred in a direction."""
+        with self._lock:
+            return self._bytes[direction]
+
+    def reply_codes(self, verb):
+        # type: (Text) -> Dict[Optional[Text], int]
+        """Get the number of replies to a command, by reply code."""
+        with self._lock:
+            return {
+                code: count
+                for (_verb, code), count in self._codes.items()
+                if _verb == verb
+            }
+
+    def percentiles(self, name, percents=(50, 90, 99)):
+        # type: (Text, Iterable[float]) -> Dict[float, float]
+        """Get percentiles of the durations of a metric, in seconds.
+
+        Uses the nearest-rank method. The dict is empty if there is no
+        sample of the metric.
+        """
+        with self._lock:
+            samples = list(self._samples.get(name, ()))
+        return self._percentiles(samples, percents) if samples else {}
+
+    def summary(self, percents=(50, 90, 99)):
+        # type: (Iterable[float]) -> Dict[Text, Dict[Text, float]]
+        """Get the count, percentiles and maximum of each metric.
+
+        Example:
+            >>> metrics.summary()["command.RETR"]
+            {'count': 12, 'p50': 0.0011, 'p90': 0.0019, 'p99': 0.0042, 'max': 0.0042}
+
+        """
+        percents = tuple(percents)
+        summary = {}
+        for name in self.names:
+            with self._lock:
+                samples = list(self._samples[name])
+                count = self._counts[name]
+            stats = {"count": count}  # type: Dict[Text, float]
+            for percent, value in self._percentiles(samples, percents).items():
+                stats["p{:g}".format(percent)] = value
+            stats["max"] = max(samples)
+            summary[name] = stats
+        return summary
+
+    @staticmethod
+    def _percentiles(samples, percents):
+        # type: (List[float], Iterable[float]) -> Dict[float, float]
+        samples = sorted(samples)
+        return {
+            percent: samples[max(0, int(math.ceil(percent / 100 * len(samples))) - 1)]
+            for percent in percents
+        }
+
+    def reset(self):
+        # type: () -> None
+        """Forget all the statistics."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._bytes.clear()
+            self._codes.clear()
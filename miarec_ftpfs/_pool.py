@@ -0,0 +1,424 @@
+"""A bounded pool of logged-in FTP control connections.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import ftplib
+import threading
+import time
+import typing
+from collections import deque
+
+if typing.TYPE_CHECKING:
+    from ftplib import FTP
+    from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+    from ._observe import Observers
+
+import logging
+log = logging.getLogger(__name__)
+
+
+__all__ = ["FTPConnectionPool"]
+
+
+def _close_connection(ftp, polite):
+    # type: (FTP, bool) -> None
+    """Close a connection, sending ``QUIT`` first if ``polite``."""
+    try:
+        if polite:
+            ftp.quit()
+        else:
+            ftp.close()
+    except (OSError, EOFError, ftplib.Error) as error:
+        log.info(f"[pool] Unexpected network error on close (ignoring): {error}")
+        try:
+            ftp.close()
+        except Exception:  # pragma: no cover
+            pass
+
+
+class FTPConnectionPool(object):
+    """A thread-safe pool of FTP control connections.
+
+    Connections are opened lazily by the ``factory`` given to `acquire`.
+    At most ``max_size`` connections are leased with ``overflow=False`` at
+    any one time; further callers block until a connection is returned.
+    Leases taken with ``overflow=True`` (used by open files and listings)
+    are counted separately, against ``max_overflow``, so, they do not wait
+    for the short operations, but many threads opening files do not open
+    as many connections either. A thread already holding a lease is not
+    blocked by ``max_overflow``, so, it never waits for itself, e.g. to
+    open a file while iterating over a listing. Only up to ``max_size``
+    idle connections are kept around once they are released.
+
+    A connection released with ``discard=True`` is closed instead of being
+    returned to the pool, so the next lease opens a fresh one.
+
+    Idle connections can be kept alive, and retired after some time, by
+    `maintain`, which `start_maintenance` runs periodically in a
+    background thread. Connections past ``max_idle`` or ``max_lifetime``
+    are never leased.
+
+    Arguments:
+        max_size (int): Maximum number of concurrent non-overflow leases,
+            and maximum number of idle connections kept open.
+        max_overflow (int, optional): Maximum number of concurrent
+            overflow leases (default 16), or `None` for no limit. Nested
+            leases of a thread may exceed it, see above.
+        keepalive (float, optional): Number of seconds after which an
+            idle connection is sent a ``NOOP`` command by `maintain`, or
+            `None` (the default) to never send one.
+        max_idle (float, optional): Number of seconds after which an
+            idle connection is closed, or `None` (the default).
+        max_lifetime (float, optional): Number of seconds after which a
+            connection is closed once it is idle, or `None` (the default).
+        observers (Observers, optional): Notified of the time waited for
+            a connection, and of the connections closed.
+
+    """
+
+    def __init__(
+        self,
+        max_size=4,  # type: int
+        max_overflow=16,  # type: Optional[int]
+        keepalive=None,  # type: Optional[float]
+        max_idle=None,  # type: Optional[float]
+        max_lifetime=None,  # type: Optional[float]
+        observers=None,  # type: Optional[Observers]
+    ):
+        # type: (...) -> None
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_overflow is not None and max_overflow < 1:
+            raise ValueError("max_overflow must be at least 1")
+        for name, value in (
+            ("keepalive", keepalive),
+            ("max_idle", max_idle),
+            ("max_lifetime", max_lifetime),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError("{} must be positive".format(name))
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.keepalive = keepalive
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.observers = observers
+        # Per-thread state, used to share a single lease among nested calls
+        self.local = threading.local()
+        lock = threading.Lock()
+        self._cond = threading.Condition(lock)
+        # Notified when an overflow lease ends
+        self._overflow_cond = threading.Condition(lock)
+        # Idle connections, with the time they were last used
+        self._idle = deque()  # type: Deque[Tuple[FTP, float]]
+        self._leases = {}  # type: Dict[FTP, bool]
+        # Thread holding each lease, and number of leases of each thread
+        self._owners = {}  # type: Dict[FTP, int]
+        self._held = {}  # type: Dict[int, int]
+        # Time each connection was opened
+        self._opened = {}  # type: Dict[FTP, float]
+        self._in_use = 0
+        self._overflow_in_use = 0
+        self._closed = False
+        self._stop = threading.Event()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def __repr__(self):
+        # type: () -> str
+        with self._cond:
+            return "<ftppool size={} idle={} leased={}>".format(
+                self.max_size, len(self._idle), len(self._leases)
+            )
+
+    @property
+    def idle_count(self):
+        # type: () -> int
+        """int: Number of idle connections kept by the pool."""
+        with self._cond:
+            return len(self._idle)
+
+    @property
+    def leased_count(self):
+        # type: () -> int
+        """int: Number of connections currently leased out."""
+        with self._cond:
+            return len(self._leases)
+
+    def acquire(self, factory, overflow=False):
+        # type: (Callable[[], FTP], bool) -> FTP
+        """Lease a connection, opening a new one if none is idle.
+
+        Arguments:
+            factory (callable): A callable returning a new, logged-in
+                `ftplib.FTP` object. It is not stored, so, the pool does
+                not keep its owner alive.
+            overflow (bool): If `True`, count the lease against
+                ``max_overflow`` rather than ``max_size``.
+
+        """
+        thread = threading.current_thread().ident
+        with self._cond:
+            start = time.perf_counter()
+            if not overflow:
+                while self._in_use >= self.max_size:
+                    self._cond.wait()
+                self._in_use += 1
+                if self.observers is not None:
+                    self.observers.wait("pool", time.perf_counter() - start)
+            elif self.max_overflow is not None:
+                # A thread holding a lease could wait for itself
+                while (
+                    self._overflow_in_use >= self.max_overflow
+                    and not self._held.get(thread)
+                ):
+                    self._overflow_cond.wait()
+                self._overflow_in_use += 1
+                if self.observers is not None:
+                    self.observers.wait("overflow", time.perf_counter() - start)
+            # The most recently released connection is the least likely
+            # to have been dropped by the server
+            ftp = None
+            expired = []  # type: List[FTP]
+            now = time.monotonic()
+            while self._idle:
+                ftp, since = self._idle.pop()
+                if not self._is_expired(ftp, since, now):
+                    break
+                expired.append(ftp)
+                ftp = None
+            for _ftp in expired:
+                del self._opened[_ftp]
+
+        for _ftp in expired:
+            # Not worth a round trip on the way to the caller
+            self._close(_ftp, polite=False)
+
+        if ftp is None:
+            try:
+                ftp = factory()
+            except BaseException:
+                with self._cond:
+                    self._end_lease(not overflow)
+                raise
+
+        with self._cond:
+            self._leases[ftp] = not overflow
+            self._owners[ftp] = thread
+            self._held[thread] = self._held.get(thread, 0) + 1
+            self._opened.setdefault(ftp, time.monotonic())
+        return ftp
+
+    def _end_lease(self, counted):
+        # type: (bool) -> None
+        """Let the next caller waiting for a lease of the same kind in.
+
+        Must be called with the lock held.
+        """
+        if counted:
+            self._in_use -= 1
+            self._cond.notify()
+        elif self.max_overflow is not None:
+            self._overflow_in_use -= 1
+            self._overflow_cond.notify()
+
+    def _is_expired(self, ftp, since, now):
+        # type: (FTP, float, float) -> bool
+        """Tell if an idle connection must be retired."""
+        if self.max_idle is not None and now - since >= self.max_idle:
+            return True
+        opened = self._opened.get(ftp, now)
+        return self.max_lifetime is not None and now - opened >= self.max_lifetime
+
+    def _keep(self, ftp):
+        # type: (FTP) -> bool
+        """Add a connection to the idle ones, if there is room for it.
+
+        Must be called with the lock held.
+        """
+        if self._closed or len(self._idle) >= self.max_size:
+            self._opened.pop(ftp, None)
+            return False
+        self._idle.append((ftp, time.monotonic()))
+        return True
+
+    def release(self, ftp, discard=False):
+        # type: (FTP, bool) -> None
+        """Return a leased connection to the pool.
+
+        Arguments:
+            ftp (ftplib.FTP): A connection returned by `acquire`.
+            discard (bool): If `True`, the connection is assumed to be
+                broken and is closed instead of being kept.
+
+        """
+        with self._cond:
+            counted = self._leases.pop(ftp, None)
+            if counted is None:
+                # Already released (or discarded) by a nested call
+                return
+            # The lease may end in another thread, e.g. the garbage collector
+            thread = self._owners.pop(ftp)
+            if self._held[thread] > 1:
+                self._held[thread] -= 1
+            else:
+                del self._held[thread]
+            self._end_lease(counted)
+            if discard:
+                self._opened.pop(ftp, None)
+            elif self._keep(ftp):
+                return
+        self._close(ftp, polite=not discard, action="discard" if discard else "close")
+
+    def _close(self, ftp, polite, action="close"):
+        # type: (FTP, bool, str) -> None
+        start = time.perf_counter()
+        _close_connection(ftp, polite)
+        if self.observers is not None:
+            self.observers.connection(action, time.perf_counter() - start)
+
+    def add(self, ftp):
+        # type: (FTP) -> bool
+        """Add a new connection to the idle ones, e.g. to warm up the pool.
+
+        Returns:
+            bool: `False` if the pool is closed, or already keeps
+            ``max_size`` idle connections, in which case the connection
+            is closed.
+
+        """
+        with self._cond:
+            self._opened[ftp] = time.monotonic()
+            kept = self._keep(ftp)
+        if not kept:
+            self._close(ftp, polite=True)
+        return kept
+
+    def maintain(self, factory=None):
+        # type: (Optional[Callable[[], FTP]]) -> None
+        """Keep the idle connections alive, and retire the expired ones.
+
+        Idle connections past ``max_idle`` or ``max_lifetime`` are closed,
+        and those idle for ``keepalive`` seconds are sent a ``NOOP``
+        command. If ``factory`` is given, the connections retired because
+        of ``max_lifetime``, or dropped by the server, are replaced with
+        new ones, so, the next callers do not wait for a connection.
+        """
+        now = time.monotonic()
+        retired = []  # type: List[FTP]
+        stale = []  # type: List[FTP]
+        replace = 0
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            for ftp, since in idle:
+                if self._is_expired(ftp, since, now):
+                    retired.append(ftp)
+                    if self.max_idle is None or now - since < self.max_idle:
+                        replace += 1
+                    del self._opened[ftp]
+                elif self.keepalive is not None and now - since >= self.keepalive:
+                    stale.append(ftp)
+                else:
+                    self._idle.append((ftp, since))
+
+        for ftp in retired:
+            self._close(ftp, polite=True)
+
+        # The other idle connections remain available while the NOOP
+        # commands are sent
+        for ftp in stale:
+            try:
+                ftp.voidcmd(str("NOOP"))
+            except (OSError, EOFError, ftplib.Error) as error:
+                log.info(f"[pool] Idle connection lost: {error}")
+                with self._cond:
+                    self._opened.pop(ftp, None)
+                self._close(ftp, polite=False, action="discard")
+                replace += 1
+                continue
+            with self._cond:
+                kept = self._keep(ftp)
+            if not kept:
+                self._close(ftp, polite=True)
+
+        while factory is not None and replace > 0 and not self._closed:
+            try:
+                ftp = factory()
+            except Exception as error:
+                log.info(f"[pool] Could not open a replacement connection: {error}")
+                break
+            if not self.add(ftp):
+                break
+            replace -= 1
+
+    def start_maintenance(self, factory_ref, interval=None):
+        # type: (Callable[[], Optional[Callable[[], FTP]]], Optional[float]) -> None
+        """Run `maintain` periodically in a background daemon thread.
+
+        Arguments:
+            factory_ref (callable): Returns the factory of the replacement
+                connections, or `None` once its owner is gone, which
+                closes the pool. Typically a `weakref.WeakMethod`, so,
+                the thread does not keep the owner alive.
+            interval (float, optional): Number of seconds between two
+                runs. Defaults to half the shortest of ``keepalive``,
+                ``max_idle`` and ``max_lifetime``.
+
+        """
+        if interval is None:
+            delays = [
+                delay
+                for delay in (self.keepalive, self.max_idle, self.max_lifetime)
+                if delay is not None
+            ]
+            if not delays:
+                return
+            interval = min(delays) / 2
+        with self._cond:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run_maintenance,
+                args=(factory_ref, interval),
+                name="ftppool-maintenance",
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run_maintenance(self, factory_ref, interval):
+        # type: (Callable[[], Optional[Callable[[], FTP]]], float) -> None
+        while not self._stop.wait(interval):
+            factory = factory_ref()
+            if factory is None:
+                self.close()
+                break
+            try:
+                self.maintain(factory)
+            except Exception as error:  # pragma: no cover
+                log.warning(f"[pool] Maintenance failed: {error}")
+            del factory
+
+    def clear(self):
+        # type: () -> None
+        """Close all idle connections."""
+        with self._cond:
+            idle = [ftp for ftp, _ in self._idle]
+            self._idle.clear()
+            for ftp in idle:
+                del self._opened[ftp]
+        for ftp in idle:
+            self._close(ftp, polite=True)
+
+    def close(self):
+        # type: () -> None
+        """Close all idle connections and stop keeping released ones.
+
+        Connections still leased out are closed when they are released.
+        The maintenance thread, if any, is stopped.
+        """
+        with self._cond:
+            self._closed = True
+        self._stop.set()
+        self.clear()
@@ -0,0 +1,123 @@
+"""Read-ahead of a data connection in a background thread.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import typing
+from collections import deque
+
+from fs.constants import DEFAULT_CHUNK_SIZE
+
+if typing.TYPE_CHECKING:
+    import socket
+    from typing import Deque, Optional, Union
+
+
+__all__ = ["ReadAhead"]
+
+
+class ReadAhead(object):
+    """Receive data from a socket in a helper thread.
+
+    Up to ``max_size`` bytes are buffered ahead of the consumer, so, the
+    network transfer overlaps with the processing of the data already
+    received. Errors raised while receiving are re-raised by `readinto`
+    once the data received before the error has been consumed.
+
+    Arguments:
+        conn (socket.socket): The data connection to read from. It must
+            not be used by anything else until `cancel` returns.
+        max_size (int): Maximum number of bytes buffered.
+        chunk_size (int): Number of bytes received at a time.
+
+    """
+
+    def __init__(self, conn, max_size, chunk_size=DEFAULT_CHUNK_SIZE):
+        # type: (socket.socket, int, int) -> None
+        self.max_size = max_size
+        self.chunk_size = min(chunk_size, max_size)
+        self._cond = threading.Condition(threading.Lock())
+        self._chunks = deque()  # type: Deque[Union[bytes, memoryview]]
+        self._buffered = 0
+        self._eof = False
+        self._error = None  # type: Optional[BaseException]
+        self._cancelled = False
+        # The thread references the socket only, so, an abandoned file
+        # can still be garbage collected (and closed)
+        self._thread = threading.Thread(
+            target=self._run, args=(conn,), name="ftpfs-read-ahead"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __repr__(self):
+        # type: () -> str
+        return "<readahead size={} buffered={}>".format(self.max_size, self._buffered)
+
+    def _run(self, conn):
+        # type: (socket.socket) -> None
+        cond = self._cond
+        try:
+            while True:
+                with cond:
+                    while self._buffered >= self.max_size and not self._cancelled:
+                        cond.wait()
+                    if self._cancelled:
+                        return
+                chunk = conn.recv(self.chunk_size)
+                with cond:
+                    if not chunk:
+                        self._eof = True
+                        return
+                    self._chunks.append(chunk)
+                    self._buffered += len(chunk)
+                    cond.notify_all()
+        except BaseException as error:
+            with cond:
+                self._error = error
+        finally:
+            with cond:
+                self._eof = True
+                cond.notify_all()
+
+    def readinto(self, view):
+        # type: (memoryview) -> int
+        """Read into a byte memoryview until it is full or the end of file."""
+        size = len(view)
+        bytes_read = 0
+        cond = self._cond
+        with cond:
+            while bytes_read < size:
+                while not self._chunks and not self._eof:
+                    cond.wait()
+                if not self._chunks:
+                    if self._error is not None and not bytes_read:
+                        raise self._error
+                    break
+                chunk = self._chunks.popleft()
+                count = min(len(chunk), size - bytes_read)
+                view[bytes_read : bytes_read + count] = chunk[:count]
+                if count < len(chunk):
+                    self._chunks.appendleft(memoryview(chunk)[count:])
+                bytes_read += count
+                self._buffered -= count
+                # Make room for the helper thread
+                cond.notify_all()
+        return bytes_read
+
+    def cancel(self):
+        # type: () -> None
+        """Stop reading ahead, and wait for the helper thread to exit.
+
+        A ``recv`` already in progress is completed first (at most the
+        socket timeout), since a socket, notably an SSL one, cannot be
+        safely closed while another thread reads from it.
+        """
+        with self._cond:
+            self._cancelled = True
+            self._chunks.clear()
+            self._buffered = 0
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
@@ -0,0 +1,228 @@
+"""Record the FTP commands sent by the methods of a filesystem.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import io
+import sys
+import threading
+import time
+import typing
+from collections import OrderedDict, namedtuple
+
+from ._observe import FTPObserver
+
+if typing.TYPE_CHECKING:
+    from types import CodeType, FrameType
+    from typing import Any, Dict, List, Optional, Text, Tuple
+
+    from ._observe import CommandEvent, ConnectionEvent
+
+
+__all__ = ["Profile", "ProfiledCommand"]
+
+
+class ProfiledCommand(
+    namedtuple(
+        "ProfiledCommand", ["call", "method", "path", "verb", "code", "latency", "thread"]
+    )
+):
+    """A command sent while profiling.
+
+    Attributes:
+        call (int): Number of the method call which sent the command,
+            counting from 1 in the order of the first command of each call.
+            Calls are told apart by their frame, which a new call may
+            reuse, so, consecutive calls of a method with the same path,
+            without any other command in between, may be counted as one.
+        method (str): The public method of the filesystem which sent the
+            command, e.g. ``"openbin"``, or of one of its files, e.g.
+            ``"FTPFile.write"``. Commands sent by the helpers of the
+            filesystem, such as the threads of `FTPFS.warm_up`, are
+            attributed to the outermost private method.
+        path (str): The ``path`` argument of the method, or `None`.
+        verb (str): The command, e.g. ``"MLST"``.
+        code (str): The reply code, or `None` if no reply was received.
+        latency (float): Number of seconds until the reply was received.
+        thread (str): The name of the thread which sent the command.
+
+    """
+
+    __slots__ = ()
+
+
+class Profile(FTPObserver):
+    """The commands sent by a filesystem while profiling, see `FTPFS.profile`.
+
+    Attributes:
+        commands (list): The `ProfiledCommand` objects, in the order the
+            replies were received. Each command is a round trip.
+        connections_opened (int): Number of connections opened.
+
+    """
+
+    def __init__(self, fs):
+        # type: (Any) -> None
+        self._fs = fs
+        self._lock = threading.Lock()
+        self.commands = []  # type: List[ProfiledCommand]
+        self.connections_opened = 0
+        self.start = time.perf_counter()
+        self.end = None  # type: Optional[float]
+        self._calls = 0
+        # The frame identity, code, method and path of the last call of
+        # each thread, and its number. The frame itself is not kept, so,
+        # its locals are freed once the call returns.
+        self._last_calls = (
+            {}
+        )  # type: Dict[int, Tuple[Tuple[int, CodeType, Text, Optional[Text]], int]]
+
+    def __repr__(self):
+        # type: () -> str
+        return "<profile commands={} connections_opened={}>".format(
+            len(self.commands), self.connections_opened
+        )
+
+    @property
+    def round_trips(self):
+        # type: () -> int
+        """int: Number of commands sent, each one waiting for its reply."""
+        return len(self.commands)
+
+    @property
+    def elapsed(self):
+        # type: () -> float
+        """float: Duration of the profiling, in seconds."""
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+    def _find_caller(self):
+        # type: () -> Tuple[Optional[FrameType], Text, Optional[Text]]
+        """Find the outermost method of the filesystem, or of its files,
+        in the stack of the current thread.
+        """
+        fs = self._fs
+        public = private = None  # type: Optional[FrameType]
+        frame = sys._getframe(2)  # type: Optional[FrameType]
+        while frame is not None:
+            owner = frame.f_locals.get("self")
+            if owner is fs or (
+                isinstance(owner, io.IOBase) and getattr(owner, "fs", None) is fs
+            ):
+                if frame.f_code.co_name.startswith("_"):
+                    private = frame
+                else:
+                    public = frame
+            frame = frame.f_back
+        frame = public or private
+        if frame is None:
+            return None, "<unknown>", None
+        owner = frame.f_locals["self"]
+        method = frame.f_code.co_name
+        if owner is not fs:
+            method = "{}.{}".format(type(owner).__name__, method)
+        path = frame.f_locals.get("path")
+        return frame, method, path if isinstance(path, str) else None
+
+    def on_command(self, event):
+        # type: (CommandEvent) -> None
+        frame, method, path = self._find_caller()
+        key = (id(frame), frame.f_code, method, path) if frame is not None else None
+        del frame
+        thread = threading.current_thread()
+        with self._lock:
+            last = self._last_calls.get(thread.ident)
+            if last is not None and key is not None and last[0] == key:
+                call = last[1]
+            else:
+                self._calls += 1
+                call = self._calls
+                if key is not None:
+                    self._last_calls[thread.ident] = (key, call)
+            self.commands.append(
+                ProfiledCommand(
+                    call, method, path, event.verb, event.code, event.latency, thread.name
+                )
+            )
+
+    def on_connection(self, event):
+        # type: (ConnectionEvent) -> None
+        if event.action == "open":
+            with self._lock:
+                self.connections_opened += 1
+
+    def stop(self):
+        # type: () -> None
+        """Stop the clock."""
+        with self._lock:
+            self.end = time.perf_counter()
+            self._last_calls.clear()
+
+    def calls(self):
+        # type: () -> List[Tuple[Text, Optional[Text], List[ProfiledCommand]]]
+        """Get the commands of each method call.
+
+        Returns:
+            list: ``(method, path, commands)`` tuples, in the order of the
+            calls.
+
+        """
+        calls = OrderedDict()  # type: OrderedDict[int, List[ProfiledCommand]]
+        for command in self.commands:
+            calls.setdefault(command.call, []).append(command)
+        return [
+            (commands[0].method, commands[0].path, commands)
+            for commands in calls.values()
+        ]
+
+    def by_method(self):
+        # type: () -> Dict[Text, Dict[Text, float]]
+        """Get the number of calls, commands, and the total latency of the
+        commands, of each method.
+
+        Example:
+            >>> profile.by_method()["getinfo"]
+            {'calls': 120, 'commands': 120, 'latency': 0.42}
+
+        """
+        methods = OrderedDict()  # type: OrderedDict[Text, Dict[Text, float]]
+        for method, _, commands in self.calls():
+            stats = methods.setdefault(method, {"calls": 0, "commands": 0, "latency": 0.0})
+            stats["calls"] += 1
+            stats["commands"] += len(commands)
+            stats["latency"] += sum(command.latency for command in commands)
+        return methods
+
+    def report(self):
+        # type: () -> Text
+        """Describe the commands of each method call, e.g.::
+
+            14 round trips, 1 connection opened, in 0.012s
+              openbin('/dir/foo.txt'): USER PASS FEAT MLST MLST TYPE (6 round trips, 0.006s)
+              FTPFile.write: PASV REST STOR (3 round trips, 0.002s)
+              listdir('/dir'): TYPE PASV MLSD (3 round trips, 0.002s)
+              getinfo('/dir/foo.txt'): MLST (1 round trip, 0.001s)
+              getinfo('/dir/bar.txt'): MLST (1 round trip, 0.001s)
+
+        """
+        lines = [
+            "{} round trip{}, {} connection{} opened, in {:.3f}s".format(
+                self.round_trips,
+                "" if self.round_trips == 1 else "s",
+                self.connections_opened,
+                "" if self.connections_opened == 1 else "s",
+                self.elapsed,
+            )
+        ]
+        for method, path, commands in self.calls():
+            lines.append(
+                "  {}{}: {} ({} round trip{}, {:.3f}s)".format(
+                    method,
+                    "({!r})".format(path) if path is not None else "",
+                    " ".join(command.verb for command in commands),
+                    len(commands),
+                    "" if len(commands) == 1 else "s",
+                    sum(command.latency for command in commands),
+                )
+            )
+        return "\n".join(lines)
@@ -0,0 +1,122 @@
+"""Copy data between FTP data connections and local files.
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import io
+import threading
+import time
+import typing
+from collections import namedtuple
+
+if typing.TYPE_CHECKING:
+    import socket
+    from typing import BinaryIO, Callable, Optional
+
+
+__all__ = ["TransferStats", "TransferMeter", "receive_file", "send_file", "write_all"]
+
+
+class TransferStats(namedtuple("TransferStats", ["bytes_transferred", "elapsed"])):
+    """Statistics of a completed transfer, returned by `FTPFS.download`
+    and `FTPFS.upload`.
+
+    Attributes:
+        bytes_transferred (int): Number of bytes transferred.
+        elapsed (float): Duration of the transfer, in seconds.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        # type: () -> float
+        """float: Average number of bytes transferred per second."""
+        return self.bytes_transferred / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TransferMeter(object):
+    """Count the bytes of a transfer, and report its progress.
+
+    Arguments:
+        callback (callable, optional): Called with the total number of
+            bytes transferred so far, each time a chunk is transferred.
+
+    """
+
+    def __init__(self, callback=None):
+        # type: (Optional[Callable[[int], object]]) -> None
+        self.callback = callback
+        self.transferred = 0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def update(self, count):
+        # type: (int) -> None
+        """Record ``count`` more bytes transferred."""
+        with self._lock:
+            self.transferred += count
+            if self.callback is not None:
+                self.callback(self.transferred)
+
+    def stats(self):
+        # type: () -> TransferStats
+        """Get the statistics of the transfer so far."""
+        return TransferStats(self.transferred, time.perf_counter() - self._start)
+
+
+def receive_file(conn, file, chunk_size, meter):
+    # type: (socket.socket, BinaryIO, int, TransferMeter) -> None
+    """Receive data from ``conn`` into ``file`` until the end of file.
+
+    Data is received into a single reusable buffer. `io` file objects,
+    which must not keep a reference to the data they are given, are
+    written views of the buffer, other file-like objects a copy of the
+    data. Short writes, e.g. of raw files, are completed.
+    """
+    buffer = memoryview(bytearray(chunk_size))
+    copy = not isinstance(file, io.IOBase)
+    while True:
+        count = conn.recv_into(buffer)
+        if not count:
+            break
+        write_all(file, bytes(buffer[:count]) if copy else buffer[:count])
+        meter.update(count)
+
+
+def write_all(file, data):
+    # type: (BinaryIO, typing.Union[bytes, memoryview]) -> None
+    """Write all of ``data`` to ``file``, even if it takes several calls.
+
+    File-like objects whose ``write`` returns `None` are assumed to take
+    all the data.
+    """
+    data = memoryview(data)
+    while data:
+        written = file.write(data)
+        if written is None:
+            return
+        data = data[written:]
+
+
+def send_file(conn, file, chunk_size, meter):
+    # type: (socket.socket, BinaryIO, int, TransferMeter) -> None
+    """Send the contents of ``file`` to ``conn``.
+
+    Files with a ``readinto`` method are read into a single reusable
+    buffer, other files are read chunk by chunk.
+    """
+    readinto = getattr(file, "readinto", None)
+    if readinto is None:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            conn.sendall(chunk)
+            meter.update(len(chunk))
+        return
+    buffer = memoryview(bytearray(chunk_size))
+    while True:
+        count = readinto(buffer)
+        if not count:
+            break
+        conn.sendall(buffer[:count])
+        meter.update(count)
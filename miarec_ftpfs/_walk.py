@@ -0,0 +1,247 @@
+"""Walk a directory tree by listing several directories concurrently.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import typing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from fs.errors import FSError
+from fs.path import abspath, combine, normpath
+from fs.walk import BoundWalker, Walker
+
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Future
+    from typing import (
+        Any,
+        Collection,
+        Deque,
+        Iterator,
+        List,
+        Optional,
+        Set,
+        Text,
+        Tuple,
+    )
+
+    from fs.base import FS
+    from fs.info import Info
+
+
+__all__ = ["ParallelWalker"]
+
+
+class ParallelWalker(Walker):
+    """A walker which lists several directories at the same time.
+
+    Walking a large tree is dominated by the round trips of the ``MLSD``
+    or ``LIST`` commands, rather than by the bandwidth, so, this walker
+    lists up to ``workers`` directories concurrently, each thread using
+    its own connection of the pool. This is the walker of `FTPFS`, so,
+    ``ftp_fs.walk`` uses it.
+
+    With ``search="breadth"`` (the default), the results are those of
+    `fs.walk.Walker`, in the same order as long as at most ``max_pending``
+    directories wait to be listed. Beyond, the subdirectories found are
+    walked depth first, before the directories waiting, so, the queue of
+    the breadth first search stays bounded, and the other directories
+    waiting are bounded by the depth of the tree times its fan-out,
+    instead of by the width of its widest level. With
+    ``search="unordered"``, each directory is reported as soon as it is
+    listed, and directories are listed deepest first. ``search="depth"``
+    lists a single directory at a time, like `fs.walk.Walker`.
+
+    Arguments:
+        workers (int, optional): Maximum number of directories listed at
+            the same time, or `None` to use the size of the connection
+            pool of the filesystem (or 4 if it has none).
+        max_pending (int, optional): Maximum number of directories being
+            listed, or listed but not yet consumed by the caller, which
+            bounds the memory used by listings received ahead, and
+            maximum number of directories queued by the breadth first
+            search. `None` (the default) means 4 times ``workers``.
+        recursive_listing (bool): If `True`, an `FTPFS` tree is listed
+            with a single recursive listing when the server supports it
+            (see `FTPFS.scandir_recursive`), and ``search`` is ignored:
+            directories are reported in the order of the listing. The
+            contents of excluded directories are still transferred, only
+            to be skipped. Defaults to `False`.
+
+    The other arguments are those of `fs.walk.Walker`. Note that
+    ``on_error`` is called from the worker threads.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        self.workers = kwargs.pop("workers", None)  # type: Optional[int]
+        self.max_pending = kwargs.pop("max_pending", None)  # type: Optional[int]
+        self.recursive_listing = kwargs.pop("recursive_listing", False)  # type: bool
+        if self.workers is not None and self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if self.max_pending is not None and self.max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        unordered = kwargs.get("search") == "unordered"
+        if unordered:
+            kwargs["search"] = "breadth"
+        super(ParallelWalker, self).__init__(*args, **kwargs)
+        if unordered:
+            self.search = "unordered"
+
+    @classmethod
+    def bind(cls, fs):
+        # type: (FS) -> BoundWalker
+        # `Walker.bind` always binds the default walker class
+        return BoundWalker(fs, walker_class=cls)
+
+    def _get_workers(self, fs):
+        # type: (FS) -> int
+        if self.workers is not None:
+            return self.workers
+        # A `SubFS` is walked with the walker of the filesystem it wraps
+        delegate_fs = getattr(fs, "delegate_fs", None)
+        pool = getattr(delegate_fs() if delegate_fs else fs, "_pool", None)
+        return pool.max_size if pool is not None else 4
+
+    def _iter_walk(
+        self,
+        fs,  # type: FS
+        path,  # type: Text
+        namespaces=None,  # type: Optional[Collection[Text]]
+    ):
+        # type: (...) -> Iterator[Tuple[Text, Optional[Info]]]
+        if self.recursive_listing and hasattr(fs, "_scan_tree"):
+            return self._walk_tree(fs, path, namespaces=namespaces)
+        if self.search == "depth":
+            return self._walk_depth(fs, path, namespaces=namespaces)
+        return self._walk_parallel(
+            fs, path, namespaces=namespaces, ordered=self.search == "breadth"
+        )
+
+    def _walk_tree(
+        self,
+        fs,  # type: FS
+        path,  # type: Text
+        namespaces=None,  # type: Optional[Collection[Text]]
+    ):
+        # type: (...) -> Iterator[Tuple[Text, Optional[Info]]]
+        """Walk files from a recursive listing of the whole tree."""
+        _combine = combine
+        _calculate_depth = self._calculate_depth
+        _check_open_dir = self._check_open_dir
+        _check_scan_dir = self._check_scan_dir
+        _check_file = self.check_file
+
+        depth = _calculate_depth(path)
+        # Directories whose contents are reported, until their end
+        scanned = {abspath(normpath(path))}
+
+        try:
+            for dir_path, info in fs._scan_tree(path):  # type: ignore
+                if dir_path not in scanned:
+                    continue  # Within a directory which is not scanned
+                if info is None:
+                    scanned.discard(dir_path)
+                    yield dir_path, None  # End of directory
+                elif info.is_dir:
+                    _depth = _calculate_depth(dir_path) - depth + 1
+                    if _check_open_dir(fs, dir_path, info):
+                        yield dir_path, info  # Opened a directory
+                        if _check_scan_dir(fs, dir_path, info, _depth):
+                            scanned.add(_combine(dir_path, info.name))
+                else:
+                    if _check_file(fs, info):
+                        yield dir_path, info  # Found a file
+        except FSError as error:
+            if not self.on_error(path, error):
+                raise
+
+    def _list_dir(
+        self,
+        fs,  # type: FS
+        dir_path,  # type: Text
+        namespaces=None,  # type: Optional[Collection[Text]]
+    ):
+        # type: (...) -> Tuple[Text, List[Info]]
+        return dir_path, list(self._scan(fs, dir_path, namespaces=namespaces))
+
+    def _walk_parallel(
+        self,
+        fs,  # type: FS
+        path,  # type: Text
+        namespaces=None,  # type: Optional[Collection[Text]]
+        ordered=True,  # type: bool
+    ):
+        # type: (...) -> Iterator[Tuple[Text, Optional[Info]]]
+        """Walk files, listing several directories concurrently.
+
+        If ``ordered``, directories are listed and reported in *breadth
+        first* order, otherwise they are listed deepest first, and
+        reported in the order the listings complete. Once ``max_pending``
+        directories are queued, the subdirectories found are listed
+        first, depth first.
+        """
+        workers = self._get_workers(fs)
+        max_pending = self.max_pending or 4 * workers
+        # Directories waiting to be listed, at most max_pending
+        queue = deque([path])  # type: Deque[Text]
+        pop = queue.popleft if ordered else queue.pop
+        # Directories found while the queue was full, listed first, so,
+        # the walk goes depth first until the queue drains
+        stack = []  # type: List[Text]
+        # Listings running, or received but not yet consumed
+        running = deque()  # type: Deque[Future[Tuple[Text, List[Info]]]]
+        done = set()  # type: Set[Future[Tuple[Text, List[Info]]]]
+
+        _combine = combine
+        _calculate_depth = self._calculate_depth
+        _check_open_dir = self._check_open_dir
+        _check_scan_dir = self._check_scan_dir
+        _check_file = self.check_file
+
+        depth = _calculate_depth(path)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            while stack or queue or running or done:
+                while (stack or queue) and len(running) + len(done) < max_pending:
+                    dir_path = stack.pop() if stack else pop()
+                    running.append(
+                        executor.submit(self._list_dir, fs, dir_path, namespaces)
+                    )
+                if ordered:
+                    future = running.popleft()
+                elif done:
+                    future = done.pop()
+                else:
+                    finished = wait(running, return_when=FIRST_COMPLETED).done
+                    for _future in finished:
+                        running.remove(_future)
+                    done.update(finished)
+                    future = done.pop()
+                dir_path, infos = future.result()
+                overflow = []  # type: List[Text]
+                for info in infos:
+                    if info.is_dir:
+                        _depth = _calculate_depth(dir_path) - depth + 1
+                        if _check_open_dir(fs, dir_path, info):
+                            yield dir_path, info  # Opened a directory
+                            if _check_scan_dir(fs, dir_path, info, _depth):
+                                sub_path = _combine(dir_path, info.name)
+                                if len(queue) < max_pending:
+                                    queue.append(sub_path)
+                                else:
+                                    overflow.append(sub_path)
+                    else:
+                        if _check_file(fs, info):
+                            yield dir_path, info  # Found a file
+                # In the order they were found
+                stack.extend(reversed(overflow))
+                yield dir_path, None  # End of directory
+        finally:
+            # Listings not started are dropped, and running ones complete,
+            # so, their connections are returned to the pool
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
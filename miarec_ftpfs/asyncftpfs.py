@@ -0,0 +1,831 @@
+"""Manage an FTP filesystem from asyncio code.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import ftplib
+import io
+import ssl
+import typing
+from contextlib import contextmanager
+from ftplib import error_perm, error_temp
+
+from fs import errors
+from fs.constants import DEFAULT_CHUNK_SIZE
+from fs.enums import ResourceType, Seek
+from fs.info import Info
+from fs.mode import Mode
+from fs.path import abspath, dirname, normpath, split
+
+from . import _ftp_parse as ftp_parse
+from ._async_ftp import AsyncConnectionPool, AsyncFTP, ResumingSSLContext
+from ._transfer import TransferMeter, TransferStats
+from .ftpfs import (
+    FTPFS,
+    _BROKEN_CONNECTION_ERRORS,
+    convert_ftp_errors,
+    ignore_network_errors,
+)
+
+if typing.TYPE_CHECKING:
+    from typing import (
+        Any,
+        AsyncIterator,
+        BinaryIO,
+        Callable,
+        Container,
+        Dict,
+        List,
+        Optional,
+        SupportsInt,
+        Text,
+        Tuple,
+    )
+
+import logging
+log = logging.getLogger(__name__)
+
+
+__all__ = ["AsyncFTPFS", "AsyncFTPFile"]
+
+# Errors after which a control connection can no longer be trusted. A
+# cancelled command may leave its reply pending.
+_BROKEN_ERRORS = _BROKEN_CONNECTION_ERRORS + (asyncio.CancelledError,)
+
+
+class _Lease(object):
+    """Lease a control connection for an ``async with`` block.
+
+    The asyncio counterpart of `get_ftp_connection`: errors raised in the
+    block are converted with `convert_ftp_errors`, and the connection is
+    discarded if it can no longer be trusted.
+    """
+
+    def __init__(self, fs, path=None, op=None, overflow=False):
+        # type: (AsyncFTPFS, Optional[Text], Optional[Text], bool) -> None
+        self._fs = fs
+        self._overflow = overflow
+        self._errors = convert_ftp_errors(fs, path, op)
+        self._ftp = None  # type: Optional[AsyncFTP]
+
+    async def __aenter__(self):
+        # type: () -> AsyncFTP
+        self._errors.__enter__()
+        try:
+            self._ftp = await self._fs._pool.acquire(self._fs._open_ftp, self._overflow)
+        except BaseException as error:
+            self._errors.__exit__(type(error), error, error.__traceback__)
+            raise
+        return self._ftp
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> bool
+        broken = exc_type is not None and issubclass(exc_type, _BROKEN_ERRORS)
+        await self._fs._pool.release(self._ftp, discard=broken)
+        return self._errors.__exit__(exc_type, exc_value, traceback)
+
+
+class _FileOpener(object):
+    """The result of `AsyncFTPFS.openbin`, to be awaited or used with
+    ``async with``.
+    """
+
+    def __init__(self, open_file):
+        # type: (Any) -> None
+        self._open_file = open_file
+        self._file = None  # type: Optional[AsyncFTPFile]
+
+    def __await__(self):
+        return self._open_file.__await__()
+
+    async def __aenter__(self):
+        # type: () -> AsyncFTPFile
+        self._file = await self._open_file
+        return self._file
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> None
+        await self._file.close()
+
+
+def _discard_file(pool, ftp, writers):
+    # type: (AsyncConnectionPool, AsyncFTP, List[asyncio.StreamWriter]) -> None
+    """Abort the connections of a file garbage collected without being closed."""
+    for writer in writers:
+        writer.transport.abort()
+    pool.discard(ftp)
+
+
+class AsyncFTPFile(object):
+    """A binary file on an `AsyncFTPFS`.
+
+    The asyncio counterpart of `FTPFile`, with coroutine methods. Created
+    by `AsyncFTPFS.openbin`. A file garbage collected without being closed
+    aborts its transfer and its control connection, so, its lease of the
+    pool ends.
+    """
+
+    def __init__(self, ftpfs, path, mode):
+        # type: (AsyncFTPFS, Text, Text) -> None
+        self.fs = ftpfs
+        self.path = path
+        self.mode = Mode(mode)
+        self.pos = 0
+        self.ftp = None  # type: Optional[AsyncFTP]
+        self._read_conn = None  # type: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        self._write_conn = None  # type: Optional[asyncio.StreamWriter]
+        self._closed = False
+        self._loop = asyncio.get_event_loop()
+
+    def __del__(self):
+        # The garbage collector may run in another thread, and cannot
+        # wait for the end of the transfer, so, the connections are
+        # aborted by the event loop
+        if self._closed or self.ftp is None:
+            return
+        writers = [self._read_conn[1]] if self._read_conn is not None else []
+        if self._write_conn is not None:
+            writers.append(self._write_conn)
+        try:
+            self._loop.call_soon_threadsafe(_discard_file, self.fs._pool, self.ftp, writers)
+        except RuntimeError:
+            # The event loop is closed, and so are its connections
+            pass
+
+    def __repr__(self):
+        # type: () -> str
+        _repr = "<asyncftpfile {!r} {!r} {!r}>"
+        return _repr.format(self.fs.ftp_url, self.path, self.mode)
+
+    async def __aenter__(self):
+        # type: () -> AsyncFTPFile
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> None
+        await self.close()
+
+    async def _open_ftp(self):
+        # type: () -> AsyncFTP
+        """Lease a control connection for the file (see `FTPFile._open_ftp`)."""
+        pool = self.fs._pool
+        # Idle connections could have been dropped by the server in the meantime,
+        # so, try each of them before giving up
+        retries = pool.idle_count
+        while True:
+            ftp = await pool.acquire(self.fs._open_ftp, overflow=True)
+            try:
+                with convert_ftp_errors(self.fs, op="open_file", path=self.path):
+                    await ftp.voidcmd("TYPE I")
+                return ftp
+            except errors.RemoteConnectionError as error:
+                await pool.release(ftp, discard=True)
+                if retries <= 0:
+                    raise
+                retries -= 1
+                log.info(f"[open_file] Discarding a broken pooled connection: {error}")
+            except BaseException:
+                await pool.release(ftp, discard=True)
+                raise
+
+    @contextmanager
+    def _convert_errors(self, op):
+        """Convert FTP errors and remember if the control connection cannot be reused anymore."""
+        with convert_ftp_errors(self.fs, op=op, path=self.path, connection_error=IOError):
+            try:
+                yield
+            except _BROKEN_ERRORS:
+                self.ftp.broken = True
+                raise
+
+    async def _read_transfer_reply(self):
+        # type: () -> None
+        """Read the final reply of a data transfer, so, the control connection can be reused."""
+        try:
+            await self.ftp.voidresp()
+        except (error_temp, error_perm) as error:
+            # E.g. "426 Transfer aborted" when the data connection is closed before
+            # the end of file. The control connection is still in sync with the server.
+            log.info(f"[FTP voidresp] Transfer not completed (ignoring): {error}")
+            self.ftp.broken = False
+        except (ssl.SSLError, OSError, EOFError, ftplib.Error) as error:
+            log.info(f"[FTP voidresp] Unexpected network error (ignoring): {error}")
+        else:
+            self.ftp.broken = False
+
+    async def _close_data_connections(self):
+        # type: () -> None
+        """Close the data connections and complete the pending transfer."""
+        if self._write_conn is not None:
+            writer, self._write_conn = self._write_conn, None
+            # A network connection could be already dead
+            with ignore_network_errors("Closing write connection"):
+                await self.ftp.close_data(writer)
+            await self._read_transfer_reply()
+
+        if self._read_conn is not None:
+            _, writer = self._read_conn
+            self._read_conn = None
+            with ignore_network_errors("Closing read connection"):
+                await self.ftp.close_data(writer)
+            await self._read_transfer_reply()
+
+    async def _release_ftp(self):
+        # type: () -> None
+        """Return the control connection to the filesystem connection pool."""
+        ftp, self.ftp = self.ftp, None
+        if ftp is not None:
+            await self.fs._pool.release(ftp)
+
+    async def _get_read_conn(self):
+        # type: () -> asyncio.StreamReader
+        if self._read_conn is None:
+            with self._convert_errors(op="open_read_conn"):
+                self._read_conn = await self.ftp.transfercmd("RETR " + self.path, self.pos)
+                # Until the final reply is read, the connection is out of sync
+                self.ftp.broken = True
+        return self._read_conn[0]
+
+    async def _get_write_conn(self):
+        # type: () -> asyncio.StreamWriter
+        if self._write_conn is None:
+            with self._convert_errors(op="open_write_conn"):
+                if self.mode.appending:
+                    _, self._write_conn = await self.ftp.transfercmd("APPE " + self.path)
+                else:
+                    _, self._write_conn = await self.ftp.transfercmd(
+                        "STOR " + self.path, self.pos
+                    )
+                self.ftp.broken = True
+        return self._write_conn
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        """bool: `True` if the file is closed."""
+        return self._closed
+
+    async def close(self):
+        # type: () -> None
+        """Complete the pending transfer, and close the file."""
+        if not self._closed:
+            self._closed = True
+            if self.ftp is not None:
+                try:
+                    await self._close_data_connections()
+                finally:
+                    # The connection is kept open for the next file or operation
+                    await self._release_ftp()
+
+    def tell(self):
+        # type: () -> int
+        return self.pos
+
+    def readable(self):
+        # type: () -> bool
+        return self.mode.reading
+
+    def writable(self):
+        # type: () -> bool
+        return self.mode.writing
+
+    def seekable(self):
+        # type: () -> bool
+        return True
+
+    def _check_open(self):
+        # type: () -> None
+        if self._closed:
+            raise ValueError("I/O operation on closed file.")
+
+    async def read(self, size=-1):
+        # type: (int) -> bytes
+        """Read up to ``size`` bytes, or until the end of file if ``size``
+        is negative. Fewer bytes are returned at the end of file only.
+        """
+        self._check_open()
+        if not self.mode.reading:
+            raise IOError("File not open for reading")
+        reader = await self._get_read_conn()
+        chunks = []
+        remaining = size if size is not None and size >= 0 else -1
+        with self._convert_errors(op="read"):
+            while remaining:
+                chunk_size = DEFAULT_CHUNK_SIZE if remaining < 0 else remaining
+                chunk = await self.ftp.recv(reader, chunk_size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                self.pos += len(chunk)
+                if remaining > 0:
+                    remaining -= len(chunk)
+        return b"".join(chunks)
+
+    async def write(self, data):
+        # type: (bytes) -> int
+        """Write ``data``, and wait until it can be buffered by the transport."""
+        self._check_open()
+        if not self.mode.writing:
+            raise IOError("File not open for writing")
+        writer = await self._get_write_conn()
+        with self._convert_errors(op="write"):
+            await self.ftp.send(writer, data)
+        self.pos += len(data)
+        return len(data)
+
+    async def seek(self, pos, whence=Seek.set):
+        # type: (int, SupportsInt) -> int
+        """Move to a new position, where the transfer is resumed with ``REST``."""
+        self._check_open()
+        _whence = int(whence)
+        if _whence not in (Seek.set, Seek.current, Seek.end):
+            raise ValueError("invalid value for whence")
+        if _whence == Seek.set:
+            new_pos = pos
+        elif _whence == Seek.current:
+            new_pos = self.pos + pos
+        else:
+            info = await self.fs.getinfo(self.path, namespaces=["details"])
+            new_pos = info.size + pos
+
+        new_pos = max(0, new_pos)
+        if new_pos == self.pos:
+            return self.pos
+
+        self.pos = new_pos
+        await self._close_data_connections()
+        if self.ftp.broken:
+            await self.fs._pool.release(self.ftp, discard=True)
+            self.ftp = None
+            self.ftp = await self._open_ftp()
+        return self.pos
+
+
+class AsyncFTPFS(object):
+    """An FTP filesystem for asyncio applications.
+
+    The asyncio counterpart of `FTPFS`: methods are coroutines, which do
+    not block the event loop, so, a single thread can run thousands of
+    operations concurrently. Operations share a pool of ``pool_size``
+    control connections, and wait for a connection to be available.
+    Errors are converted to `fs.errors` exceptions like with `FTPFS`.
+
+    An instance must only be used from a single event loop. TLS requires
+    Python 3.11 or later. With explicit TLS, data connections resume the
+    TLS session of the control connection, unless ``reuse_ssl_session``
+    is `False`.
+
+    Example:
+        >>> async def main():
+        ...     async with AsyncFTPFS("ftp.example.org") as ftp_fs:
+        ...         async for info in ftp_fs.scandir("/"):
+        ...             print(info.name)
+        ...         async with ftp_fs.openbin("/foo.txt") as ftp_file:
+        ...             data = await ftp_file.read()
+
+    """
+
+    def __init__(
+        self,
+        host,  # type: Text
+        user="anonymous",  # type: Text
+        passwd="",  # type: Text
+        acct="",  # type: Text
+        timeout=10,  # type: int
+        port=21,  # type: int
+        proxy=None,  # type: Optional[Text]
+        tls=False,  # type: bool
+        implicit_tls=False,  # type: bool
+        pool_size=4,  # type: int
+        reuse_ssl_session=True,  # type: bool
+        max_overflow=16,  # type: Optional[int]
+    ):
+        # type: (...) -> None
+        """Create a new `AsyncFTPFS` instance.
+
+        Arguments:
+            host (str): A FTP host, e.g. ``'ftp.mirror.nl'``.
+            user (str): A username (default is ``'anonymous'``).
+            passwd (str): Password for the server, or `None` for anon.
+            acct (str): FTP account.
+            timeout (int): Timeout for contacting server (in seconds,
+                defaults to 10).
+            port (int): FTP port number (default 21).
+            proxy (str, optional): An FTP proxy, or ``None`` (default)
+                for no proxy.
+            tls (bool): Attempt to use FTP over TLS (FTPS) (default: False)
+            implicit_tls (bool): Use Implicit TLS (default: False)
+            pool_size (int): Maximum number of control connections used
+                concurrently (default 4). Open files and directory
+                listings use connections of their own, see
+                ``max_overflow``.
+            reuse_ssl_session (bool): Reuse SSL session between control
+                and data channels (default: True).
+            max_overflow (int, optional): Maximum number of open files
+                and directory listings (default 16), or `None` for no
+                limit. Further ones wait until one is closed.
+
+        """
+        if (tls or implicit_tls) and not hasattr(asyncio.StreamWriter, "start_tls"):
+            raise errors.Unsupported("FTP over TLS requires Python 3.11 or later")
+        self._host = host
+        self._user = user
+        self.passwd = passwd
+        self.acct = acct
+        self.timeout = timeout
+        self.port = port
+        self.proxy = proxy
+        self.tls = tls
+        self.implicit_tls = implicit_tls
+        self.reuse_ssl_session = reuse_ssl_session
+
+        self.encoding = "latin-1"
+        self._pool = AsyncConnectionPool(max_size=pool_size, max_overflow=max_overflow)
+        self._features = None  # type: Optional[Dict[Text, Text]]
+        self._closed = False
+        self._ssl_context = None  # type: Optional[ssl.SSLContext]
+        if tls or implicit_tls:
+            # Like ftplib, the certificate of the server is not verified
+            self._ssl_context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    def __repr__(self):
+        # type: () -> Text
+        return "AsyncFTPFS({!r}, port={!r})".format(self.host, self.port)
+
+    async def __aenter__(self):
+        # type: () -> AsyncFTPFS
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> None
+        await self.close()
+
+    @property
+    def user(self):
+        # type: () -> Text
+        return (
+            self._user if self.proxy is None else "{}@{}".format(self._user, self._host)
+        )
+
+    @property
+    def host(self):
+        # type: () -> Text
+        return self._host if self.proxy is None else self.proxy
+
+    @property
+    def ftp_url(self):
+        # type: () -> Text
+        """Get the FTP url this filesystem will open."""
+        return FTPFS.ftp_url.fget(self)  # type: ignore
+
+    async def _open_ftp(self):
+        # type: () -> AsyncFTP
+        """Open a new control connection."""
+        ftp = AsyncFTP(
+            timeout=self.timeout,
+            context=self._ssl_context,
+            reuse_ssl_session=self.reuse_ssl_session,
+        )
+        try:
+            with convert_ftp_errors(self, op="open_ftp"):
+                await ftp.connect(self.host, self.port, implicit_tls=self.implicit_tls)
+                if self.tls and not self.implicit_tls:
+                    await ftp.auth()
+                await ftp.login(self.user, self.passwd, self.acct)
+                if self.tls and not self.implicit_tls:
+                    await ftp.prot()
+                try:
+                    feat_response = await ftp.sendcmd("FEAT")
+                except error_perm:  # pragma: no cover
+                    self._features = {}
+                    self.encoding = "latin-1"
+                else:
+                    self._features = FTPFS._parse_features(feat_response)
+                    self.encoding = "utf-8" if "UTF8" in self._features else "latin-1"
+        except BaseException:
+            ftp.close()
+            raise
+        ftp.encoding = self.encoding
+        return ftp
+
+    async def get_features(self):
+        # type: () -> Dict[Text, Text]
+        """Get the features of the remote FTP server."""
+        if self._features is None:
+            # Features are parsed when the first connection is opened
+            async with _Lease(self, op="get_features"):
+                pass
+        return self._features  # type: ignore
+
+    def validatepath(self, path):
+        # type: (Text) -> Text
+        """Check a path, and return its absolute, normalized form."""
+        if "\0" in path:
+            raise errors.InvalidCharsInPath(path)
+        return abspath(normpath(path))
+
+    async def close(self):
+        # type: () -> None
+        """Close the idle connections. Connections still in use are closed
+        when they are released.
+        """
+        if not self._closed:
+            self._closed = True
+            await self._pool.close()
+
+    def isclosed(self):
+        # type: () -> bool
+        return self._closed
+
+    async def _iter_listing(self, cmd, path, op):
+        # type: (Text, Text, Text) -> AsyncIterator[Text]
+        """Send a listing command and yield the lines as they are received."""
+        async with _Lease(self, path=path, op=op, overflow=True) as ftp:
+            await ftp.voidcmd("TYPE A")
+            reader, writer = await ftp.transfercmd(cmd)
+            # A listing abandoned by the caller leaves the connection in the
+            # middle of a transfer, so, it is closed rather than reused
+            ftp.broken = True
+            try:
+                while True:
+                    line = await ftp.recvline(reader)
+                    if not line:
+                        break
+                    if line[-2:] == "\r\n":
+                        line = line[:-2]
+                    elif line[-1:] == "\n":
+                        line = line[:-1]
+                    yield line
+                await ftp.close_data(writer)
+            finally:
+                # Does nothing once the connection is closed
+                writer.transport.abort()
+            await ftp.voidresp()
+            ftp.broken = False
+
+    async def _iter_dir(self, path):
+        # type: (Text) -> AsyncIterator[Info]
+        """Stream a directory listing with the LIST command."""
+        _path = abspath(normpath(path))
+        parser = ftp_parse.ListingParser()
+        lines = self._iter_listing("LIST " + _path, path, op="LIST")
+        try:
+            async for line in lines:
+                raw_info = parser.parse_line(line)
+                if raw_info is not None:
+                    yield Info(raw_info)
+        finally:
+            # Async generators are not closed when abandoned, but when
+            # garbage collected, so, the connection is released right away
+            await lines.aclose()
+
+    async def getinfo(self, path, namespaces=None):
+        # type: (Text, Optional[Container[Text]]) -> Info
+        """Get information about a resource (see `FTPFS.getinfo`)."""
+        _path = self.validatepath(path)
+        if _path == "/":
+            return Info(
+                {
+                    "basic": {"name": "", "is_dir": True},
+                    "details": {"type": int(ResourceType.directory)},
+                }
+            )
+
+        if "MLST" in await self.get_features():
+            async with _Lease(self, path=path, op="MLST") as ftp:
+                response = await ftp.sendcmd("MLST " + _path)
+            lines = response.splitlines()[1:-1]
+            for raw_info in FTPFS._parse_mlsx(lines):
+                return Info(raw_info)
+
+        # Scan the listing of the parent without keeping it in memory
+        dir_name, file_name = split(_path)
+        info = None
+        entries = self._iter_dir(dir_name)
+        try:
+            async for _info in entries:
+                if _info.name == file_name:
+                    info = _info
+        finally:
+            await entries.aclose()
+        if info is None:
+            raise errors.ResourceNotFound(path)
+        return info
+
+    async def exists(self, path):
+        # type: (Text) -> bool
+        """Check if a path maps to a resource."""
+        try:
+            await self.getinfo(path)
+        except errors.ResourceNotFound:
+            return False
+        return True
+
+    async def isdir(self, path):
+        # type: (Text) -> bool
+        """Check if a path maps to an existing directory."""
+        try:
+            return (await self.getinfo(path)).is_dir
+        except errors.ResourceNotFound:
+            return False
+
+    async def scandir(self, path, namespaces=None):
+        # type: (Text, Optional[Container[Text]]) -> AsyncIterator[Info]
+        """Get an async iterator of resource info, streamed from the server.
+
+        Raises:
+            fs.errors.DirectoryExpected: If ``path`` is not a directory.
+            fs.errors.ResourceNotFound: If ``path`` does not exist.
+
+        """
+        _path = self.validatepath(path)
+        if "MLST" not in await self.get_features():
+            if not (await self.getinfo(path)).is_dir:
+                raise errors.DirectoryExpected(path)
+            entries = self._iter_dir(_path)
+            try:
+                async for info in entries:
+                    yield info
+            finally:
+                await entries.aclose()
+            return
+
+        lines = self._iter_listing("MLSD " + _path, path, op="MLSD")
+        try:
+            try:
+                first_line = await lines.__anext__()
+            except StopAsyncIteration:
+                return
+            except (errors.ResourceNotFound, errors.PermissionDenied):
+                if not (await self.getinfo(path)).is_dir:
+                    raise errors.DirectoryExpected(path)
+                raise  # pragma: no cover
+            for raw_info in FTPFS._parse_mlsx([first_line]):
+                yield Info(raw_info)
+            async for line in lines:
+                for raw_info in FTPFS._parse_mlsx([line]):
+                    yield Info(raw_info)
+        finally:
+            await lines.aclose()
+
+    async def listdir(self, path):
+        # type: (Text) -> List[Text]
+        """Get a list of the resource names in a directory."""
+        return [info.name async for info in self.scandir(path)]
+
+    async def _transfer(self, ftp, cmd, copy_data):
+        # type: (AsyncFTP, Text, Callable[[asyncio.StreamReader, asyncio.StreamWriter], Any]) -> None
+        """Run a binary transfer on a leased connection (see `FTPFS._transfer`)."""
+        await ftp.voidcmd("TYPE I")
+        reader, writer = await ftp.transfercmd(cmd)
+        # The final reply to the transfer command is still pending
+        ftp.broken = True
+        try:
+            await copy_data(reader, writer)
+            await ftp.close_data(writer)
+        finally:
+            # Does nothing once the connection is closed
+            writer.transport.abort()
+        await ftp.voidresp()
+        ftp.broken = False
+
+    async def download(self, path, file, chunk_size=None, callback=None):
+        # type: (Text, BinaryIO, Optional[int], Optional[Callable[[int], object]]) -> TransferStats
+        """Copy a file from the filesystem to a file-like object.
+
+        Arguments:
+            path (str): Path to a resource.
+            file (file-like): A file-like object open for writing in
+                binary mode. Writes must not block the event loop, e.g.
+                an `io.BytesIO`.
+            chunk_size (int, optional): Maximum number of bytes received
+                at a time, or `None` to use sensible default (1 MiB).
+            callback (callable, optional): Called with the total number
+                of bytes received so far, each time a chunk is received.
+
+        Returns:
+            TransferStats: the number of bytes received, the duration and
+            the throughput of the transfer.
+
+        Raises:
+            fs.errors.ResourceNotFound: if ``path`` does not exist.
+            fs.errors.FileExpected: if ``path`` is a directory.
+
+        """
+        _path = self.validatepath(path)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        meter = TransferMeter(callback)
+
+        try:
+            async with _Lease(self, path=path, op="RETR") as ftp:
+
+                async def receive(reader, writer):
+                    while True:
+                        chunk = await ftp.recv(reader, chunk_size)
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        meter.update(len(chunk))
+
+                await self._transfer(ftp, "RETR " + _path, receive)
+        except errors.ResourceNotFound:
+            # The connection is released first, a directory is checked
+            # with a lease of its own
+            if await self.isdir(_path):
+                raise errors.FileExpected(path)
+            raise
+        return meter.stats()
+
+    async def upload(self, path, file, chunk_size=None, callback=None):
+        # type: (Text, BinaryIO, Optional[int], Optional[Callable[[int], object]]) -> TransferStats
+        """Set a file to the contents of a binary file object.
+
+        Arguments:
+            path (str): A path on the filesystem.
+            file (io.IOBase): A file object open for reading in binary
+                mode. Reads must not block the event loop, e.g. an
+                `io.BytesIO`.
+            chunk_size (int, optional): Number of bytes to read at a
+                time, or `None` to use sensible default (1 MiB).
+            callback (callable, optional): Called with the total number
+                of bytes sent so far, each time a chunk is sent.
+
+        Returns:
+            TransferStats: the number of bytes sent, the duration and the
+            throughput of the transfer.
+
+        """
+        _path = self.validatepath(path)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        meter = TransferMeter(callback)
+        async with _Lease(self, path=path, op="STOR") as ftp:
+
+            async def send(reader, writer):
+                while True:
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        break
+                    await ftp.send(writer, chunk)
+                    meter.update(len(chunk))
+
+            await self._transfer(ftp, "STOR " + _path, send)
+        return meter.stats()
+
+    async def readbytes(self, path):
+        # type: (Text) -> bytes
+        """Get the contents of a file as bytes."""
+        data = io.BytesIO()
+        await self.download(path, data)
+        return data.getvalue()
+
+    async def writebytes(self, path, contents):
+        # type: (Text, bytes) -> None
+        """Copy binary data to a file."""
+        if not isinstance(contents, bytes):
+            raise TypeError("contents must be bytes")
+        await self.upload(path, io.BytesIO(contents))
+
+    def openbin(self, path, mode="r"):
+        # type: (Text, Text) -> _FileOpener
+        """Open a binary file.
+
+        The result is either awaited, or used with ``async with``::
+
+            async with ftp_fs.openbin("foo.bin", "w") as ftp_file:
+                await ftp_file.write(b"data")
+
+        Arguments:
+            path (str): A path on the filesystem.
+            mode (str): Mode to open file (must be a valid non-text mode,
+                defaults to *r*).
+
+        Returns:
+            AsyncFTPFile: a file-like object with coroutine methods.
+
+        """
+        return _FileOpener(self._openbin(path, mode))
+
+    async def _openbin(self, path, mode):
+        # type: (Text, Text) -> AsyncFTPFile
+        _mode = Mode(mode)
+        _mode.validate_bin()
+        _path = self.validatepath(path)
+
+        try:
+            info = await self.getinfo(_path)
+        except errors.ResourceNotFound:
+            if _mode.reading:
+                raise errors.ResourceNotFound(path)
+            if _mode.writing and not await self.isdir(dirname(_path)):
+                raise errors.ResourceNotFound(path)
+        else:
+            if info.is_dir:
+                raise errors.FileExpected(path)
+            if _mode.exclusive:
+                raise errors.FileExists(path)
+        ftp_file = AsyncFTPFile(self, _path, _mode.to_platform_bin())
+        ftp_file.ftp = await ftp_file._open_ftp()
+        return ftp_file
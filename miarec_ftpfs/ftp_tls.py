@@ -1,12 +1,121 @@
 import ftplib
+import socket
 import ssl
+import threading
+import time
+from collections import OrderedDict
 
+from ._observe import ObservedCommands
 
-class ExplicitFTP_TLS(ftplib.FTP_TLS):
-    def __init__(self, reuse_ssl_session=True, *args, **kwargs):
+
+class TLSSessionCache(object):
+    """A thread-safe cache of TLS sessions, by server address.
+
+    A new control connection to a server resumes the session of a
+    previous one, which saves the key exchange and the certificate
+    verification of a full handshake. Sessions can only be resumed with
+    the context which created them, so, they are kept by context as well,
+    and connections without a context of their own share ``context``.
+
+    Arguments:
+        context (ssl.SSLContext, optional): The context of the connections
+            without a context of their own. By default, one which, like
+            the default context of `ftplib.FTP_TLS`, does not verify the
+            certificate of the server, created on first use.
+        max_size (int): Maximum number of sessions kept.
+
+    """
+
+    def __init__(self, context=None, max_size=256):
+        self._context = context
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    @property
+    def context(self):
+        """ssl.SSLContext: The context shared by the connections."""
+        with self._lock:
+            if self._context is None:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                self._context = context
+            return self._context
+
+    def get(self, host, port, context):
+        """Get the session of a server created with ``context``, or `None`."""
+        key = (context, host, port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return None
+            if session.time + session.timeout < time.time():
+                del self._sessions[key]
+                return None
+            self._sessions.move_to_end(key)
+            return session
+
+    def put(self, host, port, context, session):
+        """Remember the session of a server created with ``context``."""
+        key = (context, host, port)
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+
+    def clear(self):
+        """Forget all the sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+
+# Shared by all the `FTPFS` instances of the process
+SESSION_CACHE = TLSSessionCache()
+
+
+class ExplicitFTP_TLS(ObservedCommands, ftplib.FTP_TLS):
+    def __init__(self, *args, reuse_ssl_session=True, session_cache=None, **kwargs):
         self.reuse_ssl_session = reuse_ssl_session
+        # New control connections resume the sessions of this cache
+        self.session_cache = session_cache
+        if session_cache is not None and kwargs.get("context") is None:
+            kwargs["context"] = session_cache.context
         super().__init__(*args, **kwargs)
 
+    def _cached_session(self):
+        if self.session_cache is None:
+            return None
+        return self.session_cache.get(self.host, self.port, self.context)
+
+    def _remember_session(self):
+        session = getattr(self.sock, "session", None)
+        if self.session_cache is not None and session is not None:
+            self.session_cache.put(self.host, self.port, self.context, session)
+
+    def auth(self):
+        """Set up secure control connection by using TLS/SSL."""
+        if isinstance(self.sock, ssl.SSLSocket):
+            raise ValueError("Already using TLS")
+        resp = self.voidcmd("AUTH TLS")
+        # An abbreviated handshake ends with a message of the client, which
+        # is followed by a command: without this, the command would wait
+        # for the delayed acknowledgement of the server (Nagle's algorithm)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = self.context.wrap_socket(
+            self.sock, server_hostname=self.host, session=self._cached_session()
+        )
+        self.file = self.sock.makefile(mode="r", encoding=self.encoding)
+        return resp
+
+    def login(self, *args, **kwargs):
+        resp = super().login(*args, **kwargs)
+        # With TLS 1.3, the session is only known once the server sent
+        # a ticket, after the handshake
+        self._remember_session()
+        return resp
+
     def ntransfercmd(self, cmd, rest=None):
         conn, size = ftplib.FTP.ntransfercmd(self, cmd, rest)
         if self._prot_p:
@@ -39,7 +148,7 @@ class ImplicitFTP_TLS(ExplicitFTP_TLS):
     def sock(self, value):
         """When modifying the socket, ensure that it is ssl wrapped."""
         if value is not None and not isinstance(value, ssl.SSLSocket):
-            value = self.context.wrap_socket(value)
+            value = self.context.wrap_socket(value, session=self._cached_session())
         self._sock = value
 
 
@@ -49,4 +158,4 @@ class ImplicitFTP_TLS(ExplicitFTP_TLS):
 
     def prot_c(self):
         # do nothing as we use Implicit TLS
-        pass
\ No newline at end of file
+        pass
@@ -8,15 +8,22 @@ import typing
 import array
 import calendar
 import datetime
+import functools
 import io
 import itertools
+import select
 import socket
 import ssl
+import threading
+import time
+import uuid
+import weakref
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from ftplib import FTP
 
-from .ftp_tls import ImplicitFTP_TLS, ExplicitFTP_TLS
+from .ftp_tls import SESSION_CACHE, ImplicitFTP_TLS, ExplicitFTP_TLS
 from typing import cast
 
 from ftplib import error_perm, error_temp, error_proto, error_reply
@@ -24,6 +31,20 @@ import ftplib
 from six import PY2, raise_from, text_type
 
 from . import _ftp_parse as ftp_parse
+from ._cache import DirectoryCache
+from ._observe import FTPObserver, MetricsAggregator, ObservedFTP, Observers
+from ._profile import Profile
+from ._hash import (
+    HashWriter,
+    default_hash_algorithm,
+    hash_commands,
+    new_hash,
+    parse_hash_reply,
+)
+from ._pool import FTPConnectionPool
+from ._prefetch import ReadAhead
+from ._transfer import TransferMeter, TransferStats, receive_file, send_file, write_all
+from ._walk import ParallelWalker
 from fs import errors
 from fs.base import FS
 from fs.constants import DEFAULT_CHUNK_SIZE
@@ -31,7 +52,7 @@ from fs.enums import ResourceType, Seek
 from fs.info import Info
 from fs.iotools import line_iterator
 from fs.mode import Mode
-from fs.path import abspath, basename, dirname, normpath, split
+from fs.path import abspath, basename, dirname, isbase, join, normpath, split
 from fs.time import epoch_to_datetime
 
 if typing.TYPE_CHECKING:
@@ -39,6 +60,7 @@ if typing.TYPE_CHECKING:
         Any,
         BinaryIO,
         ByteString,
+        Callable,
         Container,
         Dict,
         Iterable,
@@ -53,6 +75,7 @@ if typing.TYPE_CHECKING:
 
     import ftplib
     import mmap
+    from concurrent.futures import Future
 
     from fs.base import _OpendirFactory
     from fs.info import RawInfo
@@ -67,7 +90,51 @@ log = logging.getLogger(__name__)
 _F = typing.TypeVar("_F", bound="FTPFS")
 
 
-__all__ = ["FTPFS"]
+__all__ = ["FTPFS", "FTPObserver", "MetricsAggregator", "ParallelWalker", "TransferStats"]
+
+# Smallest byte range fetched by a segmented download
+_MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Writes smaller than this are coalesced before being sent
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Forward seeks up to this distance receive and drop the data in between,
+# rather than restarting the transfer (a new data connection, REST and RETR)
+_SEEK_SKIP_SIZE = 128 * 1024
+
+# Size of the blocks kept by the block cache of a file
+_BLOCK_SIZE = 64 * 1024
+
+# Number of seconds to wait for the destination to accept a FXP transfer
+_FXP_STOR_WAIT = 1.0
+
+# Ways `getinfo` gets the information of a resource without MLST
+_GETINFO_STRATEGIES = ("listing", "commands")
+
+# Namespaces the SIZE and MDTM commands provide
+_COMMAND_NAMESPACES = frozenset(("basic", "details"))
+
+
+def _set_type(ftp, transfer_type, force=False):
+    # type: (FTP, Text, bool) -> None
+    """Set the transfer type (``"A"`` or ``"I"``) of a connection.
+
+    The type is remembered, so, ``TYPE`` is only sent when it changes,
+    or if ``force`` is true, e.g. to check that the connection is alive.
+    """
+    if force or getattr(ftp, "_transfer_type", None) != transfer_type:
+        ftp.voidcmd(str("TYPE " + transfer_type))
+        ftp._transfer_type = transfer_type  # type: ignore
+
+
+def _send_zeros(conn, count):
+    # type: (socket.socket, int) -> None
+    """Send ``count`` zero bytes to a data connection."""
+    zeros = memoryview(bytes(min(count, DEFAULT_CHUNK_SIZE)))
+    while count > 0:
+        conn.sendall(zeros[:count])
+        count -= len(zeros)
+
 
 @contextmanager
 def ignore_network_errors(op):
@@ -112,8 +179,6 @@ def convert_ftp_errors(fs, path=None, op=None, connection_error=errors.RemoteCon
 
     except (error_reply, error_proto) as error:   # Added by MiaRec
         log.info('FTP error: %s' % error)
-        if isinstance(fs, FTPFS):
-            fs._ftp = None    # clear the connection, so, it can be re-opened on next operation (c) MiaRec
         if path is not None:
             raise errors.ResourceError(
                 path, msg=f"ftp error on resource '{path}' (op={op}): {error}"
@@ -144,31 +209,118 @@ def convert_ftp_errors(fs, path=None, op=None, connection_error=errors.RemoteCon
             raise errors.PermissionDenied(path=path, msg=message)
 
 
+# Errors after which a control connection can no longer be trusted,
+# e.g. because it is out of sync with the server replies
+_BROKEN_CONNECTION_ERRORS = (OSError, EOFError, error_reply, error_proto)
+
+
+class _SharedListing(object):
+    """A listing transferred over the connection leased by a thread.
+
+    The lease may end before the listing, e.g. if the listing is
+    abandoned without being closed: then, the listing releases the
+    connection once it is closed.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._lock = threading.Lock()
+        self.done = False
+        self.orphaned = False
+        self.discard = False
+
+    def finish(self):
+        # type: () -> bool
+        """Mark the listing as done, and tell if it must release the connection."""
+        with self._lock:
+            self.done = True
+            return self.orphaned
+
+    def orphan(self, discard):
+        # type: (bool) -> bool
+        """Hand over the connection, unless the listing is done."""
+        with self._lock:
+            if self.done:
+                return False
+            self.orphaned = True
+            self.discard = discard
+            return True
+
+
 @contextmanager
 def get_ftp_connection(fs, path=None, op=None):
     # type: (FTPFS, Optional[Text], Optional[Text]) -> Iterator[FTP]
     """
-    Handle FTP errors accordingly.
+    Lease a control connection from the FTPFS connection pool and handle FTP errors accordingly.
+
+    Nested calls from the same thread share the connection leased by the outermost call,
+    so, the pool size limits the number of threads talking to the server at once.
 
     In case of RemoteConnectioError, the internal network connection will be discarded,
     and on the next operation, a new connection to remote server will be attempted.
     """
+    pool = fs._pool
+    local = pool.local
+    ftp = getattr(local, "ftp", None)
+    listing = getattr(local, "listing", None)  # type: Optional[_SharedListing]
+    if ftp is not None and listing is not None and not listing.done:
+        # The connection of this thread is transferring a listing, e.g.
+        # getinfo() on each entry of scandir(), so, it cannot be shared
+        broken = False
+        ftp = None
+        try:
+            with convert_ftp_errors(fs, path, op):
+                ftp = pool.acquire(fs._open_ftp, overflow=True)
+                try:
+                    yield ftp
+                except _BROKEN_CONNECTION_ERRORS:
+                    broken = True
+                    raise
+        except errors.RemoteConnectionError:
+            broken = True
+            raise
+        finally:
+            if ftp is not None:
+                pool.release(ftp, discard=broken)
+        return
+
+    if ftp is not None:
+        # Re-entrant call, e.g. isdir() within makedir()
+        try:
+            with convert_ftp_errors(fs, path, op):
+                try:
+                    yield ftp
+                except _BROKEN_CONNECTION_ERRORS:
+                    local.broken = True
+                    raise
+        except errors.RemoteConnectionError:
+            local.broken = True
+            raise
+        return
+
     ftp = None
+    local.broken = False
     try:
         with convert_ftp_errors(fs, path, op):
-            with fs._lock:
-                if fs._ftp is None:
-                    fs._ftp = fs._open_ftp()   # this method can throw exception
-                ftp = fs._ftp
-            yield ftp
+            ftp = pool.acquire(fs._open_ftp)   # this method can throw exception
+            local.ftp = ftp
+            try:
+                yield ftp
+            except _BROKEN_CONNECTION_ERRORS:
+                local.broken = True
+                raise
     except errors.RemoteConnectionError:
-        with fs._lock:
-            if ftp:
-                with ignore_network_errors(op):
-                    ftp.close()    # RemoteConnectionError could be caused by socket.timeout. Close FTP connection to avoid memory leakage
-            if ftp == fs._ftp:
-                fs._ftp = None   # Discard the network connection. It will be reopened  on the next operation
+        local.broken = True
         raise
+    finally:
+        local.ftp = None
+        listing, local.listing = getattr(local, "listing", None), None
+        if listing is not None and listing.orphan(local.broken):
+            # A listing still uses the connection, and releases it once closed
+            ftp = None
+        if ftp is not None:
+            # A broken connection is closed, so, it will be reopened on the next operation
+            pool.release(ftp, discard=local.broken)
 
 
 def _parse_ftp_error(error):
@@ -185,17 +337,29 @@ def _parse_ftp_error(error):
 
 
 class FTPFile(io.RawIOBase):
-    def __init__(self, ftpfs, path, mode):
-        # type: (FTPFS, Text, Text) -> None
+    def __init__(self, ftpfs, path, mode, prefetch=0, block_cache=0):
+        # type: (FTPFS, Text, Text, int, int) -> None
         super(FTPFile, self).__init__()
         self.fs = ftpfs
         self.path = path
         self.mode = Mode(mode)
         self.pos = 0
-        self.ftp = self._open_ftp()
+        self.prefetch = prefetch
         self._read_conn = None  # type: Optional[socket.socket]
+        # Position in the file of the next byte received by the read transfer
+        self._read_pos = 0
+        self._read_ahead = None  # type: Optional[ReadAhead]
+        # Most recently used blocks of the file, by index
+        self._blocks = OrderedDict() if block_cache else None  # type: Optional[OrderedDict[int, bytearray]]
+        self._max_blocks = max(1, block_cache // _BLOCK_SIZE)
         self._write_conn = None  # type: Optional[socket.socket]
+        self._write_buffer = bytearray()
+        # Time and position of the start of the current transfer
+        self._transfer_start = (0.0, 0)
+        self._broken = False  # the control connection is out of sync and must not be reused
         self._closed = False
+        self.ftp = None  # type: Optional[FTP]
+        self.ftp = self._open_ftp()
 
     def __del__(self):
         # Close this file and release FTP connection when the object is destroyed by garbage collector
@@ -204,38 +368,162 @@ class FTPFile(io.RawIOBase):
 
     def _open_ftp(self, connection_error=errors.RemoteConnectionError):
         # type: () -> FTP
-        """Open an ftp object for the file."""
-        ftp = self.fs._open_ftp(connection_error=connection_error)
-        with convert_ftp_errors(self.fs, op='open_file', path=self.path, connection_error=connection_error):
-            ftp.voidcmd(str("TYPE I"))
-        return ftp
+        """Lease an ftp object for the file from the filesystem connection pool."""
+        pool = self.fs._pool
+        factory = functools.partial(self.fs._open_ftp, connection_error=connection_error)
+        # Idle connections could have been dropped by the server in the meantime,
+        # so, try each of them before giving up
+        retries = pool.idle_count
+        while True:
+            ftp = pool.acquire(factory, overflow=True)
+            try:
+                with convert_ftp_errors(self.fs, op='open_file', path=self.path, connection_error=connection_error):
+                    _set_type(ftp, "I", force=True)
+                return ftp
+            except connection_error as error:
+                pool.release(ftp, discard=True)
+                if retries <= 0:
+                    raise
+                retries -= 1
+                log.info(f"[open_file] Discarding a broken pooled connection: {error}")
+            except BaseException:
+                pool.release(ftp, discard=True)
+                raise
+
+    @contextmanager
+    def _convert_errors(self, op):
+        """Convert FTP errors and remember if the control connection cannot be reused anymore."""
+        with convert_ftp_errors(self.fs, op=op, path=self.path, connection_error=IOError):
+            try:
+                yield
+            except _BROKEN_CONNECTION_ERRORS:
+                self._broken = True
+                raise
+
+    def _read_transfer_reply(self):
+        # type: () -> None
+        """Read the final reply of a data transfer, so, the control connection can be reused."""
+        try:
+            self.ftp.voidresp()
+        except (error_temp, error_perm) as error:
+            # E.g. "426 Transfer aborted" when the data connection is closed before
+            # the end of file. The control connection is still in sync with the server.
+            log.info(f"[FTP voidresp] Transfer not completed (ignoring): {error}")
+        except (ssl.SSLError, socket.error, EOFError, ftplib.Error) as error:
+            log.info(f"[FTP voidresp] Unexpected network error (ignoring): {error}")
+            self._broken = True
+
+    def _close_data_connections(self):
+        # type: () -> None
+        """Close the data connections and complete the pending transfer."""
+        self._close_write_conn()
+        self._close_read_conn()
+
+    def _close_write_conn(self):
+        # type: () -> None
+        # Make sure we flush all pending write data before closing the connection (c) MiaRec
+        if self._write_conn is not None:
+            # Here we silently ignore any errors during closing of the file (c) MiaRec
+            # A network connection could be already dead and any FTP commands will throw error
+            with ignore_network_errors("Unwrapping SSL write connection"):  # (c) MiaRec
+                if isinstance(self._write_conn, ssl.SSLSocket):
+                    self._write_conn = self._write_conn.unwrap()
+
+            with ignore_network_errors("Closing write connection"):  # (c) MiaRec
+                self._write_conn.close()
 
+            self._write_conn = None
+            self._read_transfer_reply()  # Ensure last operation is completed
+            self.fs._invalidate_cache(self.path)
+            self._report_transfer("upload", self.pos)
+
+    def _close_read_conn(self):
+        # type: () -> None
+        if self._read_ahead is not None:
+            # Stop the helper thread before touching the read connection
+            self._read_ahead.cancel()
+            self._read_ahead = None
+
+        if self._read_conn is not None:
+            with ignore_network_errors("Unwrapping SSL read connection"):  # (c) MiaRec
+                # Due to buffering in read operations, some data may be read into buffer,
+                # but not consumed by the application.
+                # Unwrap operation will throw ssl.SSLError(APPLICATION_DATA_AFTER_CLOSE_NOTIFY)
+                # if there is still some data in the reading buffer.
+                # It is safe to ignore such error
+                if isinstance(self._read_conn, ssl.SSLSocket):
+                    self._read_conn = self._read_conn.unwrap()
+
+            with ignore_network_errors("Closing read connection"):  # (c) MiaRec
+                self._read_conn.close()
+            self._read_conn = None
+            self._read_transfer_reply()
+            self._report_transfer("download", self._read_pos)
+
+    def _report_transfer(self, direction, end):
+        # type: (Text, int) -> None
+        """Report the transfer which ended at position ``end``."""
+        observers = self.fs._observers
+        if observers.active:
+            start, start_pos = self._transfer_start
+            observers.transfer(direction, end - start_pos, time.perf_counter() - start)
+
+    def _release_ftp(self):
+        # type: () -> None
+        """Return the control connection to the filesystem connection pool."""
+        ftp, self.ftp = self.ftp, None
+        if ftp is not None:
+            self.fs._pool.release(ftp, discard=self._broken)
+        self._broken = False
+
+    def _replace_broken_ftp(self):
+        # type: () -> None
+        """Lease another control connection if this one is out of sync."""
+        if self._broken:
+            self._release_ftp()
+            self.ftp = self._open_ftp()
 
     @property
     def read_conn(self):
         # type: () -> socket.socket
         if self._read_conn is None:
-            with convert_ftp_errors(self.fs, op='open_read_conn', path=self.path, connection_error=IOError):
-                self._read_conn = self.ftp.transfercmd(
-                    "RETR " + self.path, self.pos
-                )
+            # A control connection runs a single transfer at a time
+            self.flush()
+            self._close_write_conn()
+            self._replace_broken_ftp()
+            with self._convert_errors(op='open_read_conn'):
+                self._start_read()
         return self._read_conn
 
+    def _start_read(self):
+        # type: () -> None
+        """Start the read transfer at the read position (ftplib errors are not converted)."""
+        self._read_conn = self.ftp.transfercmd("RETR " + self.path, self._read_pos)
+        self._transfer_start = (time.perf_counter(), self._read_pos)
+
     @property
     def write_conn(self):
         # type: () -> socket.socket
         if self._write_conn is None:
-            with convert_ftp_errors(self.fs, op='open_write_conn', path=self.path, connection_error=IOError):
-                if self.mode.appending:
-                    self._write_conn = self.ftp.transfercmd(
-                        "APPE " + self.path
-                    )
-                else:
-                    self._write_conn = self.ftp.transfercmd(
-                        "STOR " + self.path, self.pos
-                    )
+            # A control connection runs a single transfer at a time
+            self._close_read_conn()
+            self._replace_broken_ftp()
+            with self._convert_errors(op='open_write_conn'):
+                self._start_write()
         return self._write_conn
 
+    def _start_write(self):
+        # type: () -> None
+        """Start the write transfer at the position (ftplib errors are not converted)."""
+        try:
+            if self.mode.appending:
+                self._write_conn = self.ftp.transfercmd("APPE " + self.path)
+            else:
+                self._write_conn = self.ftp.transfercmd("STOR " + self.path, self.pos)
+        finally:
+            self.fs._invalidate_cache(self.path)
+        self._transfer_start = (time.perf_counter(), self.pos)
+
     def __repr__(self):
         # type: () -> str
         _repr = "<ftpfile {!r} {!r} {!r}>"
@@ -245,38 +533,13 @@ class FTPFile(io.RawIOBase):
         # type: () -> None
         if not self.closed:
             try:
-                if self._write_conn is not None:
-                    # Here we silently ignore any errors during closing of the file (c) MiaRec
-                    # A network connection could be already dead and any FTP commands will throw error
-                    with ignore_network_errors("Unwrapping SSL write connection"):  # (c) MiaRec
-                        if isinstance(self._write_conn, ssl.SSLSocket):
-                            self._write_conn = self._write_conn.unwrap()
-
-                    with ignore_network_errors("Closing write connection"):  # (c) MiaRec
-                        self._write_conn.close()
-
-                    self._write_conn = None
-
-                    with ignore_network_errors("FTP voidresp"):  # (c) MiaRec
-                        self.ftp.voidresp()  # Ensure last operation is completed
-
-                if self._read_conn is not None:
-                    with ignore_network_errors("Unwrapping SSL read connection"):  # (c) MiaRec
-                        # Due to buffering in read operations, some data may be read into buffer,
-                        # but not consumed by the application.
-                        # Unwrap operation will throw ssl.SSLError(APPLICATION_DATA_AFTER_CLOSE_NOTIFY)
-                        # if there is still some data in the reading buffer.
-                        # It is safe to ignore such error
-                        if isinstance(self._read_conn, ssl.SSLSocket):
-                            self._read_conn = self._read_conn.unwrap()
-
-                    with ignore_network_errors("Closing read connection"):  # (c) MiaRec
-                        self._read_conn.close()
-                        self._read_conn = None
-
-                with ignore_network_errors("Closing FTP file connection"):  # (c) MiaRec
-                    self.ftp.quit()
-
+                if self.ftp is not None:
+                    try:
+                        self.flush()
+                    finally:
+                        self._close_data_connections()
+                        # The connection is kept open for the next file or FTPFS operation
+                        self._release_ftp()
             finally:
                 super(FTPFile, self).close()
 
@@ -290,37 +553,129 @@ class FTPFile(io.RawIOBase):
 
     def read(self, size=-1):
         # type: (int) -> bytes
+        if size is None or size < 0:
+            return self.readall()
+        data = bytearray(size)
+        bytes_read = self.readinto(data)
+        del data[bytes_read:]
+        return bytes(data)
+
+    def readall(self):
+        # type: () -> bytes
+        data = bytearray()
+        chunk = memoryview(bytearray(DEFAULT_CHUNK_SIZE))
+        while True:
+            bytes_read = self.readinto(chunk)
+            data += chunk[:bytes_read]
+            if bytes_read < len(chunk):
+                return bytes(data)
+
+    def readinto(self, buffer):
+        # type: (Union[bytearray, memoryview, array.array[Any], mmap.mmap]) -> int
+        """Read into ``buffer`` until it is full or the end of file is reached.
+
+        Data is received from the socket straight into the buffer, without
+        any intermediate copy, unless the file reads ahead (see ``prefetch``
+        in `FTPFS.openbin`).
+        """
         if not self.mode.reading:
             raise IOError("File not open for reading")
 
-        chunks = []
-        remaining = size
-
-        conn = self.read_conn
-        with convert_ftp_errors(self.fs, op='read', path=self.path, connection_error=IOError):
-            while remaining:
-                if remaining < 0:
-                    read_size = DEFAULT_CHUNK_SIZE
-                else:
-                    read_size = min(DEFAULT_CHUNK_SIZE, remaining)
-                chunk = conn.recv(read_size)
-                if not chunk:
+        view = memoryview(buffer).cast("B")
+        if self._blocks is not None:
+            return self._readinto_blocks(view)
+        size = len(view)
+        bytes_read = 0
+
+        self._seek_read(self.pos)
+        self.read_conn
+        with self._convert_errors(op='read'):
+            if self.prefetch > 0:
+                bytes_read = self._recv_into(view)
+                self.pos += bytes_read
+                return bytes_read
+            while bytes_read < size:
+                received = self._recv_into(view[bytes_read:])
+                if not received:
                     break
-                chunks.append(chunk)
-                self.pos += len(chunk)
-                remaining -= len(chunk)
-        return b"".join(chunks)
+                bytes_read += received
+                self.pos += received
+        return bytes_read
 
-    def readinto(self, buffer):
-        # type: (Union[bytearray, memoryview, array.array[Any], mmap.mmap]) -> int
-        data = self.read(len(buffer))
-        bytes_read = len(data)
-        if isinstance(buffer, array.array):
-            buffer[:bytes_read] = array.array(buffer.typecode, data)
+    def _recv_into(self, view):
+        # type: (memoryview) -> int
+        """Receive data of the read transfer into ``view``."""
+        conn = self.read_conn
+        if self.prefetch > 0:
+            if self._read_ahead is None:
+                self._read_ahead = ReadAhead(conn, self.prefetch)
+            received = self._read_ahead.readinto(view)
         else:
-            buffer[:bytes_read] = data  # type: ignore
+            received = conn.recv_into(view)
+        self._read_pos += received
+        return received
+
+    def _seek_read(self, pos):
+        # type: (int) -> None
+        """Move the read transfer to ``pos``.
+
+        Short forward moves drop the data in between, other moves close
+        the transfer, which is restarted at ``pos`` by the next read.
+        """
+        if self._read_conn is not None and self._read_pos != pos:
+            skip = pos - self._read_pos
+            if 0 < skip <= _SEEK_SKIP_SIZE:
+                scratch = memoryview(bytearray(min(skip, DEFAULT_CHUNK_SIZE)))
+                with self._convert_errors(op='seek'):
+                    while self._read_pos < pos:
+                        if not self._recv_into(scratch[: pos - self._read_pos]):
+                            break  # End of file
+            if self._read_pos != pos:
+                self._close_read_conn()
+        if self._read_conn is None:
+            self._read_pos = pos
+
+    def _readinto_blocks(self, view):
+        # type: (memoryview) -> int
+        """Read into ``view`` through the block cache."""
+        size = len(view)
+        bytes_read = 0
+        while bytes_read < size:
+            index, offset = divmod(self.pos, _BLOCK_SIZE)
+            block = self._get_block(index)
+            count = max(0, min(len(block) - offset, size - bytes_read))
+            view[bytes_read : bytes_read + count] = memoryview(block)[offset : offset + count]
+            bytes_read += count
+            self.pos += count
+            if len(block) < _BLOCK_SIZE:
+                break  # End of file
         return bytes_read
 
+    def _get_block(self, index):
+        # type: (int) -> bytearray
+        """Get a block of the file, from the cache or from the server."""
+        blocks = self._blocks
+        block = blocks.get(index)
+        if block is not None:
+            blocks.move_to_end(index)
+            return block
+        self._seek_read(index * _BLOCK_SIZE)
+        block = bytearray(_BLOCK_SIZE)
+        view = memoryview(block)
+        received = 0
+        with self._convert_errors(op='read'):
+            while received < _BLOCK_SIZE:
+                count = self._recv_into(view[received:])
+                if not count:
+                    break
+                received += count
+        view.release()
+        del block[received:]
+        blocks[index] = block
+        if len(blocks) > self._max_blocks:
+            blocks.popitem(last=False)
+        return block
+
     def readline(self, size=None):
         # type: (Optional[int]) -> bytes
         return next(line_iterator(self, size))  # type: ignore
@@ -342,55 +697,180 @@ class FTPFile(io.RawIOBase):
 
     def write(self, data):
         # type: (Union[bytes, memoryview, array.array[Any], mmap.mmap]) -> int
+        """Write data to the file.
+
+        Small writes are coalesced in a buffer, which is sent once it is
+        full, or on `flush`, `seek` and `close`. Large writes are sent
+        straight from ``data``, without any copy.
+        """
         if not self.mode.writing:
             raise IOError("File not open for writing")
 
-        if isinstance(data, array.array):
-            data = data.tobytes()
+        view = memoryview(data).cast("B")
+        size = len(view)
+        buffer = self._write_buffer
+        if self._blocks:
+            self._blocks.clear()
 
-        with convert_ftp_errors(self.fs, op='write', path=self.path, connection_error=IOError):
+        with self._convert_errors(op='write'):
+            # Open the transfer now, so, it starts at the current position
             conn = self.write_conn
-            data_pos = 0
-            remaining_data = len(data)
-
-            while remaining_data:
-                chunk_size = min(remaining_data, DEFAULT_CHUNK_SIZE)
-                sent_size = conn.send(data[data_pos : data_pos + chunk_size])
-                data_pos += sent_size
-                remaining_data -= sent_size
-                self.pos += sent_size
+            if len(buffer) + size < _WRITE_BUFFER_SIZE:
+                buffer += view
+            elif size < _WRITE_BUFFER_SIZE:
+                buffer += view
+                conn.sendall(buffer)
+                del buffer[:]
+            else:
+                if buffer:
+                    conn.sendall(buffer)
+                    del buffer[:]
+                conn.sendall(view)
 
-        return data_pos
+        self.pos += size
+        return size
 
     def writelines(self, lines):
         # type: (Iterable[Union[bytes, memoryview, array.array[Any], mmap.mmap]]) -> None  # noqa: E501
         if not self.mode.writing:
             raise IOError("File not open for writing")
-        data = bytearray()
         for line in lines:
-            if isinstance(line, array.array):
-                data.extend(line.tobytes())
-            else:
-                data.extend(line)  # type: ignore
-        self.write(data)
+            self.write(line)
+
+    def flush(self):
+        # type: () -> None
+        """Send the data buffered by `write`."""
+        super(FTPFile, self).flush()
+        if self._write_buffer:
+            with self._convert_errors(op='write'):
+                try:
+                    self.write_conn.sendall(self._write_buffer)
+                finally:
+                    del self._write_buffer[:]
 
     def truncate(self, size=None):
         # type: (Optional[int]) -> int
-        # Inefficient, but I don't know if truncate is possible with ftp
-        # TODO: this strange implementation of "truncate" must be clearly documented 
-        # as we are reading the original file into memory and then pushing it back.
-        # If file is huge, we can hit Out-of-memory issue
-        # (c) MiaRec
+        """Resize the file to ``size`` bytes (by default, the current position).
+
+        FTP has no command to resize a file. A file is extended by
+        appending zeros to it (``APPE``). It is shortened by copying its
+        first ``size`` bytes to a temporary file of the same directory,
+        then renaming the copy over the file (``RNFR``/``RNTO``). Data is
+        piped from the download to the upload through a single buffer,
+        so, the memory used does not depend on the size of the file.
+        The position in the file is not changed.
+        """
+        if not self.mode.writing:
+            raise IOError("File not open for writing")
         if size is None:
             size = self.tell()
-        with self.fs.openbin(self.path) as f:
-            data = f.read(size)
-        with self.fs.openbin(self.path, "w") as f:
-            f.write(data)
-            if len(data) < size:
-                f.write(b"\0" * (size - len(data)))
+        if size < 0:
+            raise ValueError("negative size value")
+        self.flush()
+        self._close_data_connections()
+        self._replace_broken_ftp()
+        if self._blocks is not None:
+            self._blocks.clear()
+
+        file_size = self.fs.getsize(self.path)
+        try:
+            if size > file_size:
+                self._append_zeros(size - file_size)
+            elif size == 0:
+                with self._convert_errors(op='truncate'):
+                    self._store(self.ftp, self.path, 0)
+            elif size < file_size:
+                self._truncate_copy(size)
+        finally:
+            self.fs._invalidate_cache(self.path)
         return size
 
+    def _append_zeros(self, count):
+        # type: (int) -> None
+        """Append ``count`` zero bytes to the file."""
+        with self._convert_errors(op='truncate'):
+            with self.ftp.transfercmd("APPE " + self.path) as conn:
+                _send_zeros(conn, count)
+                if isinstance(conn, ssl.SSLSocket):
+                    conn.unwrap()
+            self.ftp.voidresp()
+
+    def _store(self, ftp, path, size):
+        # type: (FTP, Text, int) -> None
+        """Store the first ``size`` bytes of the file at ``path`` with ``ftp``.
+
+        The file is downloaded on the control connection of this file,
+        and padded with zeros if it is shorter than ``size``.
+        """
+        buffer = memoryview(bytearray(min(size, DEFAULT_CHUNK_SIZE)))
+        with ftp.transfercmd("STOR " + path) as conn:
+            sent = 0
+            if size:
+                # The download stops once ``size`` bytes are received
+                self._read_pos = 0
+                try:
+                    while sent < size:
+                        received = self.read_conn.recv_into(buffer[: size - sent])
+                        if not received:
+                            break
+                        conn.sendall(buffer[:received])
+                        sent += received
+                finally:
+                    self._close_read_conn()
+            _send_zeros(conn, size - sent)
+            if isinstance(conn, ssl.SSLSocket):
+                conn.unwrap()
+        ftp.voidresp()
+
+    def _truncate_copy(self, size):
+        # type: (int) -> None
+        """Replace the file with a copy of its first ``size`` bytes."""
+        temp_path = join(
+            dirname(self.path),
+            ".{}.{}.truncate".format(basename(self.path), uuid.uuid4().hex[:12]),
+        )
+        pool = self.fs._pool
+        # The copy is uploaded on another connection
+        ftp = pool.acquire(self.fs._open_ftp, overflow=True)
+        broken = True
+        # Once the file is deleted, the copy is the only one left
+        deleted = False
+        try:
+            with self._convert_errors(op='truncate'):
+                _set_type(ftp, "I")
+                try:
+                    self._store(ftp, temp_path, size)
+                    broken = False
+                    try:
+                        ftp.rename(temp_path, self.path)
+                    except error_perm:
+                        # Some servers do not rename over an existing file,
+                        # which is only worth deleting if the copy can be
+                        # renamed at all, e.g. to a new name
+                        renamed_path = temp_path + ".renamed"
+                        ftp.rename(temp_path, renamed_path)
+                        temp_path = renamed_path
+                        ftp.delete(self.path)
+                        deleted = True
+                        ftp.rename(temp_path, self.path)
+                except BaseException as error:
+                    if deleted:
+                        broken = isinstance(error, _BROKEN_CONNECTION_ERRORS)
+                        if isinstance(error, Exception):
+                            raise errors.OperationFailed(
+                                path=self.path,
+                                exc=error,
+                                msg="could not rename the truncated file "
+                                "'{}' to '{}': {}".format(temp_path, self.path, error),
+                            )
+                    elif not self._broken:
+                        with ignore_network_errors("Removing temporary file"):
+                            self.ftp.delete(temp_path)
+                    raise
+        finally:
+            pool.release(ftp, discard=broken)
+            self.fs._invalidate_cache(temp_path)
+
     def seekable(self):
         # type: () -> bool
         return True
@@ -412,33 +892,15 @@ class FTPFile(io.RawIOBase):
         if new_pos == self.pos:
             return self.pos   # no changes in position, do nothing
 
-        # We need to re-open write_conn/read_conn to move the file seek position.
-        # When they are re-opened, RESTART (REST) FTP command is sent with a file position
+        # The write transfer is restarted at the new position by the next
+        # write (with a REST command), on the same control connection
+        self.flush()
         self.pos = new_pos
-
-        # Make sure we flush all pending write data before closing the connection (c) MiaRec
-        if self._write_conn is not None:
-            with ignore_network_errors("Unwrapping SSL write connection"):  # (c) MiaRec
-                if isinstance(self._write_conn, ssl.SSLSocket):
-                    self._write_conn = self._write_conn.unwrap()
-            with ignore_network_errors("Closing write connection"):  # (c) MiaRec
-                self._write_conn.close()
-            self._write_conn = None
-
-            with ignore_network_errors("FTP voidresp"):  # (c) MiaRec
-                self.ftp.voidresp()  # Ensure last write completed
-
-        if self._read_conn is not None:
-            with ignore_network_errors("Unwrapping SSL read connection"):  # (c) MiaRec
-                if isinstance(self._read_conn, ssl.SSLSocket):
-                    self._read_conn = self._read_conn.unwrap()
-            with ignore_network_errors("Closing read connection"):  # (c) MiaRec
-                self._read_conn.close()
-            self._read_conn = None
-
-        with ignore_network_errors("Closing FTP file connection"):  # (c) MiaRec
-            self.ftp.quit()
-        self.ftp = self._open_ftp()
+        self._close_write_conn()
+        if self._blocks is None:
+            # Reads through the block cache move the transfer themselves
+            self._seek_read(new_pos)
+        self._replace_broken_ftp()
 
         return self.tell()
 
@@ -487,6 +949,9 @@ class FTPFS(FS):
         "virtual": False,
     }
 
+    # Lists several directories concurrently, over the connection pool
+    walker_class = ParallelWalker
+
     def __init__(
         self,
         host,  # type: Text
@@ -499,6 +964,19 @@ class FTPFS(FS):
         tls=False,  # type: bool
         implicit_tls=False, # type: bool
         reuse_ssl_session=True,  # type: bool
+        pool_size=4,  # type: int
+        max_overflow=16,  # type: Optional[int]
+        cache_size=0,  # type: int
+        cache_ttl=30,  # type: float
+        stat_listing=False,  # type: bool
+        getinfo_strategy="listing",  # type: Text
+        optimistic_open=False,  # type: bool
+        keepalive=None,  # type: Optional[float]
+        max_idle=None,  # type: Optional[float]
+        max_lifetime=None,  # type: Optional[float]
+        prewarm=0,  # type: int
+        observers=(),  # type: Iterable[FTPObserver]
+        ssl_context=None,  # type: Optional[ssl.SSLContext]
     ):
         # type: (...) -> None
         """Create a new `FTPFS` instance.
@@ -515,7 +993,69 @@ class FTPFS(FS):
                 for no proxy.
             tls (bool): Attempt to use FTP over TLS (FTPS) (default: False)
             implicit_tls (bool): Use Implicit TLS (default: False)
-            reuse_ssl_session (bool): Reuse SSL session between control and data channels (default: True)
+            reuse_ssl_session (bool): Reuse SSL session between control and data channels (default: True).
+                New control connections also resume the session of a previous
+                connection to the same server, from a cache shared by all the
+                `FTPFS` instances of the process.
+            pool_size (int): Maximum number of control connections used
+                concurrently by different threads (default 4). Connections
+                are opened on demand, so, a single-threaded application
+                uses one connection only. Open files and directory
+                listings of threads not already using a connection use
+                connections of their own, see ``max_overflow``.
+            max_overflow (int, optional): Maximum number of connections
+                used at once by open files and directory listings
+                (default 16), or `None` for no limit. Further ones wait
+                until one is closed, unless their thread already uses a
+                connection, e.g. to open the files of a listing.
+            cache_size (int): Maximum number of directory listings kept in
+                memory to answer `getinfo` and `scandir` without contacting
+                the server (default 0, i.e. the cache is disabled).
+            cache_ttl (float): Number of seconds a cached directory listing
+                is used (default 30). The cache is updated on changes made
+                through this `FTPFS` instance only, so, changes made by other
+                clients may not be visible for up to ``cache_ttl`` seconds.
+            stat_listing (bool): List directories with ``STAT <path>`` on
+                servers without MLSD (default False). The listing is sent
+                over the control connection, which saves opening a data
+                connection (and its TLS handshake) for each listing, but
+                it is received in a single reply, so, this suits small
+                directories. ``LIST`` is used if the server does not
+                support it.
+            getinfo_strategy (str): How `getinfo` works on servers without
+                MLST. With ``"listing"`` (the default), the parent directory
+                is listed. With ``"commands"``, the ``SIZE`` command tells
+                whether a file exists (and its size), a ``CWD`` probe
+                whether a directory exists, and ``MDTM`` its modification
+                time, so, the cost does not depend on the size of the
+                parent. The parent is still listed for namespaces these
+                commands do not provide (e.g. ``access``), or if the server
+                does not support them.
+            optimistic_open (bool): Default of the ``optimistic`` option
+                of `openbin` (default False).
+            keepalive (float, optional): Send a ``NOOP`` command on the
+                connections of the pool idle for ``keepalive`` seconds,
+                from a background thread, so, the server does not close
+                them. Should be shorter than the idle timeout of the
+                server. Defaults to `None` (disabled).
+            max_idle (float, optional): Close the connections of the pool
+                idle for ``max_idle`` seconds (default `None`, i.e. never).
+            max_lifetime (float, optional): Close the connections of the
+                pool opened more than ``max_lifetime`` seconds ago, once
+                idle (default `None`, i.e. never). They are replaced in
+                the background, as well as the connections found closed
+                by the server when sending ``NOOP``, so, the next
+                operations do not pay for reconnecting.
+            prewarm (int): Number of connections opened at once, in the
+                background, with `warm_up` (default 0, i.e. connections
+                are opened on demand). See `ready`.
+            observers (list): Observers notified of the commands, data
+                transfers and connections, see `add_observer`.
+            ssl_context (ssl.SSLContext, optional): The context of the TLS
+                connections, e.g. to verify the certificate of the server.
+                By default, like `ftplib.FTP_TLS`, the certificate is not
+                verified. TLS sessions are only resumed between connections
+                with the same context.
 
         """
         super(FTPFS, self).__init__()
@@ -532,11 +1072,41 @@ class FTPFS(FS):
         # Support TLS session resumpion
         # See https://stackoverflow.com/questions/14659154/ftpes-session-reuse-required
         self.reuse_ssl_session = reuse_ssl_session
+        self.ssl_context = ssl_context
 
         self.encoding = "latin-1"
-        self._ftp = None  # type: Optional[FTP]
+        self._observers = Observers(observers)
+        self._pool = FTPConnectionPool(
+            max_size=pool_size,
+            max_overflow=max_overflow,
+            keepalive=keepalive,
+            max_idle=max_idle,
+            max_lifetime=max_lifetime,
+            observers=self._observers,
+        )
+        # The thread does not keep this filesystem alive, and stops
+        # once it is garbage collected
+        self._pool.start_maintenance(weakref.WeakMethod(self._open_ftp))
+        self._cache = (
+            DirectoryCache(max_size=cache_size, ttl=cache_ttl) if cache_size else None
+        )  # type: Optional[DirectoryCache]
         self._welcome = None  # type: Optional[Text]
         self._features = {}  # type: Dict[Text, Text]
+        if getinfo_strategy not in _GETINFO_STRATEGIES:
+            raise ValueError(
+                "getinfo_strategy must be one of {}".format(_GETINFO_STRATEGIES)
+            )
+        self.stat_listing = stat_listing
+        self.getinfo_strategy = getinfo_strategy
+        self.optimistic_open = optimistic_open
+        # Whether the server supports recursive listings (`None` if unknown)
+        self._list_recursive = None  # type: Optional[bool]
+        # Whether the server lists directories with STAT (`None` if unknown)
+        self._list_stat = None  # type: Optional[bool]
+        # The most recent warm-up of the connection pool
+        self._warm_up = None  # type: Optional[Future[int]]
+        if prewarm:
+            self.warm_up(prewarm)
 
     def __repr__(self):
         # type: (...) -> Text
@@ -571,18 +1141,74 @@ class FTPFS(FS):
                     features[key] = value
         return features
 
+    def add_observer(self, observer):
+        # type: (FTPObserver) -> None
+        """Notify an observer of the events of this filesystem.
+
+        The observer is notified of each control command (its latency and
+        reply code), data transfer (its direction, size and duration),
+        connection opened or closed, and wait for a connection of the
+        pool. Without observers, the events are not even created.
+
+        Arguments:
+            observer (FTPObserver): The observer, e.g. a
+                `MetricsAggregator`.
+
+        """
+        self._observers.add(observer)
+
+    def remove_observer(self, observer):
+        # type: (FTPObserver) -> None
+        """Stop notifying an observer added with `add_observer`."""
+        self._observers.remove(observer)
+
+    @contextmanager
+    def profile(self):
+        # type: () -> Iterator[Profile]
+        """Record the commands sent within a ``with`` block.
+
+        Each command is attributed to the outermost public method of this
+        filesystem, or of one of its files, in the stack of the thread
+        which sent it, e.g. the ``MLST`` command sent by `getinfo` within
+        `openbin` is attributed to `openbin`. This shows which calls cost
+        several round trips, and calls repeated for each file.
+
+        Example:
+            >>> with ftp_fs.profile() as profile:
+            ...     ftp_fs.writetext("/foo.txt", "bar")
+            >>> print(profile.report())
+            6 round trips, 0 connections opened, in 0.004s
+              writetext('/foo.txt'): MLST MLST TYPE PASV REST STOR (6 round trips, 0.003s)
+
+        The commands of all the threads using this filesystem are
+        recorded. Looking up the callers slows the commands down, so,
+        this is a development tool.
+        """
+        profile = Profile(self)
+        self.add_observer(profile)
+        try:
+            yield profile
+        finally:
+            self.remove_observer(profile)
+            profile.stop()
+
     def _open_ftp(self, connection_error=errors.RemoteConnectionError):
         # type: () -> FTP
         """Open a new ftp object."""
+        start = time.perf_counter()
         if self.tls or self.implicit_tls:
-            _ftp = (
-                ImplicitFTP_TLS(reuse_ssl_session=self.reuse_ssl_session) 
-                if self.implicit_tls else 
-                ExplicitFTP_TLS(reuse_ssl_session=self.reuse_ssl_session)
+            # New connections resume the TLS session of a previous one
+            session_cache = SESSION_CACHE if self.reuse_ssl_session else None
+            ftp_class = ImplicitFTP_TLS if self.implicit_tls else ExplicitFTP_TLS
+            _ftp = ftp_class(
+                reuse_ssl_session=self.reuse_ssl_session,
+                session_cache=session_cache,
+                context=self.ssl_context,
             )
         else:
-            _ftp = FTP()
+            _ftp = ObservedFTP()
 
+        _ftp.observers = self._observers
         _ftp.set_debuglevel(0)
         with convert_ftp_errors(self, op="open_ftp", connection_error=connection_error):
             _ftp.connect(self.host, self.port, self.timeout)
@@ -591,12 +1217,13 @@ class FTPFS(FS):
                 _ftp.prot_p()  # type: ignore
             except AttributeError:
                 pass
-            self._features = {}
             try:
                 feat_response = _ftp.sendcmd("FEAT")
             except error_perm:  # pragma: no cover
+                self._features = {}
                 self.encoding = "latin-1"
             else:
+                # Assign at once, other threads may read the features concurrently
                 self._features = self._parse_features(feat_response)
                 self.encoding = "utf-8" if "UTF8" in self._features else "latin-1"
                 if not PY2:
@@ -605,12 +1232,68 @@ class FTPFS(FS):
                     )
         _ftp.encoding = self.encoding
         self._welcome = _ftp.welcome
+        self._observers.connection("open", time.perf_counter() - start)
         return _ftp
 
+    def warm_up(self, connections=None):
+        # type: (Optional[int]) -> Future[int]
+        """Open connections of the pool concurrently, in the background.
+
+        Connections are otherwise opened on demand, so, the first
+        operations pay for the DNS lookup, the TCP and TLS handshakes,
+        the login and the ``FEAT`` command.
+
+        Arguments:
+            connections (int, optional): Number of idle connections the
+                pool should keep, at most ``pool_size`` (the default).
+                Only the missing ones are opened.
+
+        Returns:
+            concurrent.futures.Future: Completes once the connections
+            are open, with the number of connections opened. It fails
+            with `fs.errors.RemoteConnectionError` if none could be
+            opened.
+
+        """
+        pool = self._pool
+        count = min(connections or pool.max_size, pool.max_size) - pool.idle_count
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ftpfs-warm-up")
+        future = self._warm_up = executor.submit(self._open_connections, max(count, 0))
+        executor.shutdown(wait=False)
+        return future
+
+    def _open_connections(self, count):
+        # type: (int) -> int
+        """Open ``count`` connections concurrently, and add them to the pool."""
+        if count <= 0:
+            return 0
+        opened = 0
+        error = None  # type: Optional[errors.FSError]
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self._open_ftp) for _ in range(count)]
+            for future in as_completed(futures):
+                try:
+                    ftp = future.result()
+                except errors.FSError as _error:
+                    log.info(f"[warm_up] Could not open a connection: {_error}")
+                    error = _error
+                    continue
+                if self._pool.add(ftp):
+                    opened += 1
+        if not opened and error is not None:
+            raise error
+        return opened
+
+    @property
+    def ready(self):
+        # type: () -> bool
+        """bool: `False` while the connections of the pool are opened by
+        `warm_up`, e.g. to hold health checks until then.
+        """
+        return self._warm_up is None or self._warm_up.done()
+
     def _close_ftp(self):
-        if self._ftp is not None:
-            self._ftp.quit()
-            self._ftp = None
+        self._pool.close()
 
     @property
     def ftp_url(self):
@@ -643,22 +1326,187 @@ class FTPFS(FS):
     def features(self):  # noqa: D401
         # type: () -> Dict[Text, Text]
         """`dict`: Features of the remote FTP server."""
-        with get_ftp_connection(self, op='get_features'):
-            return self._features
+        if self._welcome is None:
+            # Features are parsed when the first connection is opened
+            with get_ftp_connection(self, op='get_features'):
+                pass
+        return self._features
+
+    def _invalidate_cache(self, path, subtree=False):
+        # type: (Text, bool) -> None
+        """Forget cached listings affected by a change of ``path``."""
+        if self._cache is not None:
+            self._cache.invalidate(abspath(normpath(path)), subtree=subtree)
+
+    def _iter_listing(self, cmd, path, op):
+        # type: (Text, Text, Text) -> Iterator[Text]
+        """Send a listing command and yield the lines as they are received.
+
+        The listing uses the connection already leased by the thread, if
+        any, otherwise a connection of its own, so, the filesystem can be
+        used while the lines are consumed. The memory use does not depend
+        on the size of the listing. A listing closed before its end closes
+        its data connection, and reads the final reply, so, the control
+        connection can be reused.
+        """
+        pool = self._pool
+        local = pool.local
+        listing = None  # type: Optional[_SharedListing]
+        ftp = getattr(local, "ftp", None)
+        if ftp is not None and getattr(local, "listing", None) is None:
+            listing = local.listing = _SharedListing()
+        else:
+            ftp = None
+        conn = None
+        broken = False
+        try:
+            with convert_ftp_errors(self, path=path, op=op):
+                try:
+                    if ftp is None:
+                        ftp = pool.acquire(self._open_ftp, overflow=True)
+                    _set_type(ftp, "A")
+                    conn = ftp.transfercmd(cmd)
+                    start = time.perf_counter()
+                    received = 0
+                    with conn.makefile("r", encoding=ftp.encoding) as fp:
+                        while True:
+                            line = fp.readline(ftp.maxline + 1)
+                            if len(line) > ftp.maxline:
+                                raise error_proto("got more than %d bytes" % ftp.maxline)
+                            if not line:
+                                break
+                            received += len(line)
+                            if line[-2:] == "\r\n":
+                                line = line[:-2]
+                            elif line[-1:] == "\n":
+                                line = line[:-1]
+                            yield line
+                    if isinstance(conn, ssl.SSLSocket):
+                        conn.unwrap()
+                    conn.close()
+                    conn = None
+                    ftp.voidresp()
+                except _BROKEN_CONNECTION_ERRORS:
+                    broken = True
+                    raise
+                self._observers.transfer("list", received, time.perf_counter() - start)
+        except errors.RemoteConnectionError:
+            broken = True
+            raise
+        finally:
+            if conn is not None:
+                # Abandoned by the caller, or interrupted
+                self._abandon_transfer(conn, op)
+                if not broken:
+                    broken = not self._read_abandoned_reply(ftp, op)
+            if listing is not None:
+                # The listing may be closed by another thread, e.g. the
+                # garbage collector, once the lease of its thread ended
+                if getattr(local, "listing", None) is listing:
+                    local.listing = None
+                    if broken:
+                        local.broken = True
+                if listing.finish():
+                    pool.release(ftp, discard=broken or listing.discard)
+            elif ftp is not None:
+                pool.release(ftp, discard=broken)
+
+    @staticmethod
+    def _abandon_transfer(conn, op):
+        # type: (socket.socket, Text) -> None
+        """Close the data connection of a transfer before its end."""
+        with ignore_network_errors(op):
+            # Fails if data was received but not read, which is expected
+            if isinstance(conn, ssl.SSLSocket):
+                conn = conn.unwrap()
+        with ignore_network_errors(op):
+            conn.close()
+
+    @staticmethod
+    def _read_abandoned_reply(ftp, op):
+        # type: (FTP, Text) -> bool
+        """Read the final reply of an abandoned transfer.
+
+        Returns:
+            bool: `True` if the control connection is in sync again.
+
+        """
+        try:
+            ftp.voidresp()
+        except (error_temp, error_perm) as error:
+            # e.g. "426 Connection closed; transfer aborted."
+            log.info(f"[{op}] Transfer abandoned: {error}")
+        except (OSError, EOFError, ftplib.Error) as error:
+            log.info(f"[{op}] Unexpected network error (ignoring): {error}")
+            return False
+        return True
+
+    def _stat_dir(self, path):
+        # type: (Text) -> Optional[List[Text]]
+        """List a directory over the control connection with ``STAT``.
+
+        Returns:
+            list: the lines of the listing, or `None` if the server may
+            not support listings with ``STAT``.
+
+        """
+        _path = abspath(normpath(path))
+        with get_ftp_connection(self, path, op="STAT") as ftp:
+            try:
+                reply = ftp.sendcmd("STAT " + _path)
+            except error_perm:
+                if self._list_stat:
+                    raise
+                # Either the path does not exist, or the command is not
+                # supported: LIST will tell
+                return None
+        # e.g. '213-Status of "/pub":' followed by the listing, and a
+        # final '213 End of status.' line
+        lines = reply.splitlines()
+        if reply[:3] not in ("211", "212", "213") or len(lines) < 2:
+            return None
+        # Lines of a multi-line reply may be indented by the server
+        return [line.lstrip() for line in lines[1:-1]]
+
+    def _iter_dir(self, path):
+        # type: (Text) -> Iterator[Info]
+        """Stream a directory listing with the LIST command (or STAT)."""
+        _path = abspath(normpath(path))
+        check_stat = False
+        if self.stat_listing and self._list_stat is not False:
+            lines = self._stat_dir(_path)
+            if lines is not None:
+                infos = [
+                    Info(raw_info)
+                    for raw_info in ftp_parse.iter_parse(lines)
+                    if raw_info["basic"]["name"] not in (".", "..")
+                ]
+                if infos or self._list_stat:
+                    self._list_stat = True
+                    for info in infos:
+                        yield info
+                    return
+            # The directory may be empty, or STAT not supported
+            check_stat = True
+
+        lines = self._iter_listing("LIST " + _path, path, op="LIST")
+        for raw_info in ftp_parse.iter_parse(lines):
+            if check_stat:
+                # STAT did not list a directory which is not empty
+                self._list_stat = check_stat = False
+            yield Info(raw_info)
 
     def _read_dir(self, path):
         # type: (Text) -> Dict[Text, Info]
         _path = abspath(normpath(path))
-        lines = []  # type: List[Union[ByteString, Text]]
-        with get_ftp_connection(self, path=path, op='LIST') as ftp:
-            ftp.retrlines(
-                "LIST " + _path, lines.append
-            )
-        lines = [
-            line.decode("utf-8") if isinstance(line, bytes) else line for line in lines
-        ]
-        _list = [Info(raw_info) for raw_info in ftp_parse.parse(lines)]
-        dir_listing = OrderedDict({info.name: info for info in _list})
+        if self._cache is not None:
+            cached_listing = self._cache.get(_path)
+            if cached_listing is not None:
+                return cached_listing
+            token = self._cache.token()
+        dir_listing = OrderedDict((info.name, info) for info in self._iter_dir(_path))
+        if self._cache is not None:
+            self._cache.set(_path, dir_listing, token)
         return dir_listing
 
     @property
@@ -678,10 +1526,11 @@ class FTPFS(FS):
         _path = self.validatepath(path)
         with get_ftp_connection(self, path, op='STOR') as ftp:
             if wipe or not self.isfile(path):
-                empty_file = io.BytesIO()
-                ftp.storbinary(
-                    "STOR " + _path, empty_file
-                )
+                try:
+                    # An empty upload
+                    self._transfer(ftp, "STOR " + _path, lambda conn: None)
+                finally:
+                    self._invalidate_cache(_path)
                 return True
         return False
 
@@ -768,6 +1617,14 @@ class FTPFS(FS):
                 }
             )
 
+        dir_name, file_name = split(_path)
+        if self._cache is not None:
+            cached_listing = self._cache.get(dir_name)
+            if cached_listing is not None:
+                if file_name not in cached_listing:
+                    raise errors.ResourceNotFound(path)
+                return cached_listing[file_name]
+
         if self.supports_mlst:
             with get_ftp_connection(self, path=path, op="MLST") as ftp:
                 response = ftp.sendcmd(
@@ -777,21 +1634,88 @@ class FTPFS(FS):
             for raw_info in self._parse_mlsx(lines):
                 return Info(raw_info)
 
-        dir_name, file_name = split(_path)
-        directory = self._read_dir(dir_name)
-        if file_name not in directory:
+        if self.getinfo_strategy == "commands" and _COMMAND_NAMESPACES.issuperset(
+            namespaces
+        ):
+            info = self._getinfo_commands(path, namespaces)
+            if info is not None:
+                return info
+
+        if self._cache is not None:
+            directory = self._read_dir(dir_name)
+            if file_name not in directory:
+                raise errors.ResourceNotFound(path)
+            return directory[file_name]
+
+        # Scan the listing of the parent without keeping it in memory
+        info = None
+        for _info in self._iter_dir(dir_name):
+            if _info.name == file_name:
+                info = _info
+        if info is None:
             raise errors.ResourceNotFound(path)
-        info = directory[file_name]
         return info
 
+    def _getinfo_commands(self, path, namespaces):
+        # type: (Text, Container[Text]) -> Optional[Info]
+        """Get the information of a resource with ``SIZE``, ``CWD`` and
+        ``MDTM``, or `None` if the server does not support them.
+        """
+        _path = self.validatepath(path)
+        details = "details" in namespaces
+        if details and not self.supports_mdtm:
+            return None
+        with get_ftp_connection(self, path=path, op="getinfo") as ftp:
+            try:
+                # Servers may refuse SIZE in ASCII mode
+                _set_type(ftp, "I")
+                size = ftp.size(_path)
+            except error_perm as error:
+                code = text_type(error)[:3]
+                if code in ("500", "502", "504"):
+                    return None  # SIZE is not supported
+                if code != "550":
+                    raise
+                # Not a file: a directory, or nothing (550, raised as
+                # ResourceNotFound). Commands use absolute paths, so,
+                # changing the working directory is harmless.
+                ftp.cwd(_path)
+                is_dir = True
+                size = 0
+            else:
+                if size is None:
+                    return None
+                is_dir = False
+            modified = None  # type: Optional[int]
+            if details:
+                try:
+                    response = ftp.sendcmd("MDTM " + _path)
+                except error_perm:
+                    # Some servers do not tell the time of directories
+                    if not is_dir:
+                        raise
+                else:
+                    modified = self._parse_ftp_time(response.split()[1])
+
+        raw_info = {
+            "basic": {"name": basename(_path), "is_dir": is_dir}
+        }  # type: Dict[Text, Dict[Text, object]]
+        if details:
+            raw_info["details"] = {
+                "size": size,
+                "type": int(ResourceType.directory if is_dir else ResourceType.file),
+            }
+            if modified is not None:
+                raw_info["details"]["modified"] = modified
+        return Info(raw_info)
+
     def getmeta(self, namespace="standard"):
         # type: (Text) -> Dict[Text, object]
         _meta = {}  # type: Dict[Text, object]
-        with get_ftp_connection(self, op='getmeta') as ftp:
-            if namespace == "standard":
-                _meta = self._meta.copy()
-                _meta["unicode_paths"] = "UTF8" in self.features
-                _meta["supports_mtime"] = "MDTM" in self.features
+        if namespace == "standard":
+            _meta = self._meta.copy()
+            _meta["unicode_paths"] = "UTF8" in self.features
+            _meta["supports_mtime"] = "MDTM" in self.features
         return _meta
 
     def getmodified(self, path):
@@ -808,8 +1732,7 @@ class FTPFS(FS):
     def listdir(self, path):
         # type: (Text) -> List[Text]
         _path = self.validatepath(path)
-        with self._lock:
-            dir_list = [info.name for info in self.scandir(_path)]
+        dir_list = [info.name for info in self.scandir(_path)]
         return dir_list
 
     def makedir(
@@ -832,6 +1755,8 @@ class FTPFS(FS):
                 try:
                     ftp.mkd(_path)
                 except error_perm as error:
+                    # Make sure the checks below are not answered from a stale cache
+                    self._invalidate_cache(_path)
                     code, _ = _parse_ftp_error(error)
                     if code == "550":
                         if self.isdir(path):
@@ -840,39 +1765,125 @@ class FTPFS(FS):
                             if self.exists(path):
                                 raise errors.DirectoryExists(path)
                     raise errors.ResourceNotFound(path)
+                self._invalidate_cache(_path)
         return self.opendir(path)
 
     def openbin(self, path, mode="r", buffering=-1, **options):
         # type: (Text, Text, int, **Any) -> BinaryIO
+        """Open a binary file-like object.
+
+        Arguments:
+            path (str): A path on the filesystem.
+            mode (str): Mode to open file (must be a valid non-text mode,
+                defaults to *r*).
+            buffering (int): Buffering policy (ignored).
+            **options: ``prefetch`` (int): if positive, a helper thread
+                keeps up to this number of bytes of the file buffered
+                ahead of sequential reads, so, the transfer overlaps with
+                the processing of the data (default 0, i.e. disabled).
+                ``block_cache`` (int): if positive, up to this number of
+                bytes of the file are kept in memory, in blocks of 64 KiB,
+                so, random reads of the same areas of the file do not
+                restart the transfer (default 0, i.e. disabled).
+                ``optimistic`` (bool): if `True`, the transfer is started
+                at once, without checking first that the file (or its
+                parent directory) exists, and the reply of the server is
+                turned into the same errors. This saves round trips when
+                the file can be opened, at the cost of more round trips
+                when it cannot. The existence of the file is still checked
+                in exclusive mode (``x``). Defaults to the
+                ``optimistic_open`` argument of the filesystem.
+
+        """
         _mode = Mode(mode)
         _mode.validate_bin()
         _path = self.validatepath(path)
 
-        with self._lock:
+        optimistic = options.get("optimistic")
+        if optimistic is None:
+            optimistic = self.optimistic_open
+        if optimistic and not _mode.exclusive:
+            return self._openbin_optimistic(path, _path, _mode, options)  # type: ignore
+
+        try:
+            info = self.getinfo(_path)
+        except errors.ResourceNotFound:
+            if _mode.reading:
+                raise errors.ResourceNotFound(path)
+            if _mode.writing and not self.isdir(dirname(_path)):
+                raise errors.ResourceNotFound(path)
+        else:
+            if info.is_dir:
+                raise errors.FileExpected(path)
+            if _mode.exclusive:
+                raise errors.FileExists(path)
+        ftp_file = FTPFile(
+            self,
+            _path,
+            _mode.to_platform_bin(),
+            prefetch=options.get("prefetch", 0),
+            block_cache=options.get("block_cache", 0),
+        )
+        return ftp_file  # type: ignore
+
+    def _openbin_optimistic(self, path, _path, _mode, options):
+        # type: (Text, Text, Mode, Dict[Text, Any]) -> FTPFile
+        """Open a file, and start its transfer to find out whether it can
+        be opened.
+        """
+        ftp_file = FTPFile(
+            self,
+            _path,
+            _mode.to_platform_bin(),
+            prefetch=options.get("prefetch", 0),
+            block_cache=options.get("block_cache", 0),
+        )
+        reply = None  # type: Optional[error_perm]
+        try:
+            op = "open_read_conn" if _mode.reading else "open_write_conn"
+            with ftp_file._convert_errors(op=op):
+                try:
+                    if _mode.reading:
+                        ftp_file._start_read()
+                    else:
+                        ftp_file._start_write()
+                except error_perm as error:
+                    reply = error
+                    raise
+        except (errors.ResourceNotFound, errors.PermissionDenied):
+            # Servers reply 550 (or 553 for STOR) whether the path is a
+            # directory, the file or its directory does not exist, or the
+            # file cannot be accessed, so, the path is looked up once
+            ftp_file.close()
             try:
-                info = self.getinfo(_path)
+                info = self.getinfo(_path)  # type: Optional[Info]
             except errors.ResourceNotFound:
-                if _mode.reading:
-                    raise errors.ResourceNotFound(path)
-                if _mode.writing and not self.isdir(dirname(_path)):
-                    raise errors.ResourceNotFound(path)
-            else:
-                if info.is_dir:
-                    raise errors.FileExpected(path)
-                if _mode.exclusive:
-                    raise errors.FileExists(path)
-            ftp_file = FTPFile(self, _path, _mode.to_platform_bin())
-        return ftp_file  # type: ignore
+                info = None
+            if info is not None and info.is_dir:
+                raise errors.FileExpected(path)
+            if info is None and (_mode.reading or not self.isdir(dirname(_path))):
+                raise errors.ResourceNotFound(path)
+            # The file (or the directory it is created in) exists
+            raise errors.PermissionDenied(
+                path=path,
+                msg=_parse_ftp_error(reply)[1] if reply is not None else None,
+            )
+        except BaseException:
+            ftp_file.close()
+            raise
+        return ftp_file
 
     def remove(self, path):
         # type: (Text) -> None
         self.check()
         _path = self.validatepath(path)
-        with self._lock:
-            if self.isdir(path):
-                raise errors.FileExpected(path=path)
-            with get_ftp_connection(self, path, op="DELE") as ftp:
+        if self.isdir(path):
+            raise errors.FileExpected(path=path)
+        with get_ftp_connection(self, path, op="DELE") as ftp:
+            try:
                 ftp.delete(_path)
+            finally:
+                self._invalidate_cache(_path)
 
     def removedir(self, path):
         # type: (Text) -> None
@@ -884,6 +1895,7 @@ class FTPFS(FS):
             try:
                 ftp.rmd(_path)
             except error_perm as error:
+                self._invalidate_cache(_path, subtree=True)
                 code, _ = _parse_ftp_error(error)
                 if code == "550":
                     if self.isfile(path):
@@ -891,29 +1903,44 @@ class FTPFS(FS):
                     if not self.isempty(path):
                         raise errors.DirectoryNotEmpty(path)
                 raise  # pragma: no cover
+            self._invalidate_cache(_path, subtree=True)
 
     def _scandir(self, path, namespaces=None):
         # type: (Text, Optional[Container[Text]]) -> Iterator[Info]
         _path = self.validatepath(path)
-        with self._lock:
-            if self.supports_mlst:
-                lines = []
-                with get_ftp_connection(self, path=path, op="MLSD") as ftp:
-                    try:
-                        ftp.retrlines(
-                            "MLSD " + _path,
-                            lambda l: lines.append(l),
-                        )
-                    except error_perm:
-                        if not self.getinfo(path).is_dir:
-                            raise errors.DirectoryExpected(path)
-                        raise  # pragma: no cover
-                if lines:
-                    for raw_info in self._parse_mlsx(lines):
-                        yield Info(raw_info)
-                    return
-            for info in self._read_dir(_path).values():
-                yield info
+        cache = self._cache
+        if cache is not None:
+            cached_listing = cache.get(_path)
+            if cached_listing is not None:
+                for info in cached_listing.values():
+                    yield info
+                return
+            token = cache.token()
+            dir_listing = OrderedDict()  # type: Dict[Text, Info]
+
+        iter_info = None  # type: Optional[Iterator[Info]]
+        if self.supports_mlst:
+            lines = self._iter_listing("MLSD " + _path, path, op="MLSD")
+            try:
+                first_line = next(lines, None)
+            except (errors.ResourceNotFound, errors.PermissionDenied):
+                if not self.getinfo(path).is_dir:
+                    raise errors.DirectoryExpected(path)
+                raise  # pragma: no cover
+            if first_line is not None:
+                iter_info = (
+                    Info(raw_info)
+                    for raw_info in self._parse_mlsx(itertools.chain([first_line], lines))
+                )
+        if iter_info is None:
+            iter_info = self._iter_dir(_path)
+
+        for info in iter_info:
+            if cache is not None:
+                dir_listing[info.name] = info
+            yield info
+        if cache is not None:
+            cache.set(_path, dir_listing, token)
 
     def scandir(
         self,
@@ -930,13 +1957,323 @@ class FTPFS(FS):
             iter_info = itertools.islice(iter_info, start, end)
         return iter_info
 
-    def upload(self, path, file, chunk_size=None, **options):
-        # type: (Text, BinaryIO, Optional[int], **Any) -> None
+    @classmethod
+    def _resolve_section(cls, root, header):
+        # type: (Text, Optional[Text]) -> Optional[Text]
+        """Get the directory of a section of a recursive listing of
+        ``root``, or `None` if it is outside of ``root``.
+        """
+        if header is None:
+            return root
+        # Headers are usually absolute, or relative to the listed
+        # directory (e.g. "./2024/01")
+        dir_path = normpath(header) if header.startswith("/") else join(root, header)
+        return dir_path if isbase(root, dir_path) else None
+
+    def _walk_tree(self, path):
+        # type: (Text) -> Iterator[Tuple[Text, Optional[Info]]]
+        """Walk a directory tree without a recursive listing."""
+        return self.walker_class()._iter_walk(self, path)
+
+    def _scan_tree(self, path):
+        # type: (Text) -> Iterator[Tuple[Text, Optional[Info]]]
+        """Stream the resources of a directory tree.
+
+        Yields ``(dir_path, info)`` tuples, then a ``(dir_path, None)``
+        tuple once all the resources of a directory were yielded. The
+        tree is listed with a single ``LIST -R`` command when the server
+        supports it, otherwise each directory is listed in turn.
+        """
         _path = self.validatepath(path)
+        if self._list_recursive is False:
+            for step in self._walk_tree(_path):
+                yield step
+            return
+
+        cache = self._cache
+        if cache is not None:
+            token = cache.token()
+            dir_listing = OrderedDict()  # type: Dict[Text, Info]
+
+        lines = self._iter_listing("LIST -R " + _path, path, op="LIST")
+        try:
+            first_line = next(lines, None)
+        except (errors.ResourceNotFound, errors.PermissionDenied):
+            # Some servers take the option for a part of the path
+            if not self.getinfo(path).is_dir:
+                raise errors.DirectoryExpected(path)
+            if self._list_recursive:
+                raise
+            self._list_recursive = False
+            first_line = None
+        if first_line is None:
+            if self._list_recursive:
+                yield _path, None  # An empty directory
+            else:
+                # Either an empty directory, or the option was refused
+                for step in self._walk_tree(_path):
+                    yield step
+            return
+
+        dir_path = _path  # type: Optional[Text]
+        recursive = False
+        root_has_dirs = False
+        for header, raw_info in ftp_parse.iter_parse_recursive(
+            itertools.chain([first_line], lines)
+        ):
+            if raw_info is None:
+                section = self._resolve_section(_path, header)
+                if section == dir_path:
+                    continue  # The header of the first section
+                if dir_path is not None:
+                    if cache is not None:
+                        cache.set(dir_path, dir_listing, token)
+                        dir_listing = OrderedDict()
+                    yield dir_path, None  # End of directory
+                dir_path = section
+                recursive = True
+                continue
+            if dir_path is None:
+                continue
+            info = Info(raw_info)
+            if info.name in (".", ".."):
+                continue
+            if info.is_dir:
+                root_has_dirs = True
+            if cache is not None:
+                dir_listing[info.name] = info
+            yield dir_path, info
+        if dir_path is not None:
+            if cache is not None:
+                cache.set(dir_path, dir_listing, token)
+            yield dir_path, None
+
+        if recursive:
+            self._list_recursive = True
+        elif root_has_dirs:
+            # The server ignored the option, and listed the top directory only
+            self._list_recursive = False
+            for dir_path, info in self._walk_tree(_path):
+                if dir_path != _path:
+                    yield dir_path, info
+
+    def scandir_recursive(self, path, namespaces=None):
+        # type: (Text, Optional[Container[Text]]) -> Iterator[Tuple[Text, Info]]
+        """Get the resources of a directory tree.
+
+        When the server supports it (like vsftpd and ProFTPD), the whole
+        tree is listed with a single ``LIST -R`` command, and the resources
+        are yielded while the listing is received. Otherwise, the
+        directories are listed one by one with `scandir`. The support is
+        detected on the first call.
+
+        Arguments:
+            path (str): A path to a directory on the filesystem.
+            namespaces (list, optional): A list of namespaces to include
+                in the resource information. Recursive listings provide
+                the namespaces of ``LIST`` (``basic``, ``details`` and
+                ``access``) only.
+
+        Yields:
+            (str, Info): The path of the directory containing a resource,
+            and the information of that resource.
+
+        Raises:
+            fs.errors.DirectoryExpected: If ``path`` is not a directory.
+            fs.errors.ResourceNotFound: If ``path`` does not exist.
+
+        """
+        for dir_path, info in self._scan_tree(path):
+            if info is not None:
+                yield dir_path, info
+
+    def _transfer(self, ftp, cmd, copy_data):
+        # type: (FTP, Text, Callable[[socket.socket], None]) -> None
+        """Run a binary transfer on a leased connection.
+
+        ``copy_data`` is called with the data connection.
+        """
+        _set_type(ftp, "I")
+        conn = ftp.transfercmd(cmd)
+        try:
+            with conn:
+                copy_data(conn)
+                if isinstance(conn, ssl.SSLSocket):
+                    conn.unwrap()
+        except BaseException:
+            # The final reply to the transfer command is still pending,
+            # so, the control connection cannot be reused
+            self._pool.local.broken = True
+            raise
+        ftp.voidresp()
+
+    def _transfer_stats(self, direction, meter):
+        # type: (Text, TransferMeter) -> TransferStats
+        """Get the statistics of a completed transfer, and report them."""
+        stats = meter.stats()
+        self._observers.transfer(direction, stats.bytes_transferred, stats.elapsed)
+        return stats
+
+    def download(
+        self,
+        path,  # type: Text
+        file,  # type: BinaryIO
+        chunk_size=None,  # type: Optional[int]
+        segments=1,  # type: int
+        retries=2,  # type: int
+        callback=None,  # type: Optional[Callable[[int], object]]
+        **options  # type: Any
+    ):
+        # type: (...) -> TransferStats
+        """Copy a file from the filesystem to a file-like object.
+
+        Data is received straight from the data connection into a single
+        buffer of ``chunk_size`` bytes, which is written to ``file``. `io`
+        file objects are given views of the buffer, so, like the `io`
+        classes, they must copy the data they keep. Other file-like objects
+        are given a copy.
+
+        With ``segments`` greater than 1, the file is split into byte
+        ranges which are fetched concurrently, each over its own
+        connection (``REST`` + ``RETR``), and written at their offset in
+        ``file``. On high-latency links, where a single TCP stream is
+        limited by its window size, this multiplies the throughput.
+
+        Arguments:
+            path (str): Path to a resource.
+            file (file-like): A file-like object open for writing in
+                binary mode. It must be seekable for a segmented download,
+                otherwise the file is downloaded sequentially.
+            chunk_size (int, optional): Number of bytes to read at a
+                time, or `None` to use sensible default (1 MiB).
+            segments (int): Maximum number of byte ranges fetched at the
+                same time (default 1, i.e. a sequential download). Small
+                files are split in fewer segments of at least 1 MiB.
+            retries (int): Number of times a segment is resumed after a
+                connection error (default 2).
+            callback (callable, optional): Called with the total number
+                of bytes received so far, each time a chunk is received.
+
+        Returns:
+            TransferStats: the number of bytes received, the duration and
+            the throughput of the transfer.
+
+        Raises:
+            fs.errors.ResourceNotFound: if ``path`` does not exist.
+            fs.errors.FileExpected: if ``path`` is a directory.
+
+        """
+        _path = self.validatepath(path)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        meter = TransferMeter(callback)
+        seekable = getattr(file, "seekable", None)
+        if segments > 1 and seekable is not None and seekable():
+            info = self.getinfo(_path, namespaces=["details"])
+            if info.is_dir:
+                raise errors.FileExpected(path)
+            segments = min(segments, info.size // _MIN_SEGMENT_SIZE)
+            if segments > 1:
+                self._download_segments(
+                    _path, file, info.size, chunk_size, segments, retries, meter
+                )
+                return self._transfer_stats("download", meter)
+
+        with get_ftp_connection(self, path, op="RETR") as ftp:
+            try:
+                self._transfer(
+                    ftp,
+                    "RETR " + _path,
+                    lambda conn: receive_file(conn, file, chunk_size, meter),
+                )
+            except error_perm as error:
+                code, _ = _parse_ftp_error(error)
+                if code == "550":
+                    if self.isdir(path):
+                        raise errors.FileExpected(path)
+                raise
+        return self._transfer_stats("download", meter)
+
+    def _download_segments(self, path, file, size, chunk_size, segments, retries, meter):
+        # type: (Text, BinaryIO, int, int, int, int, TransferMeter) -> None
+        """Download byte ranges of a file concurrently (see `download`)."""
+        base = file.tell()
+        bounds = [size * index // segments for index in range(segments + 1)]
+        file_lock = threading.Lock()
+        abort = threading.Event()
+
+        def fetch(start, end):
+            # type: (int, int) -> None
+            attempt = 0
+            while True:
+                try:
+                    with FTPFile(self, path, "rb") as ftp_file:
+                        ftp_file.seek(start)
+                        while start < end and not abort.is_set():
+                            data = ftp_file.read(min(chunk_size, end - start))
+                            if not data:
+                                raise errors.ResourceError(
+                                    path, msg="file truncated during download"
+                                )
+                            with file_lock:
+                                file.seek(base + start)
+                                write_all(file, data)
+                            start += len(data)
+                            meter.update(len(data))
+                    return
+                except (IOError, errors.RemoteConnectionError) as error:
+                    attempt += 1
+                    if attempt > retries or abort.is_set():
+                        raise
+                    log.info(f"[download] Resuming segment at {start} after error: {error}")
+
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [
+                executor.submit(fetch, start, end)
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Stop the other segments early
+                abort.set()
+                raise
+        file.seek(base + size)
+
+    def upload(self, path, file, chunk_size=None, callback=None, **options):
+        # type: (Text, BinaryIO, Optional[int], Optional[Callable[[int], object]], **Any) -> TransferStats
+        """Set a file to the contents of a binary file object.
+
+        Data is read from ``file`` into a single buffer of ``chunk_size``
+        bytes, which is sent straight to the data connection.
+
+        Arguments:
+            path (str): A path on the filesystem.
+            file (io.IOBase): A file object open for reading in
+                binary mode.
+            chunk_size (int, optional): Number of bytes to read at a
+                time, or `None` to use sensible default (1 MiB).
+            callback (callable, optional): Called with the total number
+                of bytes sent so far, each time a chunk is sent.
+
+        Returns:
+            TransferStats: the number of bytes sent, the duration and the
+            throughput of the transfer.
+
+        """
+        _path = self.validatepath(path)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        meter = TransferMeter(callback)
         with get_ftp_connection(self, path, op="STOR") as ftp:
-            ftp.storbinary(
-                "STOR " + _path, file
-            )
+            try:
+                self._transfer(
+                    ftp,
+                    "STOR " + _path,
+                    lambda conn: send_file(conn, file, chunk_size, meter),
+                )
+            finally:
+                self._invalidate_cache(_path)
+        return self._transfer_stats("upload", meter)
 
     def writebytes(self, path, contents):
         # type: (Text, ByteString) -> None
@@ -969,28 +2306,17 @@ class FTPFS(FS):
                     ftp.sendcmd(cmd)
                 except error_perm:
                     pass
+                finally:
+                    self._invalidate_cache(path)
         else:
             if not self.exists(path):
                 raise errors.ResourceNotFound(path)
 
     def readbytes(self, path):
         # type: (Text) -> bytes
-        _path = self.validatepath(path)
         data = io.BytesIO()
-        with get_ftp_connection(self, path, op="RETR") as ftp:
-            try:
-                ftp.retrbinary(
-                    "RETR " + _path, data.write
-                )
-            except error_perm as error:
-                code, _ = _parse_ftp_error(error)
-                if code == "550":
-                    if self.isdir(path):
-                        raise errors.FileExpected(path)
-                raise
-
-        data_bytes = data.getvalue()
-        return data_bytes
+        self.download(path, data)
+        return data.getvalue()
 
     def move(self, src_path, dst_path, overwrite=False, preserve_time=False):
         """Move a file from ``src_path`` to ``dst_path``.
@@ -1018,7 +2344,11 @@ class FTPFS(FS):
 
         with get_ftp_connection(self, src_path, op='rename {} -> {}'.format(src_path, dst_path)) as ftp:
             try:
-                ftp.rename(src_path, dst_path)
+                try:
+                    ftp.rename(src_path, dst_path)
+                finally:
+                    self._invalidate_cache(src_path, subtree=True)
+                    self._invalidate_cache(dst_path, subtree=True)
             except error_perm:
                 if overwrite or not self.exists(dst_path):
                     # Fallback to copy/delete
@@ -1028,6 +2358,218 @@ class FTPFS(FS):
                 else:
                     raise
 
+    def copy_to(self, other, src_path, dst_path, overwrite=False):
+        # type: (FS, Text, Text, bool) -> None
+        """Copy a file to another filesystem.
+
+        If ``other`` is an `FTPFS` too, the servers are asked to transfer
+        the file directly between themselves (FXP): the destination server
+        listens for a data connection (``PASV``), and the source server
+        connects to it (``PORT``). Data does not go through this client.
+        If FXP is not possible, e.g. with TLS or if the servers refuse it,
+        the file is piped through this client instead.
+
+        Arguments:
+            other (FS): The destination filesystem, possibly ``self``.
+            src_path (str): Path to a file on this filesystem.
+            dst_path (str): Path to the copy on ``other``.
+            overwrite (bool): If `True`, overwrite the destination file
+                if it exists (default `False`).
+
+        Raises:
+            fs.errors.DestinationExists: If ``dst_path`` exists,
+                and ``overwrite`` is `False`.
+            fs.errors.ResourceNotFound: If ``src_path`` or the parent
+                directory of ``dst_path`` does not exist.
+            fs.errors.FileExpected: If ``src_path`` is not a file.
+
+        """
+        _src_path = self.validatepath(src_path)
+        _dst_path = other.validatepath(dst_path)
+        if not overwrite and other.exists(_dst_path):
+            raise errors.DestinationExists(dst_path)
+        if self.getinfo(_src_path).is_dir:
+            raise errors.FileExpected(src_path)
+        if not other.isdir(dirname(_dst_path)):
+            raise errors.ResourceNotFound(dst_path)
+
+        if isinstance(other, FTPFS) and self._fxp_copy(other, _src_path, _dst_path):
+            return
+        with self.openbin(_src_path) as read_file:
+            other.upload(_dst_path, read_file)
+
+    def _fxp_copy(self, other, src_path, dst_path):
+        # type: (FTPFS, Text, Text) -> bool
+        """Copy a file with a server-to-server transfer.
+
+        Returns:
+            bool: `False` if the transfer was not possible.
+
+        """
+        if self.tls or self.implicit_tls or other.tls or other.implicit_tls:
+            # Protected data connections would need an extension (SSCN)
+            return False
+
+        # Both filesystems may be the same one, so, each side takes its
+        # own lease rather than sharing the one of the current thread
+        src_ftp = dst_ftp = None
+        broken = False
+        try:
+            src_ftp = self._pool.acquire(self._open_ftp, overflow=True)
+            dst_ftp = other._pool.acquire(other._open_ftp, overflow=True)
+            if src_ftp.af != socket.AF_INET or dst_ftp.af != socket.AF_INET:
+                # PASV and PORT support IPv4 only
+                return False
+            try:
+                _set_type(src_ftp, "I")
+                _set_type(dst_ftp, "I")
+                host, port = ftplib.parse227(dst_ftp.sendcmd(str("PASV")))
+                if not getattr(dst_ftp, "trust_server_pasv_ipv4_address", False):
+                    host = dst_ftp.sock.getpeername()[0]
+                src_ftp.sendport(host, port)
+            except (ftplib.Error, OSError, EOFError) as error:
+                broken = not isinstance(error, (error_perm, error_temp))
+                log.info(f"[fxp] Server-to-server transfer refused: {error}")
+                return False
+
+            # Until both transfers complete, the connections may be out of sync
+            broken = True
+            try:
+                dst_ftp.putcmd("STOR " + dst_path)
+                # Make sure the destination expects the data before the source
+                # sends it. Some servers only reply once the source connected.
+                response = None
+                if select.select([dst_ftp.sock], [], [], _FXP_STOR_WAIT)[0]:
+                    response = dst_ftp.getresp()
+                src_ftp.sendcmd("RETR " + src_path)
+                if response is None:
+                    response = dst_ftp.getresp()
+                if response[:1] != "1":
+                    raise error_reply(response)
+                src_ftp.voidresp()
+                dst_ftp.voidresp()
+            except (ftplib.Error, OSError, EOFError) as error:
+                log.info(f"[fxp] Server-to-server transfer failed: {error}")
+                return False
+            finally:
+                other._invalidate_cache(dst_path)
+            broken = False
+            return True
+
+        except errors.RemoteConnectionError as error:
+            log.info(f"[fxp] Could not connect: {error}")
+            return False
+
+        finally:
+            if src_ftp is not None:
+                self._pool.release(src_ftp, discard=broken)
+            if dst_ftp is not None:
+                other._pool.release(dst_ftp, discard=broken)
+
+    def hash(self, path, name):
+        # type: (Text, Text) -> Text
+        """Get the hash of a file's contents.
+
+        If the server advertises a command to compute the hash (``HASH``,
+        or one of the older ``XMD5``, ``XSHA1``, ``XSHA256``, ``XSHA512``
+        and ``XCRC`` commands), the hash is computed by the server, and
+        the file is not transferred. Otherwise, or if the server fails to
+        compute it, the file is downloaded and hashed locally.
+
+        Arguments:
+            path (str): A path on the filesystem.
+            name (str): One of the algorithms supported by the `hashlib`
+                module, e.g. ``"md5"`` or ``"sha256"``, or ``"crc32"``.
+
+        Returns:
+            str: The hex digest of the hash.
+
+        Raises:
+            fs.errors.UnsupportedHash: If the requested hash is not supported.
+            fs.errors.ResourceNotFound: If ``path`` does not exist.
+            fs.errors.FileExpected: If ``path`` exists but is not a file.
+
+        """
+        _path = self.validatepath(path)
+        hash_object = new_hash(name)
+        command = hash_commands(name, self.features)
+        if command is not None:
+            digest = self._remote_hash(_path, name, command)
+            if digest is not None:
+                return digest
+        self.download(_path, HashWriter(hash_object))
+        return hash_object.hexdigest()
+
+    def _remote_hash(self, path, name, command):
+        # type: (Text, Text, Text) -> Optional[Text]
+        """Get the hash of a file computed by the server.
+
+        Returns:
+            str: The hex digest, or `None` if the server could not
+            compute it.
+
+        """
+        with get_ftp_connection(self, path, op=command.split(" ")[0]) as ftp:
+            try:
+                if command.startswith("HASH "):
+                    # The algorithm is a setting of the control connection
+                    algorithm = command[5:]
+                    selected = getattr(ftp, "_hash_algorithm", None)
+                    if selected is None:
+                        selected = default_hash_algorithm(self.features)
+                    if selected != algorithm:
+                        ftp.sendcmd(str("OPTS HASH ") + algorithm)
+                        ftp._hash_algorithm = algorithm  # type: ignore
+                    reply = ftp.sendcmd(str("HASH ") + path)
+                else:
+                    reply = ftp.sendcmd(str(command) + " " + path)
+            except error_perm as error:
+                code, _ = _parse_ftp_error(error)
+                if code == "550":
+                    if self.isdir(path):
+                        raise errors.FileExpected(path)
+                elif code in ("500", "502", "504"):
+                    log.info(f"[hash] {command} is not supported: {error}")
+                    return None
+                raise
+        digest = parse_hash_reply(name, reply, command, path)
+        if digest is None:
+            log.info(f"[hash] Unexpected reply to {command}: {reply}")
+        return digest
+
+    def hash_many(self, paths, name, workers=None):
+        # type: (Iterable[Text], Text, Optional[int]) -> Dict[Text, Text]
+        """Get the hashes of several files.
+
+        The files are hashed concurrently (see `hash`), each thread using
+        its own connection.
+
+        Arguments:
+            paths (iterable): Paths to files on the filesystem.
+            name (str): The hash algorithm (see `hash`).
+            workers (int, optional): Maximum number of files hashed at the
+                same time, or `None` to use the size of the connection
+                pool.
+
+        Returns:
+            dict: A mapping of each path to the hex digest of its hash,
+            in the order of ``paths``.
+
+        Raises:
+            fs.errors.UnsupportedHash: If the requested hash is not supported.
+            fs.errors.ResourceNotFound: If a path does not exist.
+            fs.errors.FileExpected: If a path exists but is not a file.
+
+        """
+        paths = list(paths)
+        new_hash(name)
+        workers = min(workers or self._pool.max_size, len(paths))
+        if workers <= 1:
+            return OrderedDict((path, self.hash(path, name)) for path in paths)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = executor.map(lambda path: self.hash(path, name), paths)
+            return OrderedDict(zip(paths, digests))
+
     def close(self):
         # type: () -> None
         if not self.isclosed():
@@ -31,6 +31,13 @@ def asbool(val):
     return val.lower() in ['true', '1', 't', 'y', 'yes', 'on']
 
 
+def asfloat(val):
+    if val is None:
+        return None
+
+    return float(val)
+
+
 class FTPOpener(Opener):
     """`FTPFS` opener."""
 
@@ -61,6 +68,16 @@ class FTPOpener(Opener):
             timeout=int(parse_result.params.get("timeout", "10")),
             tls=bool(parse_result.protocol == "mftps"),
             implicit_tls=asbool(parse_result.params.get("implicit_tls")),
+            pool_size=int(parse_result.params.get("pool_size", "4")),
+            cache_size=int(parse_result.params.get("cache_size", "0")),
+            cache_ttl=float(parse_result.params.get("cache_ttl", "30")),
+            stat_listing=asbool(parse_result.params.get("stat_listing")),
+            getinfo_strategy=parse_result.params.get("getinfo_strategy", "listing"),
+            optimistic_open=asbool(parse_result.params.get("optimistic_open")),
+            keepalive=asfloat(parse_result.params.get("keepalive")),
+            max_idle=asfloat(parse_result.params.get("max_idle")),
+            max_lifetime=asfloat(parse_result.params.get("max_lifetime")),
+            prewarm=int(parse_result.params.get("prewarm", "0")),
         )
         if dir_path:
             if create:
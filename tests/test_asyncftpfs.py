@@ -0,0 +1,379 @@
+import asyncio
+import gc
+import io
+import os
+import platform
+import shutil
+import socket
+import ssl
+import tempfile
+import time
+import unittest
+import uuid
+
+from pyftpdlib.authorizers import DummyAuthorizer
+from pytest import mark
+
+from fs import errors
+from miarec_ftpfs import AsyncFTPFS
+
+
+@unittest.skipIf(platform.python_implementation() == "PyPy", "ftp unreliable with PyPy")
+class TestAsyncFTPFS(unittest.TestCase):
+    user = "user"
+    pasw = "1234"
+    tls = False
+    implicit_tls = False
+    mlst = True
+
+    @classmethod
+    def startServer(cls, temp_dir):
+        from pyftpdlib.test import ThreadedTestFTPd
+
+        return cls._startServer(ThreadedTestFTPd(), temp_dir)
+
+    @classmethod
+    def _startServer(cls, server, temp_dir):
+        server.handler.authorizer = DummyAuthorizer()
+        server.handler.authorizer.add_user(
+            cls.user, cls.pasw, temp_dir, perm="elradfmwT"
+        )
+        server.shutdown_after = -1
+        server.start()
+
+        # Don't know why this is necessary on Windows
+        if platform.system() == "Windows":
+            time.sleep(0.1)
+
+        if not server.is_alive():
+            raise RuntimeError("could not start FTP server.")
+        return server
+
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = tempfile.mkdtemp("ftpfs2tests")
+        cls.server = cls.startServer(cls._temp_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        cls.server.join(2.0)
+        shutil.rmtree(cls._temp_dir)
+
+    def setUp(self):
+        # Test data is created straight in the directory served
+        self.test_folder = "/" + uuid.uuid4().hex
+        self.local_dir = os.path.join(self._temp_dir, self.test_folder[1:])
+        os.mkdir(self.local_dir)
+        os.mkdir(os.path.join(self.local_dir, "dir"))
+        for name in ("foo", "dir/bar"):
+            with open(os.path.join(self.local_dir, name), "wb") as f:
+                f.write(b"0123456789" * 1000)
+
+    def path(self, name):
+        return self.test_folder + "/" + name
+
+    def local_bytes(self, name):
+        with open(os.path.join(self.local_dir, name), "rb") as f:
+            return f.read()
+
+    def open_fs(self, **options):
+        return AsyncFTPFS(
+            host=self.server.host,
+            port=self.server.port,
+            user=self.user,
+            passwd=self.pasw,
+            tls=self.tls,
+            implicit_tls=self.implicit_tls,
+            **options
+        )
+
+    def run_with_fs(self, test, **options):
+        """Run ``test(ftp_fs)`` in a new event loop."""
+
+        async def main():
+            async with self.open_fs(**options) as ftp_fs:
+                if not self.mlst:
+                    (await ftp_fs.get_features()).pop("MLST", None)
+                result = await test(ftp_fs)
+                self.assertEqual(ftp_fs._pool.leased_count, 0)
+                return result
+
+        return asyncio.run(main())
+
+    def test_getinfo(self):
+        async def test(ftp_fs):
+            info = await ftp_fs.getinfo(self.path("foo"), namespaces=["details"])
+            self.assertEqual(info.name, "foo")
+            self.assertFalse(info.is_dir)
+            self.assertEqual(info.size, 10000)
+            self.assertTrue((await ftp_fs.getinfo(self.path("dir"))).is_dir)
+            self.assertTrue((await ftp_fs.getinfo("/")).is_dir)
+            self.assertTrue(await ftp_fs.exists(self.path("foo")))
+            self.assertFalse(await ftp_fs.exists(self.path("nope")))
+            self.assertFalse(await ftp_fs.isdir(self.path("foo")))
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.getinfo(self.path("nope"))
+
+        self.run_with_fs(test)
+
+    def test_scandir(self):
+        async def test(ftp_fs):
+            infos = [info async for info in ftp_fs.scandir(self.test_folder)]
+            self.assertEqual(
+                sorted((info.name, info.is_dir) for info in infos),
+                [("dir", True), ("foo", False)],
+            )
+            self.assertEqual(await ftp_fs.listdir(self.path("dir")), ["bar"])
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.listdir(self.path("nope"))
+            with self.assertRaises(errors.DirectoryExpected):
+                await ftp_fs.listdir(self.path("foo"))
+            # A listing closed before its end does not leak its connection
+            entries = ftp_fs.scandir(self.test_folder)
+            async for info in entries:
+                break
+            await entries.aclose()
+
+        self.run_with_fs(test)
+
+    def test_readbytes_writebytes(self):
+        async def test(ftp_fs):
+            self.assertEqual(
+                await ftp_fs.readbytes(self.path("foo")), b"0123456789" * 1000
+            )
+            await ftp_fs.writebytes(self.path("new"), b"new contents")
+            self.assertEqual(await ftp_fs.readbytes(self.path("new")), b"new contents")
+            with self.assertRaises(TypeError):
+                await ftp_fs.writebytes(self.path("new"), "text")
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.readbytes(self.path("nope"))
+            with self.assertRaises(errors.FileExpected):
+                await ftp_fs.readbytes(self.path("dir"))
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.writebytes(self.path("nope/new"), b"")
+
+        self.run_with_fs(test)
+        self.assertEqual(self.local_bytes("new"), b"new contents")
+
+    def test_download_upload(self):
+        contents = bytes(bytearray(range(256))) * 1024
+        progress = []
+
+        async def test(ftp_fs):
+            stats = await ftp_fs.upload(
+                self.path("up"), io.BytesIO(contents), chunk_size=65536
+            )
+            self.assertEqual(stats.bytes_transferred, len(contents))
+            data = io.BytesIO()
+            stats = await ftp_fs.download(
+                self.path("up"), data, chunk_size=10000, callback=progress.append
+            )
+            self.assertEqual(stats.bytes_transferred, len(contents))
+            self.assertEqual(data.getvalue(), contents)
+
+        self.run_with_fs(test)
+        self.assertEqual(self.local_bytes("up"), contents)
+        self.assertEqual(progress[-1], len(contents))
+        self.assertTrue(all(a < b for a, b in zip(progress, progress[1:])))
+
+    def test_openbin_read(self):
+        async def test(ftp_fs):
+            async with ftp_fs.openbin(self.path("foo")) as f:
+                self.assertTrue(f.readable())
+                self.assertFalse(f.writable())
+                self.assertEqual(await f.read(5), b"01234")
+                self.assertEqual(f.tell(), 5)
+                self.assertEqual(await f.seek(-3, 2), 9997)
+                self.assertEqual(await f.read(), b"789")
+                self.assertEqual(await f.read(), b"")
+                await f.seek(12)
+                self.assertEqual(await f.read(4), b"2345")
+                with self.assertRaises(IOError):
+                    await f.write(b"foo")
+            self.assertTrue(f.closed)
+            with self.assertRaises(ValueError):
+                await f.read()
+
+            # Closing a file before the end of the transfer
+            f = await ftp_fs.openbin(self.path("foo"))
+            self.assertEqual(await f.read(1), b"0")
+            await f.close()
+
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.openbin(self.path("nope"))
+            with self.assertRaises(errors.FileExpected):
+                await ftp_fs.openbin(self.path("dir"))
+
+        self.run_with_fs(test)
+
+    def test_openbin_write(self):
+        async def test(ftp_fs):
+            async with ftp_fs.openbin(self.path("new"), "w") as f:
+                self.assertTrue(f.writable())
+                await f.write(b"hello ")
+                await f.write(b"world")
+                self.assertEqual(f.tell(), 11)
+            async with ftp_fs.openbin(self.path("new"), "a") as f:
+                await f.write(b"!")
+            self.assertEqual(await ftp_fs.readbytes(self.path("new")), b"hello world!")
+            with self.assertRaises(errors.FileExists):
+                await ftp_fs.openbin(self.path("new"), "x")
+            with self.assertRaises(errors.ResourceNotFound):
+                await ftp_fs.openbin(self.path("nope/new"), "w")
+
+        self.run_with_fs(test)
+
+    def test_concurrency(self):
+        opened = []
+
+        async def test(ftp_fs):
+            open_ftp = ftp_fs._open_ftp
+
+            async def counting_open_ftp():
+                opened.append(True)
+                return await open_ftp()
+
+            ftp_fs._open_ftp = counting_open_ftp
+            paths = [self.path("foo"), self.path("dir/bar")] * 50
+            results = await asyncio.gather(*(ftp_fs.readbytes(p) for p in paths))
+            self.assertEqual(results, [b"0123456789" * 1000] * 100)
+
+        self.run_with_fs(test, pool_size=3)
+        # Operations wait for a connection of the pool
+        self.assertLessEqual(len(opened), 3)
+
+    def test_max_overflow(self):
+        leased = []
+
+        async def test(ftp_fs):
+            open_ftp = ftp_fs._open_ftp
+
+            async def counting_open_ftp():
+                # Including the lease of the connection being opened
+                leased.append(ftp_fs._pool.leased_count + 1)
+                return await open_ftp()
+
+            async def read(path):
+                async with ftp_fs.openbin(path) as ftp_file:
+                    return await ftp_file.read()
+
+            async def list_dir(path):
+                return [info.name async for info in ftp_fs.scandir(path)]
+
+            ftp_fs._open_ftp = counting_open_ftp
+            results = await asyncio.gather(
+                *(read(self.path("foo")) for _ in range(30)),
+                *(list_dir(self.path("dir")) for _ in range(30))
+            )
+            self.assertEqual(results[:30], [b"0123456789" * 1000] * 30)
+            self.assertEqual(results[30:], [["bar"]] * 30)
+
+        self.run_with_fs(test, pool_size=2, max_overflow=3)
+        # Files and listings wait for an overflow lease, and the short
+        # operations (e.g. getinfo() of openbin()) for a lease of the pool
+        self.assertLessEqual(max(leased), 2 + 3)
+
+    def test_file_not_closed(self):
+        async def leak_files(ftp_fs):
+            for _ in range(3):
+                # With a read transfer in progress
+                f = await ftp_fs.openbin(self.path("foo"))
+                self.assertEqual(await f.read(1), b"0")
+                del f
+                f = await ftp_fs.openbin(self.path("foo"))
+                del f
+                gc.collect()
+                # The leases of the files end once the event loop runs
+                await asyncio.sleep(0)
+
+        async def test(ftp_fs):
+            # Without their leases, the files would wait forever
+            await asyncio.wait_for(leak_files(ftp_fs), 5)
+            self.assertEqual(ftp_fs._pool.leased_count, 0)
+            self.assertEqual(await ftp_fs.readbytes(self.path("foo")), b"0123456789" * 1000)
+
+        self.run_with_fs(test, max_overflow=2)
+
+    def test_cancel(self):
+        async def test(ftp_fs):
+            task = asyncio.ensure_future(ftp_fs.readbytes(self.path("foo")))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The cancelled command may be left without its reply, so,
+            # its connection is not reused
+            self.assertEqual(await ftp_fs.readbytes(self.path("foo")), b"0123456789" * 1000)
+
+        self.run_with_fs(test)
+
+    def test_connection_error(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        async def test():
+            async with AsyncFTPFS("127.0.0.1", port=port, timeout=1) as ftp_fs:
+                with self.assertRaises(errors.RemoteConnectionError):
+                    await ftp_fs.getinfo("/foo")
+                with self.assertRaises(errors.RemoteConnectionError):
+                    await ftp_fs.openbin("/foo")
+
+        asyncio.run(test())
+
+
+class TestAsyncFTPFSNoMLSD(TestAsyncFTPFS):
+    mlst = False
+
+
+@mark.slow
+@unittest.skipIf(platform.python_implementation() == "PyPy", "ftp unreliable with PyPy")
+@unittest.skipUnless(
+    hasattr(asyncio.StreamWriter, "start_tls"), "TLS requires Python 3.11"
+)
+class TestAsyncFTPFS_TLS(TestAsyncFTPFS):
+    tls = True
+
+    @classmethod
+    def startServer(cls, temp_dir):
+        from .helpers import TLS_ThreadedTestFTPd
+
+        return cls._startServer(TLS_ThreadedTestFTPd(implicit_tls=cls.implicit_tls), temp_dir)
+
+
+    def test_ssl_session_reuse(self):
+        if self.implicit_tls:
+            self.skipTest("data connections are not secured with implicit TLS")
+
+        async def test(ftp_fs, reuse_ssl_session):
+            ftp = await ftp_fs._pool.acquire(ftp_fs._open_ftp)
+            try:
+                reader, writer = await ftp.transfercmd("LIST " + self.test_folder)
+                while await ftp.recv(reader, 8192):
+                    pass
+                session_reused = writer.get_extra_info("ssl_object").session_reused
+                await ftp.close_data(writer)
+                await ftp.voidresp()
+            finally:
+                await ftp_fs._pool.release(ftp)
+            self.assertEqual(session_reused, reuse_ssl_session)
+
+        for reuse_ssl_session in (True, False):
+            self.run_with_fs(
+                lambda ftp_fs: test(ftp_fs, reuse_ssl_session),
+                reuse_ssl_session=reuse_ssl_session,
+            )
+
+    def test_context_required(self):
+        from miarec_ftpfs._async_ftp import AsyncFTP, ResumingSSLContext
+
+        with self.assertRaises(ValueError):
+            AsyncFTP(context=ssl.create_default_context())
+        AsyncFTP(context=ssl.create_default_context(), reuse_ssl_session=False)
+        AsyncFTP(context=ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT))
+
+
+class TestAsyncFTPFS_ImplicitTLS(TestAsyncFTPFS_TLS):
+    tls = False
+    implicit_tls = True
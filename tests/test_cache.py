@@ -0,0 +1,67 @@
+from __future__ import unicode_literals
+
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from miarec_ftpfs._cache import DirectoryCache
+
+
+class TestDirectoryCache(unittest.TestCase):
+    def test_get_set(self):
+        cache = DirectoryCache(max_size=10, ttl=30)
+        self.assertIsNone(cache.get("/foo"))
+        cache.set("/foo", {"bar": 1}, cache.token())
+        self.assertEqual(cache.get("/foo"), {"bar": 1})
+
+    @mock.patch("time.monotonic")
+    def test_ttl(self, mock_monotonic):
+        cache = DirectoryCache(max_size=10, ttl=30)
+        mock_monotonic.return_value = 100.0
+        cache.set("/foo", {}, cache.token())
+        mock_monotonic.return_value = 129.0
+        self.assertEqual(cache.get("/foo"), {})
+        mock_monotonic.return_value = 130.0
+        self.assertIsNone(cache.get("/foo"))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru(self):
+        cache = DirectoryCache(max_size=2, ttl=30)
+        cache.set("/a", {}, cache.token())
+        cache.set("/b", {}, cache.token())
+        cache.get("/a")
+        cache.set("/c", {}, cache.token())
+        self.assertIsNotNone(cache.get("/a"))
+        self.assertIsNone(cache.get("/b"))
+        self.assertIsNotNone(cache.get("/c"))
+
+    def test_invalidate(self):
+        cache = DirectoryCache(max_size=10, ttl=30)
+        for path in ("/", "/foo", "/foo/bar", "/foo/bar/baz", "/foobar"):
+            cache.set(path, {}, cache.token())
+
+        cache.invalidate("/foo/bar/baz/egg")
+        self.assertIsNone(cache.get("/foo/bar/baz"))
+        self.assertIsNotNone(cache.get("/foo/bar"))
+
+        cache.invalidate("/foo", subtree=True)
+        self.assertIsNone(cache.get("/"))
+        self.assertIsNone(cache.get("/foo"))
+        self.assertIsNone(cache.get("/foo/bar"))
+        self.assertIsNotNone(cache.get("/foobar"))
+
+    def test_stale_token(self):
+        cache = DirectoryCache(max_size=10, ttl=30)
+        token = cache.token()
+        # The directory was modified while its listing was being fetched
+        cache.invalidate("/foo/bar")
+        cache.set("/foo", {}, token)
+        self.assertIsNone(cache.get("/foo"))
+
+        token = cache.token()
+        cache.clear()
+        cache.set("/foo", {}, token)
+        self.assertIsNone(cache.get("/foo"))
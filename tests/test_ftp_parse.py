@@ -36,9 +36,117 @@ class TestFTPParse(unittest.TestCase):
     def test_parse(self):
         self.assertListEqual(ftp_parse.parse([""]), [])
 
+    def test_iter_parse(self):
+        def lines():
+            yield "-rw-r--r--    1 0        0              26 Mar 04  2010 robots.txt"
+            raise IOError("connection lost")
+
+        iter_info = ftp_parse.iter_parse(lines())
+        self.assertEqual(next(iter_info)["basic"]["name"], "robots.txt")
+        with self.assertRaises(IOError):
+            next(iter_info)
+
+    def test_iter_parse_recursive(self):
+        lines = textwrap.dedent(
+            """\
+            total 8
+            drwxr-xr-x    2 0        0            4096 Mar 04  2010 sub:dir
+            -rw-r--r--    1 0        0              26 Mar 04  2010 robots.txt
+
+            ./sub:dir:
+            total 4
+            -rw-r--r--    1 0        0              10 Mar 04  2010 a.txt
+
+            /pub/empty:
+            total 0
+            """
+        ).splitlines()
+        self.assertEqual(
+            [
+                (header, raw_info and raw_info["basic"]["name"])
+                for header, raw_info in ftp_parse.iter_parse_recursive(lines)
+            ],
+            [
+                (None, "sub:dir"),
+                (None, "robots.txt"),
+                ("./sub:dir", None),
+                ("./sub:dir", "a.txt"),
+                ("/pub/empty", None),
+            ],
+        )
+
     def test_parse_line(self):
         self.assertIs(ftp_parse.parse_line("not a dir"), None)
 
+    @mock.patch("time.localtime")
+    def test_linux_time_to_epoch(self, mock_localtime):
+        mock_localtime.return_value = time2017
+        samples = [
+            "{} {} {}".format(month, day, year_or_time)
+            for month in ("Jan", "feb", "JUL", "Dec", "Foo")
+            for day in ("1", "05", "28", "31", "32", "x")
+            for year_or_time in ("1974", "2017", "00:00", "23:59", "24:00", "1:5", "17")
+        ]
+        for mtime in samples:
+            self.assertEqual(
+                ftp_parse._linux_time_to_epoch(mtime, 2017),
+                ftp_parse._parse_time(mtime, formats=["%b %d %Y", "%b %d %H:%M"]),
+                mtime,
+            )
+
+    def test_windowsnt_time_to_epoch(self):
+        samples = [
+            "{}-{}-{} {}".format(day, month, year, clock)
+            for day in ("01", "5", "31", "32")
+            for month in ("02", "12", "13")
+            for year in ("68", "69", "18", "2018")
+            for clock in ("12:00AM", "12:30pm", "01:01PM", "13:01PM", "00:00", "23:59", "7:05")
+        ]
+        for mtime in samples:
+            self.assertEqual(
+                ftp_parse._windowsnt_time_to_epoch(mtime),
+                ftp_parse._parse_time(mtime, formats=["%d-%m-%y %I:%M%p", "%d-%m-%y %H:%M"]),
+                mtime,
+            )
+
+    def test_listing_parser(self):
+        parser = ftp_parse.ListingParser()
+        windows = "11-02-18  02:12PM       <DIR>          docs"
+        linux = "-rw-r--r--    1 0        0              26 Mar 04  2010 robots.txt"
+        self.assertEqual(parser.parse_line(windows)["basic"]["name"], "docs")
+        info1 = parser.parse_line(linux)
+        self.assertEqual(info1["basic"]["name"], "robots.txt")
+        info2 = parser.parse_line(linux)
+        self.assertEqual(info1, info2)
+        # Memoized permissions are not shared between entries
+        self.assertIsNot(
+            info1["access"]["permissions"], info2["access"]["permissions"]
+        )
+
+    def test_listing_parser_decoder_cache(self):
+        class CountingRegex(object):
+            def __init__(self, regex):
+                self.regex = regex
+                self.count = 0
+
+            def match(self, line):
+                self.count += 1
+                return self.regex.match(line)
+
+        windows = "11-02-18  02:12PM       <DIR>          docs"
+        linux = "-rw-r--r--    1 0        0              26 Mar 04  2010 robots.txt"
+        for line, attempts in ((linux, 100), (windows, 101)):
+            parser = ftp_parse.ListingParser()
+            regexes = [CountingRegex(regex) for regex, _ in parser.decoders]
+            parser.decoders = [
+                (regex, decode) for regex, (_, decode) in zip(regexes, parser.decoders)
+            ]
+            for _ in range(100):
+                self.assertIsNotNone(parser.parse_line(line))
+            # Once a line is decoded, its decoder is tried first
+            self.assertEqual(sum(regex.count for regex in regexes), attempts)
+            self.assertIsNone(parser.parse_line("not a line"))
+
     @mock.patch("time.localtime")
     def test_decode_linux(self, mock_localtime):
         mock_localtime.return_value = time2017
@@ -0,0 +1,86 @@
+from __future__ import unicode_literals
+
+import ftplib
+import ssl
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from miarec_ftpfs.ftp_tls import ExplicitFTP_TLS, ImplicitFTP_TLS, TLSSessionCache
+
+
+class TestTLSSessionCache(unittest.TestCase):
+    def make_session(self, age=0, timeout=300):
+        return mock.Mock(time=time.time() - age, timeout=timeout)
+
+    def test_get_put(self):
+        cache = TLSSessionCache()
+        context = ssl.create_default_context()
+        self.assertIsNone(cache.get("ftp.example.org", 21, context))
+        session = self.make_session()
+        cache.put("ftp.example.org", 21, context, session)
+        self.assertIs(cache.get("ftp.example.org", 21, context), session)
+        self.assertIsNone(cache.get("ftp.example.org", 990, context))
+        cache.clear()
+        self.assertIsNone(cache.get("ftp.example.org", 21, context))
+
+    def test_by_context(self):
+        # Sessions are only valid with the context which created them
+        cache = TLSSessionCache()
+        context = ssl.create_default_context()
+        session = self.make_session()
+        cache.put("ftp.example.org", 21, context, session)
+        self.assertIsNone(cache.get("ftp.example.org", 21, cache.context))
+        self.assertIs(cache.get("ftp.example.org", 21, context), session)
+
+    def test_context(self):
+        cache = TLSSessionCache()
+        # Created on first use
+        self.assertIsNone(cache._context)
+        self.assertIsInstance(cache.context, ssl.SSLContext)
+        self.assertIs(cache.context, cache.context)
+        self.assertEqual(cache.context.verify_mode, ssl.CERT_NONE)
+        context = ssl.create_default_context()
+        self.assertIs(TLSSessionCache(context).context, context)
+
+    def test_expired(self):
+        cache = TLSSessionCache()
+        cache.put("ftp.example.org", 21, None, self.make_session(age=301))
+        self.assertIsNone(cache.get("ftp.example.org", 21, None))
+
+    def test_max_size(self):
+        cache = TLSSessionCache(max_size=2)
+        sessions = [self.make_session() for _ in range(3)]
+        cache.put("a", 21, None, sessions[0])
+        cache.put("b", 21, None, sessions[1])
+        # The least recently used session is dropped
+        cache.get("a", 21, None)
+        cache.put("c", 21, None, sessions[2])
+        self.assertIs(cache.get("a", 21, None), sessions[0])
+        self.assertIsNone(cache.get("b", 21, None))
+        self.assertIs(cache.get("c", 21, None), sessions[2])
+
+
+class TestFTPTLSArguments(unittest.TestCase):
+    def test_positional_arguments(self):
+        # The positional arguments are the ones of ftplib.FTP_TLS
+        for cls in (ExplicitFTP_TLS, ImplicitFTP_TLS):
+            with mock.patch.object(ftplib.FTP_TLS, "__init__", return_value=None) as init:
+                ftp = cls("ftp.example.com", "user", "pass")
+            init.assert_called_once_with("ftp.example.com", "user", "pass")
+            self.assertTrue(ftp.reuse_ssl_session)
+            self.assertIsNone(ftp.session_cache)
+
+    def test_keyword_arguments(self):
+        cache = TLSSessionCache()
+        with mock.patch.object(ftplib.FTP_TLS, "__init__", return_value=None) as init:
+            ftp = ExplicitFTP_TLS(
+                "ftp.example.com", reuse_ssl_session=False, session_cache=cache
+            )
+        init.assert_called_once_with("ftp.example.com", context=cache.context)
+        self.assertFalse(ftp.reuse_ssl_session)
+        self.assertIs(ftp.session_cache, cache)
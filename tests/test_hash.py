@@ -0,0 +1,80 @@
+from __future__ import unicode_literals
+
+import hashlib
+import unittest
+
+from fs import errors
+
+from miarec_ftpfs._hash import (
+    HashWriter,
+    default_hash_algorithm,
+    hash_commands,
+    new_hash,
+    parse_hash_reply,
+)
+
+
+class TestHash(unittest.TestCase):
+    def test_new_hash(self):
+        self.assertEqual(new_hash("MD5").name, "md5")
+        crc = new_hash("crc32")
+        HashWriter(crc).write(memoryview(b"hello"))
+        self.assertEqual(crc.hexdigest(), "3610a686")
+        self.assertEqual(new_hash("crc32").hexdigest(), "00000000")
+        with self.assertRaises(errors.UnsupportedHash):
+            new_hash("nohash")
+
+    def test_hash_commands(self):
+        features = {"HASH": "SHA-1;SHA-256*;MD5", "XCRC": "", "XSHA512": ""}
+        self.assertEqual(hash_commands("sha256", features), "HASH SHA-256")
+        self.assertEqual(hash_commands("MD5", features), "HASH MD5")
+        self.assertEqual(hash_commands("crc32", features), "XCRC")
+        self.assertEqual(hash_commands("sha512", features), "XSHA512")
+        self.assertIsNone(hash_commands("sha224", features))
+        self.assertIsNone(hash_commands("md5", {}))
+        self.assertEqual(default_hash_algorithm(features), "SHA-256")
+        self.assertIsNone(default_hash_algorithm({"XMD5": ""}))
+
+    def test_parse_hash_reply(self):
+        md5 = hashlib.md5(b"").hexdigest()
+        self.assertEqual(
+            parse_hash_reply(
+                "md5", "213 MD5 0-0 {} /a b.txt".format(md5.upper()), "HASH MD5", "/a b.txt"
+            ),
+            md5,
+        )
+        self.assertEqual(parse_hash_reply("md5", "250 " + md5, "XMD5"), md5)
+        self.assertEqual(
+            parse_hash_reply("md5", "250 /file.txt " + md5, "XMD5", "/file.txt"), md5
+        )
+        self.assertEqual(parse_hash_reply("crc32", "250 ABCDEF", "XCRC"), "00abcdef")
+        self.assertIsNone(parse_hash_reply("sha1", "250 " + md5, "XSHA1"))
+        self.assertIsNone(parse_hash_reply("md5", "250 OK", "XMD5"))
+
+    def test_parse_hash_reply_positional(self):
+        # The fields of a HASH reply are not guessed
+        self.assertEqual(
+            parse_hash_reply("crc32", "213 CRC32 0-5 beef /cafe", "HASH CRC32", "/cafe"),
+            "0000beef",
+        )
+        self.assertIsNone(
+            parse_hash_reply("md5", "213 SHA-1 0-5 beef /cafe", "HASH MD5", "/cafe")
+        )
+        self.assertIsNone(parse_hash_reply("md5", "213 MD5 0-5", "HASH MD5"))
+
+    def test_parse_hash_reply_path(self):
+        # A path looking like a short CRC32 value is not taken for one
+        self.assertEqual(
+            parse_hash_reply("crc32", "250 /dir/cafe 1234abcd", "XCRC", "/dir/cafe"),
+            "1234abcd",
+        )
+        self.assertEqual(
+            parse_hash_reply("crc32", "250 cafe beef", "XCRC", "/dir/cafe"), "0000beef"
+        )
+        self.assertEqual(
+            parse_hash_reply("crc32", '250 "/a b/1234" beef', "XCRC", "/a b/1234"),
+            "0000beef",
+        )
+        # Ambiguous
+        self.assertIsNone(parse_hash_reply("crc32", "250 cafe beef", "XCRC", "/x"))
+        self.assertIsNone(parse_hash_reply("crc32", "250 /dir/cafe", "XCRC", "/dir/cafe"))
@@ -0,0 +1,106 @@
+from __future__ import unicode_literals
+
+import unittest
+from ftplib import error_perm
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from miarec_ftpfs._observe import (
+    CommandEvent,
+    ConnectionEvent,
+    FTPObserver,
+    MetricsAggregator,
+    ObservedCommands,
+    Observers,
+    TransferEvent,
+    WaitEvent,
+)
+
+
+class FakeFTP(object):
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.sent = []
+
+    def putcmd(self, line):
+        self.sent.append(line)
+
+    def getresp(self):
+        reply = self.replies.pop(0)
+        if reply.startswith("5"):
+            raise error_perm(reply)
+        return reply
+
+
+class ObservedFakeFTP(ObservedCommands, FakeFTP):
+    pass
+
+
+class TestObservers(unittest.TestCase):
+    def test_commands(self):
+        observer = mock.Mock(spec=FTPObserver)
+        ftp = ObservedFakeFTP(["220 Welcome", "150 Opening", "226 Done", "550 Nope"])
+        ftp.observers = Observers()
+        self.assertEqual(ftp.getresp(), "220 Welcome")
+        # Nothing is measured without observers
+        ftp.putcmd("NOOP")
+        self.assertIsNone(ftp._command)
+
+        ftp.observers.add(observer)
+        ftp.putcmd("RETR /foo")
+        self.assertEqual(ftp.getresp(), "150 Opening")
+        # The final reply of the transfer is not a command
+        self.assertEqual(ftp.getresp(), "226 Done")
+        ftp.putcmd("dele /foo")
+        with self.assertRaises(error_perm):
+            ftp.getresp()
+        events = [call[0][0] for call in observer.on_command.call_args_list]
+        self.assertEqual([(e.verb, e.code) for e in events], [("RETR", "150"), ("DELE", "550")])
+        self.assertTrue(all(e.latency >= 0 for e in events))
+
+        ftp.observers.remove(observer)
+        self.assertEqual(ftp.observers.active, ())
+
+    def test_observer_error(self):
+        observer = mock.Mock(spec=FTPObserver)
+        observer.on_transfer.side_effect = ValueError
+        other = mock.Mock(spec=FTPObserver)
+        observers = Observers([observer, other])
+        observers.transfer("upload", 10, 0.5)
+        other.on_transfer.assert_called_once_with(TransferEvent("upload", 10, 0.5))
+        self.assertEqual(TransferEvent("upload", 10, 0.5).throughput, 20.0)
+
+
+class TestMetricsAggregator(unittest.TestCase):
+    def test_percentiles(self):
+        metrics = MetricsAggregator()
+        self.assertEqual(metrics.percentiles("command.RETR"), {})
+        for latency in range(100, 0, -1):
+            metrics.on_command(CommandEvent("RETR", latency / 1000, "150"))
+        metrics.on_command(CommandEvent("RETR", 1.0, "550"))
+        self.assertEqual(
+            metrics.percentiles("command.RETR", (0, 50, 99, 100)),
+            {0: 0.001, 50: 0.051, 99: 0.1, 100: 1.0},
+        )
+        self.assertEqual(metrics.count("command.RETR"), 101)
+        self.assertEqual(metrics.reply_codes("RETR"), {"150": 100, "550": 1})
+
+    def test_summary(self):
+        metrics = MetricsAggregator(max_samples=2)
+        metrics.on_transfer(TransferEvent("download", 100, 3.0))
+        metrics.on_transfer(TransferEvent("download", 200, 1.0))
+        metrics.on_transfer(TransferEvent("download", 300, 2.0))
+        metrics.on_connection(ConnectionEvent("open", 0.5))
+        metrics.on_wait(WaitEvent("pool", 0.0))
+        self.assertEqual(metrics.names, ["connection.open", "transfer.download", "wait.pool"])
+        self.assertEqual(metrics.bytes_transferred("download"), 600)
+        # Only the most recent samples are kept, but all events are counted
+        self.assertEqual(
+            metrics.summary()["transfer.download"],
+            {"count": 3, "p50": 1.0, "p90": 2.0, "p99": 2.0, "max": 2.0},
+        )
+        metrics.reset()
+        self.assertEqual(metrics.summary(), {})
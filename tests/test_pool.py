@@ -0,0 +1,193 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from miarec_ftpfs._pool import FTPConnectionPool
+
+
+class TestFTPConnectionPool(unittest.TestCase):
+    def test_reuse(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2)
+        ftp = pool.acquire(factory)
+        pool.release(ftp)
+        self.assertIs(pool.acquire(factory), ftp)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_discard(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2)
+        ftp = pool.acquire(factory)
+        pool.release(ftp, discard=True)
+        ftp.close.assert_called_once_with()
+        ftp.quit.assert_not_called()
+        self.assertEqual(pool.idle_count, 0)
+        self.assertIsNot(pool.acquire(factory), ftp)
+
+        # Releasing twice is a no-op
+        pool.release(ftp)
+        self.assertEqual(pool.idle_count, 0)
+
+    def test_bounded(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=1)
+        ftp = pool.acquire(factory)
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(pool.acquire(factory)))
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+        pool.release(ftp)
+        thread.join(2.0)
+        self.assertEqual(acquired, [ftp])
+
+    def test_overflow(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=1)
+        ftp1 = pool.acquire(factory)
+        ftp2 = pool.acquire(factory, overflow=True)
+        self.assertIsNot(ftp1, ftp2)
+        self.assertEqual(pool.leased_count, 2)
+
+        # Only max_size idle connections are kept
+        pool.release(ftp2)
+        pool.release(ftp1)
+        self.assertEqual(pool.idle_count, 1)
+        ftp1.quit.assert_called_once_with()
+
+    def test_max_overflow(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=1, max_overflow=1)
+        ftp = pool.acquire(factory, overflow=True)
+        # Overflow leases do not wait for the other ones
+        pool.release(pool.acquire(factory))
+        # A thread holding a lease does not wait for itself
+        pool.release(pool.acquire(factory, overflow=True))
+        acquired = []
+        thread = threading.Thread(
+            target=lambda: acquired.append(pool.acquire(factory, overflow=True))
+        )
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+        pool.release(ftp)
+        thread.join(2.0)
+        self.assertEqual(len(acquired), 1)
+        self.assertEqual(pool.leased_count, 1)
+
+        # A failed lease does not keep its slot
+        factory.side_effect = IOError
+        pool.release(acquired[0], discard=True)
+        with self.assertRaises(IOError):
+            pool.acquire(factory, overflow=True)
+        with self.assertRaises(IOError):
+            pool.acquire(factory, overflow=True)
+
+        with self.assertRaises(ValueError):
+            FTPConnectionPool(max_overflow=0)
+
+    def test_factory_error(self):
+        factory = mock.Mock(side_effect=IOError)
+        pool = FTPConnectionPool(max_size=1)
+        with self.assertRaises(IOError):
+            pool.acquire(factory)
+        with self.assertRaises(IOError):
+            pool.acquire(factory)
+
+    def test_close(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2)
+        ftp1 = pool.acquire(factory)
+        ftp2 = pool.acquire(factory)
+        pool.release(ftp1)
+        pool.close()
+        ftp1.quit.assert_called_once_with()
+        pool.release(ftp2)
+        ftp2.quit.assert_called_once_with()
+        self.assertEqual(pool.idle_count, 0)
+
+    def test_keepalive(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2, keepalive=0.05)
+        ftp1 = pool.acquire(factory)
+        ftp2 = pool.acquire(factory)
+        pool.release(ftp1)
+        pool.release(ftp2)
+        pool.maintain(factory)
+        ftp1.voidcmd.assert_not_called()
+
+        time.sleep(0.06)
+        # A connection dropped by the server is replaced
+        ftp2.voidcmd.side_effect = EOFError
+        pool.maintain(factory)
+        ftp1.voidcmd.assert_called_once_with("NOOP")
+        ftp2.close.assert_called_once_with()
+        self.assertEqual(factory.call_count, 3)
+        self.assertEqual(pool.idle_count, 2)
+        self.assertNotIn(ftp2, [pool.acquire(factory), pool.acquire(factory)])
+
+    def test_max_idle(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2, max_idle=0.05)
+        ftp = pool.acquire(factory)
+        pool.release(ftp)
+        time.sleep(0.06)
+        pool.maintain(factory)
+        ftp.quit.assert_called_once_with()
+        self.assertEqual(pool.idle_count, 0)
+        # Idle connections are not replaced
+        self.assertEqual(factory.call_count, 1)
+
+    def test_max_lifetime(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=2, max_lifetime=0.05)
+        ftp1 = pool.acquire(factory)
+        pool.release(ftp1)
+        time.sleep(0.06)
+        # Expired connections are not leased
+        ftp2 = pool.acquire(factory)
+        self.assertIsNot(ftp2, ftp1)
+        ftp1.close.assert_called_once_with()
+        pool.release(ftp2)
+        time.sleep(0.06)
+        pool.maintain(factory)
+        ftp2.quit.assert_called_once_with()
+        self.assertEqual(pool.idle_count, 1)
+        self.assertEqual(factory.call_count, 3)
+
+    def test_maintenance_thread(self):
+        factory = mock.Mock(side_effect=lambda: mock.Mock())
+        pool = FTPConnectionPool(max_size=1, keepalive=0.02)
+        ftp = pool.acquire(factory)
+        pool.release(ftp)
+        pool.start_maintenance(lambda: factory)
+        time.sleep(0.1)
+        ftp.voidcmd.assert_called_with("NOOP")
+        pool.close()
+        pool._thread.join(1.0)
+        self.assertFalse(pool._thread.is_alive())
+
+        # The pool is closed once the owner of the factory is gone
+        pool = FTPConnectionPool(max_size=1, keepalive=0.02)
+        pool.start_maintenance(lambda: None)
+        pool._thread.join(1.0)
+        self.assertFalse(pool._thread.is_alive())
+        self.assertTrue(pool._closed)
+
+        with self.assertRaises(ValueError):
+            FTPConnectionPool(keepalive=0)
+
+    def test_add(self):
+        pool = FTPConnectionPool(max_size=1)
+        ftp1, ftp2 = mock.Mock(), mock.Mock()
+        self.assertTrue(pool.add(ftp1))
+        self.assertFalse(pool.add(ftp2))
+        ftp2.quit.assert_called_once_with()
+        self.assertIs(pool.acquire(mock.Mock()), ftp1)
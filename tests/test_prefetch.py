@@ -0,0 +1,66 @@
+from __future__ import unicode_literals
+
+import socket
+import threading
+import time
+import unittest
+
+from miarec_ftpfs._prefetch import ReadAhead
+
+
+class TestReadAhead(unittest.TestCase):
+    def setUp(self):
+        self.conn, self.peer = socket.socketpair()
+        self.addCleanup(self.conn.close)
+        self.addCleanup(self.peer.close)
+
+    def test_readinto(self):
+        read_ahead = ReadAhead(self.conn, max_size=16, chunk_size=4)
+        self.peer.sendall(b"0123456789")
+        self.peer.close()
+        buffer = bytearray(6)
+        self.assertEqual(read_ahead.readinto(memoryview(buffer)), 6)
+        self.assertEqual(buffer, b"012345")
+        self.assertEqual(read_ahead.readinto(memoryview(buffer)), 4)
+        self.assertEqual(buffer[:4], b"6789")
+        self.assertEqual(read_ahead.readinto(memoryview(buffer)), 0)
+
+    def test_bounded(self):
+        read_ahead = ReadAhead(self.conn, max_size=8, chunk_size=4)
+        self.peer.sendall(b"x" * 64)
+        time.sleep(0.2)
+        # The helper thread stops once max_size bytes are buffered
+        self.assertEqual(read_ahead._buffered, 8)
+        buffer = bytearray(64)
+        self.peer.close()
+        self.assertEqual(read_ahead.readinto(memoryview(buffer)), 64)
+
+    def test_error(self):
+        self.conn.settimeout(0.1)
+        read_ahead = ReadAhead(self.conn, max_size=8)
+        self.peer.sendall(b"abc")
+        buffer = bytearray(8)
+        # Data received before the error is returned first
+        self.assertEqual(read_ahead.readinto(memoryview(buffer)), 3)
+        with self.assertRaises(socket.timeout):
+            read_ahead.readinto(memoryview(buffer))
+
+    def test_cancel(self):
+        read_ahead = ReadAhead(self.conn, max_size=4, chunk_size=4)
+        self.peer.sendall(b"x" * 64)
+        time.sleep(0.1)
+        read_ahead.cancel()
+        self.assertFalse(read_ahead._thread.is_alive())
+        # The connection can be used again once cancelled
+        self.assertEqual(self.conn.recv(4), b"xxxx")
+
+    def test_cancel_pending_recv(self):
+        read_ahead = ReadAhead(self.conn, max_size=4)
+        thread = threading.Thread(target=read_ahead.cancel)
+        thread.start()
+        thread.join(0.2)
+        # The pending recv completes before cancel returns
+        self.assertTrue(thread.is_alive())
+        self.peer.sendall(b"x")
+        thread.join(2.0)
+        self.assertFalse(thread.is_alive())
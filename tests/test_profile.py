@@ -0,0 +1,89 @@
+from __future__ import unicode_literals
+
+import gc
+import io
+import unittest
+import weakref
+
+from miarec_ftpfs._observe import CommandEvent, ConnectionEvent
+from miarec_ftpfs._profile import Profile
+
+
+class _Buffer(object):
+    pass
+
+
+class _FakeFS(object):
+    """Sends the commands of its methods to ``profile``."""
+
+    profile = None
+
+    def listdir(self, path, verbs=("PASV", "MLSD")):
+        buffer = _Buffer()
+        self.buffers.append(weakref.ref(buffer))
+        for verb in verbs:
+            self._send(verb)
+        return buffer
+
+    def openbin(self, path):
+        self.listdir(path, verbs=("MLST",))
+        self._send("TYPE")
+        return _FakeFile(self)
+
+    def _send(self, verb):
+        self.profile.on_command(CommandEvent(verb, 0.001, "200"))
+
+
+class _FakeFile(io.RawIOBase):
+    def __init__(self, fs):
+        self.fs = fs
+
+    def write(self, data):
+        self.fs._send("STOR")
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self.fs = _FakeFS()
+        self.fs.buffers = []
+        self.profile = self.fs.profile = Profile(self.fs)
+
+    def test_calls(self):
+        self.fs.listdir("/a")
+        self.fs.listdir("/b")
+        self.fs.openbin("/a/foo").write(b"bar")
+        self.profile.on_connection(ConnectionEvent("open", 0.01))
+        self.profile.stop()
+
+        self.assertEqual(self.profile.round_trips, 7)
+        self.assertEqual(self.profile.connections_opened, 1)
+        self.assertEqual(
+            [
+                (method, path, [command.verb for command in commands])
+                for method, path, commands in self.profile.calls()
+            ],
+            [
+                ("listdir", "/a", ["PASV", "MLSD"]),
+                ("listdir", "/b", ["PASV", "MLSD"]),
+                # getinfo() within openbin() is attributed to openbin()
+                ("openbin", "/a/foo", ["MLST", "TYPE"]),
+                ("_FakeFile.write", None, ["STOR"]),
+            ],
+        )
+        stats = self.profile.by_method()
+        self.assertEqual(stats["listdir"]["calls"], 2)
+        self.assertEqual(stats["listdir"]["commands"], 4)
+        self.assertAlmostEqual(stats["listdir"]["latency"], 0.004)
+        report = self.profile.report()
+        self.assertIn("7 round trips, 1 connection opened", report)
+        self.assertIn("openbin('/a/foo'): MLST TYPE (2 round trips", report)
+
+    def test_frames_not_kept(self):
+        self.fs.listdir("/a")
+        gc.collect()
+        # The locals of the call are freed while profiling
+        self.assertIsNone(self.fs.buffers[0]())
+
+    def test_unknown_caller(self):
+        self.profile.on_command(CommandEvent("NOOP", 0.001, "200"))
+        self.assertEqual(self.profile.calls()[0][:2], ("<unknown>", None))
@@ -0,0 +1,106 @@
+from __future__ import unicode_literals
+
+import io
+import socket
+import threading
+import unittest
+
+from miarec_ftpfs._transfer import (
+    TransferMeter,
+    TransferStats,
+    receive_file,
+    send_file,
+)
+
+
+class _ReadOnlyFile(object):
+    def __init__(self, data):
+        self._file = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+
+class _ShortWriteFile(io.RawIOBase):
+    """A raw file taking at most 3 bytes per write."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data[:3])
+        self.data += data
+        return len(data)
+
+
+class _KeepingFile(object):
+    """A file-like object keeping the data it is given, without copying it."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+
+class TestTransfer(unittest.TestCase):
+    def test_stats(self):
+        stats = TransferStats(1000, 2.0)
+        self.assertEqual(stats.bytes_transferred, 1000)
+        self.assertEqual(stats.throughput, 500.0)
+        self.assertEqual(TransferStats(0, 0.0).throughput, 0.0)
+
+    def test_meter(self):
+        progress = []
+        meter = TransferMeter(progress.append)
+        meter.update(10)
+        meter.update(5)
+        self.assertEqual(progress, [10, 15])
+        stats = meter.stats()
+        self.assertEqual(stats.bytes_transferred, 15)
+        self.assertGreater(stats.elapsed, 0)
+
+    def _send(self, file, chunk_size):
+        conn, peer = socket.socketpair()
+        received = io.BytesIO()
+        receiver = threading.Thread(
+            target=receive_file, args=(peer, received, 7, TransferMeter())
+        )
+        receiver.start()
+        meter = TransferMeter()
+        with conn:
+            send_file(conn, file, chunk_size, meter)
+        receiver.join()
+        peer.close()
+        return received.getvalue(), meter.transferred
+
+    def test_send_receive(self):
+        data = b"0123456789" * 100
+        self.assertEqual(self._send(io.BytesIO(data), 64), (data, 1000))
+        self.assertEqual(self._send(_ReadOnlyFile(data), 64), (data, 1000))
+        self.assertEqual(self._send(io.BytesIO(), 64), (b"", 0))
+
+    def _receive(self, file, data):
+        conn, peer = socket.socketpair()
+        meter = TransferMeter()
+        with conn:
+            conn.sendall(data)
+        with peer:
+            receive_file(peer, file, 7, meter)
+        return meter.transferred
+
+    def test_receive_short_writes(self):
+        data = b"0123456789" * 100
+        file = _ShortWriteFile()
+        self.assertEqual(self._receive(file, data), 1000)
+        self.assertEqual(bytes(file.data), data)
+
+    def test_receive_copies_data(self):
+        data = b"0123456789" * 100
+        file = _KeepingFile()
+        self.assertEqual(self._receive(file, data), 1000)
+        # The chunks are not overwritten by the next ones
+        self.assertEqual(b"".join(file.chunks), data)
@@ -0,0 +1,139 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+from fs import errors
+from fs.memoryfs import MemoryFS
+from fs.walk import Walker
+
+from miarec_ftpfs import FTPFS, ParallelWalker
+
+
+class SlowMemoryFS(MemoryFS):
+    """A `MemoryFS` which takes some time to list a directory."""
+
+    walker_class = ParallelWalker
+
+    def __init__(self):
+        super(SlowMemoryFS, self).__init__()
+        self.count_lock = threading.Lock()
+        self.listing = 0
+        self.max_listing = 0
+
+    def scandir(self, path, namespaces=None, page=None):
+        with self.count_lock:
+            self.listing += 1
+            self.max_listing = max(self.max_listing, self.listing)
+        try:
+            time.sleep(0.01)
+            return iter(list(super(SlowMemoryFS, self).scandir(path, namespaces, page)))
+        finally:
+            with self.count_lock:
+                self.listing -= 1
+
+
+class TestParallelWalker(unittest.TestCase):
+    def setUp(self):
+        self.fs = SlowMemoryFS()
+        for year in ("2024", "2025"):
+            for month in ("01", "02", "03"):
+                for day in ("01", "02"):
+                    path = "/{}/{}/{}".format(year, month, day)
+                    self.fs.makedirs(path)
+                    self.fs.writetext(path + "/a.wav", "a")
+                    self.fs.writetext(path + "/b.txt", "b")
+        self.fs.writetext("/top.txt", "top")
+
+    def test_bind(self):
+        self.assertIsInstance(self.fs.walk._make_walker(), ParallelWalker)
+        self.assertIs(FTPFS.walker_class, ParallelWalker)
+
+    def test_breadth(self):
+        expected = list(Walker().walk(self.fs))
+        self.assertEqual(list(self.fs.walk(workers=4)), expected)
+        # The queue of 4 directories (4 times workers) is too short to
+        # keep the order of the breadth first search
+        self.assertEqual(list(self.fs.walk(workers=1, max_pending=100)), expected)
+        self.assertEqual(sorted(self.fs.walk(workers=1)), sorted(expected))
+        self.assertEqual(
+            list(self.fs.walk.files(filter=["*.wav"], max_depth=3)),
+            list(Walker(filter=["*.wav"], max_depth=3).files(self.fs)),
+        )
+        self.assertEqual(
+            list(self.fs.walk.dirs(exclude_dirs=["02"])),
+            list(Walker(exclude_dirs=["02"]).dirs(self.fs)),
+        )
+        self.assertGreater(self.fs.max_listing, 1)
+
+    def test_depth(self):
+        self.assertEqual(
+            list(self.fs.walk(search="depth")),
+            list(Walker(search="depth").walk(self.fs)),
+        )
+
+    def test_unordered(self):
+        expected = sorted(Walker().walk(self.fs))
+        self.assertEqual(sorted(self.fs.walk(search="unordered")), expected)
+        self.assertEqual(
+            sorted(self.fs.walk.files(search="unordered", max_depth=2)),
+            sorted(Walker(max_depth=2).files(self.fs)),
+        )
+
+    def test_max_pending(self):
+        self.fs.max_listing = 0
+        walk = self.fs.walk(workers=8, max_pending=2)
+        next(walk)
+        # No more listings than max_pending are received ahead
+        time.sleep(0.05)
+        self.assertLessEqual(self.fs.max_listing, 2)
+        walk.close()
+        # More directories than max_pending wait to be listed, so, some are
+        # walked depth first
+        self.assertEqual(
+            sorted(self.fs.walk(workers=8, max_pending=2)), sorted(Walker().walk(self.fs))
+        )
+        self.assertLessEqual(self.fs.max_listing, 2)
+
+    def test_bounded_queue(self):
+        def walk(walker):
+            """Walk the tree, and get the high-water mark of the queue."""
+            iter_walk = walker._iter_walk(self.fs, "/")
+            results = []
+            queued = 0
+            for result in iter_walk:
+                results.append(result)
+                queued = max(queued, len(iter_walk.gi_frame.f_locals["queue"]))
+            return results, queued
+
+        def key(result):
+            dir_path, info = result
+            return dir_path, info.name if info is not None else ""
+
+        expected = list(Walker()._iter_walk(self.fs, "/"))
+        for search in ("breadth", "unordered"):
+            results, queued = walk(ParallelWalker(search=search, workers=2, max_pending=2))
+            self.assertLessEqual(queued, 2)
+            self.assertEqual(sorted(results, key=key), sorted(expected, key=key))
+
+        # The order of the breadth first search is kept while the queue
+        # is large enough
+        results, queued = walk(ParallelWalker(workers=2, max_pending=20))
+        self.assertGreater(queued, 2)
+        self.assertEqual(results, expected)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            ParallelWalker(workers=0)
+        with self.assertRaises(ValueError):
+            ParallelWalker(search="sideways")
+        with self.assertRaises(errors.ResourceNotFound):
+            list(self.fs.walk("/nope"))
+        failed = []
+        walker = ParallelWalker(on_error=lambda path, error: failed.append(path) or True)
+        self.assertEqual(
+            list(walker.walk(self.fs, "/nope")),
+            list(Walker(ignore_errors=True).walk(self.fs, "/nope")),
+        )
+        self.assertEqual(failed, ["/nope"])